@@ -1,8 +1,10 @@
 import os
+from datetime import datetime
 
 import pendulum
 from airflow.models import DAG
 from airflow.providers.docker.operators.docker import DockerOperator
+from airflow.triggers.temporal import DateTimeTrigger
 from docker.types import Mount
 
 default_args = {
@@ -14,6 +16,72 @@ default_args = {
 dag_id = os.path.basename(__file__).replace(".py", "")
 PROJECT_DATA_ROOT = os.environ.get("PROJECT_DATA", "")
 
+# Rate-limit waits up to this many seconds are slept in the container; longer
+# waits and a used-up quota end the container, and the task defers until the
+# time it printed as its last line.
+MAX_WAIT_SECONDS = 60
+RESUME_MARKER = "resume_at="
+RESUME_FLAG = "--resume"
+
+
+class ResumableDockerOperator(DockerOperator):
+    """
+    Runs a download container, deferring while it waits for its limits.
+
+    When the container exits with a ``resume_at=<ISO time>`` last line, the
+    task frees its worker slot and is resumed by the triggerer at that time,
+    running the container again with ``--resume`` to download only the
+    pending requests.
+    """
+
+    def execute(self, context, event=None):
+        if event is not None and RESUME_FLAG not in self.command.split():
+            self.command = f"{self.command} {RESUME_FLAG}"
+        output = super().execute(context)
+        lines = output if isinstance(output, list) else [output]
+        last_line = lines[-1] if lines else None
+        if isinstance(last_line, bytes):
+            last_line = last_line.decode()
+        if last_line and last_line.strip().startswith(RESUME_MARKER):
+            resume_at = datetime.fromisoformat(
+                last_line.strip().removeprefix(RESUME_MARKER)
+            )
+            self.log.info("Download deferred until %s", resume_at.isoformat())
+            self.defer(trigger=DateTimeTrigger(moment=resume_at), method_name="execute")
+        return output
+
+
+# The schedules are downloaded once, then their fixtures are split between
+# parallel containers by a hash of their id. All containers count their
+# requests against the same daily quota in the database.
+SHARD_COUNT = 4
+SHARD_SPECS = [f"hash={index}/{SHARD_COUNT}" for index in range(SHARD_COUNT)]
+
+docker_kwargs = {
+    "image": "ghcr.io/{{ var.value.REPO_OWNER }}/data_backend:"
+    "{{ var.value.BACKEND_TAG | default('latest', true) }}",
+    "api_version": "auto",
+    "auto_remove": "force",
+    "docker_url": "unix://var/run/docker.sock",
+    "network_mode": "football_graphs_project-net",
+    "mounts": [
+        Mount(
+            source=f"{PROJECT_DATA_ROOT}/Secret/python_user",
+            target="/home/app/.aws/credentials",
+            type="bind",
+            read_only=True,
+        )
+    ],
+    "environment": {
+        "POSTGRES_HOST": "{{ conn.footgraph_db.host }}",
+        "POSTGRES_USER": "{{ conn.footgraph_db.login }}",
+        "POSTGRES_PASSWORD": "{{ conn.footgraph_db.password }}",
+        "POSTGRES_DB": "{{ conn.footgraph_db.schema }}",
+        "API_FOOTBALL_KEY": "{{ var.value.API_FOOTBALL_KEY }}",
+    },
+    "mount_tmp_dir": False,
+}
+
 with DAG(
     dag_id,
     default_args=default_args,
@@ -21,34 +89,36 @@ with DAG(
     start_date=pendulum.datetime(2026, 4, 15),
     catchup=False,
 ) as dag:
-    run_docker_task = DockerOperator(
-        task_id="download_ongoing",
-        image="ghcr.io/{{ var.value.REPO_OWNER }}/data_backend:"
-        "{{ var.value.BACKEND_TAG | default('latest', true) }}",
-        api_version="auto",
-        auto_remove="force",
+    schedules_task = ResumableDockerOperator(
+        task_id="download_schedules",
         command=(
             "uv run python -m scripts.football_api.download_ongoing "
+            "{{ ds }} {{ dag.dag_id }} "
+            f"--schedules-only --max-wait {MAX_WAIT_SECONDS}"
+        ),
+        **docker_kwargs,
+    )
+
+    download_tasks = ResumableDockerOperator.partial(
+        task_id="download_ongoing",
+        **docker_kwargs,
+    ).expand(
+        command=[
+            "uv run python -m scripts.football_api.download_ongoing "
+            "{{ ds }} {{ dag.dag_id }} "
+            f"--shard '{spec}' --stored-schedules --max-wait {MAX_WAIT_SECONDS}"
+            for spec in SHARD_SPECS
+        ]
+    )
+
+    summary_task = DockerOperator(
+        task_id="download_summary",
+        command=(
+            "uv run python -m scripts.football_api.download_summary "
             "{{ ds }} {{ dag.dag_id }}"
         ),
-        docker_url="unix://var/run/docker.sock",
-        network_mode="football_graphs_project-net",
-        mounts=[
-            Mount(
-                source=f"{PROJECT_DATA_ROOT}/Secret/python_user",
-                target="/home/app/.aws/credentials",
-                type="bind",
-                read_only=True,
-            )
-        ],
-        environment={
-            "POSTGRES_HOST": "{{ conn.footgraph_db.host }}",
-            "POSTGRES_USER": "{{ conn.footgraph_db.login }}",
-            "POSTGRES_PASSWORD": "{{ conn.footgraph_db.password }}",
-            "POSTGRES_DB": "{{ conn.footgraph_db.schema }}",
-            "API_FOOTBALL_KEY": "{{ var.value.API_FOOTBALL_KEY }}",
-        },
-        mount_tmp_dir=False,
+        trigger_rule="all_done",
+        **docker_kwargs,
     )
 
-    run_docker_task
+    schedules_task >> download_tasks >> summary_task
@@ -1,3 +1,4 @@
+import copy
 from pathlib import Path
 from unittest import mock
 
@@ -62,3 +63,33 @@ def test_called_script_exists(dagbag):
                 assert Path(module_path).exists(), (
                     f"Script called in {dag_id} dag not found: {module_path}"
                 )
+
+
+def test_summary_runs_after_all_download_shards(dagbag):
+    dag = dagbag.get_dag("football_api_download")
+    summary = dag.get_task("download_summary")
+
+    assert summary.upstream_task_ids == {"download_ongoing"}
+    assert summary.trigger_rule == "all_done"
+
+
+def test_shards_download_the_stored_schedules(dagbag):
+    dag = dagbag.get_dag("football_api_download")
+    schedules = dag.get_task("download_schedules")
+    shards = dag.get_task("download_ongoing")
+
+    assert "--schedules-only" in schedules.command
+    assert shards.upstream_task_ids == {"download_schedules"}
+    for command in shards.expand_input.value["command"]:
+        assert "--stored-schedules" in command
+        assert "--request-limit" not in command
+
+
+def test_resumed_download_only_drains_the_backlog(dagbag):
+    dag = dagbag.get_dag("football_api_download")
+    task = copy.copy(dag.get_task("download_schedules"))
+
+    with mock.patch.object(DockerOperator, "execute", return_value="done"):
+        task.execute(context={}, event="2026-02-21T00:00:00+00:00")
+
+    assert task.command.endswith(" --schedules-only --max-wait 60 --resume")
@@ -0,0 +1,137 @@
+"""
+Benchmark reading pending requests from the `requests` table.
+
+Compares the ORM path, which loads `RequestDB` instances and converts them
+with `StoredRequest.from_orm`, with the Core path of `RequestStore`, which
+maps selected columns straight into `StoredRequest` records.
+
+Usage::
+
+    uv run python benchmarks/request_store.py --rows 10000 100000 1000000
+    uv run python benchmarks/request_store.py --db-url postgresql+psycopg2://...
+
+The benchmark rows, named ``benchmark``, are replaced before every row count
+and deleted at the end; other requests in the database are left alone.
+"""
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from sqlalchemy import delete, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from data_backend.database.models import RequestDB, RequestStatusEnum
+from data_backend.database.requests import RequestStore
+from data_backend.models import StoredRequest
+
+NAME = "benchmark"
+CHUNK_SIZE = 10_000
+
+
+def populate(engine: Engine, rows: int) -> None:
+    table = RequestDB.__table__  # type: ignore[attr-defined]
+    with engine.begin() as connection:
+        connection.execute(delete(table).where(table.c.name == NAME))
+        for start in range(0, rows, CHUNK_SIZE):
+            connection.execute(
+                insert(table),
+                [
+                    {
+                        "name": NAME,
+                        "logical_date": "2026-02-20",
+                        "url": "https://v3.football.api-sports.io/fixtures",
+                        "type": "fixtures",
+                        "params": {"id": str(n)},
+                        "payload": None,
+                        "tags": {"league": n % 100},
+                        "status": RequestStatusEnum.PENDING.value,
+                        "attempts": 0,
+                    }
+                    for n in range(start, min(start + CHUNK_SIZE, rows))
+                ],
+            )
+
+
+def read_orm(session_factory: sessionmaker) -> list[StoredRequest]:
+    with session_factory() as session:
+        stmt = (
+            select(RequestDB)
+            .where(
+                RequestDB.status == RequestStatusEnum.PENDING, RequestDB.name == NAME
+            )
+            .order_by(RequestDB.id)
+        )
+        return [StoredRequest.from_orm(r) for r in session.exec(stmt).all()]
+
+
+def read_core(session_factory: sessionmaker) -> list[StoredRequest]:
+    return RequestStore(session_factory).get_pending(NAME)
+
+
+def measure(
+    read: Callable[[sessionmaker], list[StoredRequest]],
+    session_factory: sessionmaker,
+    repeat: int,
+) -> tuple[int, float]:
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = len(read(session_factory))
+        best = min(best, time.perf_counter() - started)
+    return count, best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the ORM and Core read paths of pending requests"
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+        help="Numbers of pending rows to read.",
+    )
+    parser.add_argument(
+        "--db-url",
+        help="Database to benchmark on. Defaults to a temporary SQLite file.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per path; the best counts."
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(args.db_url or f"sqlite:///{Path(tmp) / 'bench.db'}")
+        SQLModel.metadata.create_all(
+            engine,
+            tables=[RequestDB.__table__],  # type: ignore[attr-defined]
+        )
+        # sqlmodel's Session does not match the session protocol of the stubs.
+        session_factory = sessionmaker(  # type: ignore[type-var]
+            bind=engine, class_=Session, expire_on_commit=False
+        )
+        print(f"{'rows':>10} {'orm rows/s':>12} {'core rows/s':>12} {'speedup':>8}")
+        for rows in args.rows:
+            populate(engine, rows)
+            orm_count, orm_time = measure(read_orm, session_factory, args.repeat)
+            core_count, core_time = measure(read_core, session_factory, args.repeat)
+            assert orm_count == core_count == rows
+            print(
+                f"{rows:>10} {rows / orm_time:>12,.0f} {rows / core_time:>12,.0f} "
+                f"{orm_time / core_time:>7.1f}x"
+            )
+        table = RequestDB.__table__  # type: ignore[attr-defined]
+        with engine.begin() as connection:
+            connection.execute(delete(table).where(table.c.name == NAME))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,39 @@
+import io
 import logging
 from collections import deque
+from collections.abc import Callable
+from datetime import datetime
 from typing import Deque
 
 import requests
 
 from data_backend.aws import S3Client
+from data_backend.circuit_breaker import CircuitBreaker
+from data_backend.columnar import ColumnarWriter
+from data_backend.database.manifest import ManifestStore
 from data_backend.database.models import RequestStatusEnum
+from data_backend.database.quota import QuotaStore
 from data_backend.database.requests import RequestStore
-from data_backend.exceptions import RequestLimitReachedException
-from data_backend.handlers import ResponseHandler
-from data_backend.models import APIRequest, StoredRequest
+from data_backend.exceptions import (
+    CircuitOpenException,
+    DownloadDeferredException,
+    RequestLimitReachedException,
+)
+from data_backend.handlers import PendingDocuments, ResponseHandler
+from data_backend.keys import KeyPool
+from data_backend.models import (
+    APIRequest,
+    APIResponse,
+    ManifestEntry,
+    ParsedDocument,
+    StoredObject,
+    StoredRequest,
+)
+from data_backend.profiling import StageProfiler, stage
+from data_backend.quota import SharedQuota
 from data_backend.rate_limiter import RateLimiter
 from data_backend.requester import HTTPRequester
+from data_backend.storage import StorageBackend
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +47,10 @@ class APIDownloader:
     - Executes them with rate/request limits.
     - Parses responses with a response handler.
     - Stores raw data in object storage.
+    - Optionally indexes stored objects in a manifest table.
+    - Optionally writes flattened data as columnar Parquet files.
+    - Streams bodies of request types opted into streaming straight to
+      storage; these are not flattened.
     - Marks requests as succeeded or failed.
     """
 
@@ -36,10 +62,21 @@ class APIDownloader:
         http_session: requests.Session | None = None,
         rate_limit: RateLimiter | None = None,
         request_limit: int | None = None,
-        storage_client: S3Client = S3Client(
+        quota: SharedQuota | None = None,
+        storage_client: StorageBackend = S3Client(
             bucket_name="raw-data", endpoint="http://minio:9000"
         ),
         request_store: RequestStore = RequestStore(),
+        manifest_store: ManifestStore | None = None,
+        columnar_writer: ColumnarWriter | None = None,
+        circuit_breaker: Callable[[], CircuitBreaker] | None = None,
+        profiler: StageProfiler | None = None,
+        queue_high_watermark: int | None = None,
+        queue_low_watermark: int | None = None,
+        max_wait: float | None = None,
+        key_pool: KeyPool | None = None,
+        quota_store: QuotaStore | None = None,
+        quota_key: str | None = None,
     ) -> None:
         """
         Initialize an APIDownloader.
@@ -53,29 +90,101 @@ class APIDownloader:
         rate_limit : RateLimiter, optional
             An optional rate limiter to throttle request frequency.
         request_limit : int, optional
-            Maximum number of requests allowed in this session. If None, unlimited.
-        storage_client : S3Client, optional
-            Object storage client for persisting raw responses. Default stores in MinIO.
+            Maximum number of requests counted against ``quota_key`` per UTC
+            day. If None, unlimited.
+        quota : SharedQuota, optional
+            A request quota shared with other downloaders, e.g. parallel workers.
+        storage_client : StorageBackend, optional
+            Object storage for persisting raw responses, e.g. `S3Client`,
+            `LocalStorage` or `MemoryStorage`. Default stores in MinIO.
         request_store : RequestStore, optional
             Database access object for persisting and retrieving requests.
+        manifest_store : ManifestStore, optional
+            Index of saved objects. If provided, every object written to storage
+            is recorded with its key, size, checksum and request tags.
+        columnar_writer : ColumnarWriter, optional
+            Writer for columnar output. If provided, parsed data is flattened
+            with the handler's flatteners and written as partitioned Parquet.
+        circuit_breaker : callable, optional
+            Factory of per-host circuit breakers, e.g. the ``CircuitBreaker``
+            class. When a host's circuit opens, the download stops and the
+            remaining requests are left pending for a later run.
+        profiler : StageProfiler, optional
+            Profiler measuring the pipeline stages: ``rate_limit``, ``http``,
+            ``parse``, ``storage``, ``manifest``, ``columnar`` and ``database``.
+        queue_high_watermark : int, optional
+            Maximum number of requests held in the in-memory queue. Requests
+            added above it are only persisted as pending (spilled) and paged
+            back in from the database as the queue drains. If None, the queue
+            is unbounded.
+        queue_low_watermark : int, optional
+            Queue length at which spilled requests are paged back in, up to
+            the high watermark. Default is half the high watermark.
+        max_wait : float, optional
+            Longest rate-limit wait in seconds. If a longer wait, or a reached
+            request limit or quota, stops the download, the remaining requests
+            stay pending and ``resume_at`` tells when to run again. If None,
+            rate-limit waits are always slept.
+        key_pool : KeyPool, optional
+            API keys to spread the requests over, each with its own rate limit
+            and daily quota.
+        quota_store : QuotaStore, optional
+            Store of the daily request counters. Defaults to a store in the
+            database of the request store.
+        quota_key : str, optional
+            The daily request counter, shared by all downloads using the same
+            key. Defaults to the download name.
+
+        Raises
+        ------
+        ValueError
+            If the low watermark is negative or not below the high watermark.
         """
         self.name = name
         self.logical_date = logical_date
         self.requests: RequestStore = request_store
         self.handler: ResponseHandler = response_handler
-        self.files: S3Client = storage_client
+        self.files: StorageBackend = storage_client
+        self.manifest: ManifestStore | None = manifest_store
+        self.columnar: ColumnarWriter | None = columnar_writer
+        self.profiler: StageProfiler | None = profiler
         self.requester: HTTPRequester = HTTPRequester(
             http_session=http_session,
             rate_limit=rate_limit,
             request_limit=request_limit,
-            request_count=self.requests.get_today_count(name=name),
+            quota_store=quota_store or QuotaStore(self.requests.session_factory),
+            quota_key=quota_key or name,
+            quota=quota,
+            circuit_breaker=circuit_breaker,
+            profiler=profiler,
+            max_wait=max_wait,
+            key_pool=key_pool,
         )
+        self.resume_at: datetime | None = None
+        self.queue_high_watermark = queue_high_watermark
+        self.queue_low_watermark = queue_low_watermark
+        if queue_high_watermark is not None:
+            low = (
+                queue_low_watermark
+                if queue_low_watermark is not None
+                else queue_high_watermark // 2
+            )
+            if not 0 <= low < queue_high_watermark:
+                raise ValueError(
+                    "Queue watermarks must satisfy 0 <= low < high, got "
+                    f"low={low}, high={queue_high_watermark}"
+                )
+            self.queue_low_watermark = low
         self._queue: Deque[StoredRequest] = deque()
+        self._spilled = False
 
     def add(self, request: APIRequest) -> None:
         """
         Add request to the processing queue and persist it in the database.
 
+        If the queue is at its high watermark, or requests are already spilled,
+        the request is only persisted and paged in later.
+
         Parameters
         ----------
         request : APIRequest
@@ -84,42 +193,218 @@ class APIDownloader:
         stored_request = StoredRequest(
             request=request, name=self.name, logical_date=self.logical_date
         )
-        self.requests.add(stored_request)
+        with stage(self.profiler, "database"):
+            self.requests.add(stored_request)
+        if self.queue_high_watermark is not None and (
+            self._spilled or len(self._queue) >= self.queue_high_watermark
+        ):
+            self._spilled = True
+            return
         self._queue.append(stored_request)
 
+    def add_stored(self, request: APIRequest, key: str) -> None:
+        """
+        Add the requests generated from a response downloaded by another run.
+
+        The response is read back from storage under ``key`` and run through
+        the handler as if it had been downloaded for ``request``; the requests
+        it generates are added, but nothing is stored and no quota is spent.
+        If nothing is stored under ``key``, ``request`` is added to be
+        downloaded instead.
+
+        Parameters
+        ----------
+        request : APIRequest
+            The request whose response is stored.
+        key : str
+            Storage key of the response body.
+        """
+        with stage(self.profiler, "storage"):
+            stored = key in self.files.list_keys(key)
+        if not stored:
+            logger.warning(f"No stored response at {key}, downloading {request.url}.")
+            self.add(request)
+            return
+        with stage(self.profiler, "storage"):
+            body = self.files.read_bytes(key)
+        response = APIResponse(content=body, request=request)
+        with stage(self.profiler, "parse"):
+            if self.handler.streams(request.type):
+                response.stream = io.BytesIO(body)
+                self.handler.handle_stream(response)
+            else:
+                self.handler.handle_all(response)
+        for new_request in self.handler.collect_new_requests():
+            self.add(new_request)
+
     def download(self) -> None:
         """
         Process requests in the queue until it is empty.
         """
-        while self._queue:
-            r = self._queue.popleft()
-            request = r.request
-
-            try:
-                response = self.requester.get(request)
-            except RequestLimitReachedException:
-                logger.exception(
-                    f"Request limit of {self.requester.request_limit} reached."
-                )
-                return
+        try:
+            self._download()
+        finally:
+            if self.columnar is not None:
+                with stage(self.profiler, "columnar"):
+                    self.columnar.flush()
+            with stage(self.profiler, "storage"):
+                self.files.flush()
 
-            if response.error:
-                logger.exception(f"Error downloading {request.url}: {response.error}")
-                self.requests.complete(r, RequestStatusEnum.FAILED)
-                continue
+    def _download(self) -> None:
+        # With a parse executor, a response is parsed while the next one is
+        # downloaded; `pending` holds it until its documents are collected.
+        pending: tuple[StoredRequest, PendingDocuments] | None = None
+        try:
+            while True:
+                # The request still being parsed is out of the queue but not
+                # yet marked as succeeded, so it must not be paged in again.
+                self._page_in(pending[0] if pending is not None else None)
+                if not self._queue:
+                    if pending is None:
+                        return
+                    # The parse may still generate requests to download.
+                    finished, pending = pending, None
+                    self._finish(*finished)
+                    continue
+                r = self._queue.popleft()
+                request = r.request
 
-            data, path = self.handler.handle(response)
-            self.files.save_json(data, f"{r.logical_date}/{path}")
-            for request in self.handler.collect_new_requests():
-                self.add(request)
-            req_status = RequestStatusEnum.SUCCEEDED
-            self.requests.complete(r, req_status)
+                try:
+                    response = self.requester.get(
+                        request, stream=self.handler.streams(request.type)
+                    )
+                except DownloadDeferredException as e:
+                    self.resume_at = e.resume_at
+                    logger.info(
+                        f"{e} Deferring {len(self._queue) + 1} requests until "
+                        f"{e.resume_at.isoformat()}."
+                    )
+                    return
+                except RequestLimitReachedException as e:
+                    logger.exception(str(e))
+                    return
+                except CircuitOpenException as e:
+                    logger.error(
+                        f"{e} Leaving {len(self._queue) + 1} requests pending."
+                    )
+                    return
+
+                if (
+                    self.handler.executor is not None
+                    and not response.error
+                    and response.stream is None
+                ):
+                    with stage(self.profiler, "parse"):
+                        submitted = self.handler.submit_all(response)
+                    previous, pending = pending, (r, submitted)
+                    if previous is not None:
+                        self._finish(*previous)
+                    continue
+                if pending is not None:
+                    finished, pending = pending, None
+                    self._finish(*finished)
+
+                if response.error:
+                    if self.requester.circuit_open(request):
+                        logger.error(
+                            f"Error downloading {request.url}: {response.error}. "
+                            f"Circuit opened, leaving {len(self._queue) + 1} "
+                            "requests pending."
+                        )
+                        return
+                    logger.exception(
+                        f"Error downloading {request.url}: {response.error}"
+                    )
+                    with stage(self.profiler, "database"):
+                        self.requests.complete(
+                            r, RequestStatusEnum.FAILED, response.error
+                        )
+                    continue
+
+                if response.stream is not None:
+                    self._store_stream(r, response)
+                else:
+                    with stage(self.profiler, "parse"):
+                        documents = self.handler.handle_all(response)
+                    for document in documents:
+                        self._store(r, document)
+                self._complete(r)
+        finally:
+            if pending is not None:
+                self._finish(*pending)
+
+    def _finish(self, r: StoredRequest, pending: PendingDocuments) -> None:
+        with stage(self.profiler, "parse"):
+            documents = pending.result()
+        for document in documents:
+            self._store(r, document)
+        self._complete(r)
+
+    def _complete(self, r: StoredRequest) -> None:
+        for request in self.handler.collect_new_requests():
+            self.add(request)
+        with stage(self.profiler, "database"):
+            self.requests.complete(r, RequestStatusEnum.SUCCEEDED)
+
+    def _page_in(self, in_flight: StoredRequest | None = None) -> None:
+        if not self._spilled or len(self._queue) > (self.queue_low_watermark or 0):
+            return
+        limit = (self.queue_high_watermark or 0) - len(self._queue)
+        queued = [*self._queue, in_flight] if in_flight else list(self._queue)
+        with stage(self.profiler, "database"):
+            page = self.requests.get_pending(
+                self.name,
+                include_failed=True,
+                limit=limit,
+                exclude_ids=[r.id for r in queued if r.id is not None],
+            )
+        logger.debug(f"Paged in {len(page)} spilled requests.")
+        self._queue.extend(page)
+        self._spilled = len(page) >= limit
+
+    def _store(self, r: StoredRequest, document: ParsedDocument) -> None:
+        key = f"{r.logical_date}/{document.path}"
+        body = document.raw if document.raw is not None else document.data
+        with stage(self.profiler, "storage"):
+            stored = self.files.save_json(body, key)
+        self._index(r, document, stored)
+        if self.columnar is not None:
+            with stage(self.profiler, "columnar"):
+                partition = (document.tags or {}).get("date") or r.logical_date
+                tables = self.handler.flatten(document.type, document.data)
+                for table, rows in tables.items():
+                    self.columnar.write(table, rows, partition=partition)
+
+    def _store_stream(self, r: StoredRequest, response: APIResponse) -> None:
+        with response.stream as stream:
+            with stage(self.profiler, "parse"):
+                document = self.handler.handle_stream(response)
+            key = f"{r.logical_date}/{document.path}"
+            with stage(self.profiler, "storage"):
+                stored = self.files.save_stream(stream, key)
+        self._index(r, document, stored)
+
+    def _index(
+        self, r: StoredRequest, document: ParsedDocument, stored: StoredObject
+    ) -> None:
+        if self.manifest is not None:
+            with stage(self.profiler, "manifest"):
+                self.manifest.add(ManifestEntry.from_stored(stored, r, document))
 
     def download_backlog(self) -> None:
         """
         Download all pending requests from the database.
+
+        Failed requests whose next retry is due are downloaded again. With a
+        high watermark, only the first page is loaded and the rest is paged in
+        as the queue drains.
         """
-        pending_requests = self.requests.get_pending(self.name)
+        limit = self.queue_high_watermark
+        pending_requests = self.requests.get_pending(
+            self.name, include_failed=True, limit=limit
+        )
         logger.info(f"Found {len(pending_requests)} pending requests to download.")
         self._queue.extend(pending_requests)
+        if limit is not None and len(pending_requests) >= limit:
+            self._spilled = True
         self.download()
@@ -1,7 +1,64 @@
+import hashlib
 import json
-from typing import Any
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import IO, Any
 
 import boto3
+from botocore.client import BaseClient
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from data_backend.models import StoredObject
+from data_backend.storage import STREAM_CHUNK_SIZE
+
+POINTER_CONTENT_TYPE = "application/vnd.content-pointer+json"
+
+DEFAULT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    connect_timeout=5,
+    read_timeout=60,
+    tcp_keepalive=True,
+)
+
+_clients: dict[tuple[int, str | None, Config], BaseClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_s3_client(
+    endpoint: str | None = None, config: Config = DEFAULT_CONFIG
+) -> BaseClient:
+    """
+    Return the process-wide S3 client for an endpoint and config.
+
+    Clients are thread-safe and pool their connections, so one client per
+    process is shared by all threads. Creating clients is not thread-safe, so
+    it is serialized. A forked process creates its own client.
+
+    Parameters
+    ----------
+    endpoint : str or None, optional
+        The endpoint URL for the S3 service. Default is ``None`` (AWS).
+    config : botocore.config.Config, optional
+        Client configuration. Default is `DEFAULT_CONFIG`.
+
+    Returns
+    -------
+    botocore.client.BaseClient
+        A shared boto3 S3 client.
+    """
+    key = (os.getpid(), endpoint, config)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = boto3.session.Session().client(
+                "s3", endpoint_url=endpoint, config=config
+            )
+        return _clients[key]
 
 
 class S3Client:
@@ -9,10 +66,25 @@ class S3Client:
     A simple wrapper around the boto3 S3 client for saving JSON objects.
 
     Provides convenience methods for interacting with S3, such as saving
-    Python dictionaries as JSON files.
+    Python dictionaries as JSON files and listing or reading stored objects.
+
+    In content-addressed mode every JSON payload is stored once under
+    ``{object_prefix}{sha256}`` and the logical key only holds a small pointer
+    to it, so identical payloads saved under different keys are uploaded once.
+
+    The client is safe to share between threads; `save_many` and
+    `exists_many` use a thread pool as large as its connection pool.
     """
 
-    def __init__(self, bucket_name: str = "raw-data", endpoint: str | None = None):
+    def __init__(
+        self,
+        bucket_name: str = "raw-data",
+        endpoint: str | None = None,
+        content_addressed: bool = False,
+        object_prefix: str = "objects/",
+        config: Config = DEFAULT_CONFIG,
+        known_objects: int = 10_000,
+    ):
         """
         Initialize the S3 client.
 
@@ -24,26 +96,285 @@ class S3Client:
             The endpoint URL for the S3 service. Useful for connecting
             to local or non-AWS S3-compatible services (e.g., MinIO).
             Default is ``None``.
+        content_addressed : bool, optional
+            Store JSON payloads by content hash and write pointers under the
+            logical keys. Default is ``False``.
+        object_prefix : str, optional
+            Key prefix of content-addressed objects. Default is ``"objects/"``.
+        config : botocore.config.Config, optional
+            Client configuration: connection pool size, retry mode, timeouts
+            and TCP keepalive. Clients with the same endpoint and config are
+            shared within the process. Default is `DEFAULT_CONFIG`.
+        known_objects : int, optional
+            Number of content-addressed objects remembered as uploaded, so
+            they are not checked again. The least recently saved are
+            forgotten first. Default is ``10_000``.
         """
-        self.s3_client = boto3.client("s3", endpoint_url=endpoint)
+        self.s3_client = get_s3_client(endpoint, config)
+        self.max_workers: int = config.max_pool_connections or 10
         self.bucket_name = bucket_name
+        self.content_addressed = content_addressed
+        self.object_prefix = object_prefix
+        self.known_objects = known_objects
+        self._known_etags: OrderedDict[str, str | None] = OrderedDict()
+        self._known_etags_lock = threading.Lock()
 
-    def save_json(self, data: dict[str, Any], key: str) -> None:
+    def save_json(self, data: dict[str, Any] | bytes, key: str) -> StoredObject:
         """
         Save a dictionary as a JSON object in the configured S3 bucket.
 
         Parameters
         ----------
-        data : dict of (str, Any)
-            The dictionary to serialize as JSON and upload.
+        data : dict of (str, Any) or bytes
+            The dictionary to serialize as JSON and upload, or an already
+            serialized JSON document, uploaded as-is without copying.
         key : str
             The object key (path/filename) under which the JSON
             will be stored in the S3 bucket.
+
+        Returns
+        -------
+        StoredObject
+            Key, size, SHA-256 checksum and ETag of the uploaded object.
+        """
+        if isinstance(data, bytes):
+            body = data
+        else:
+            body = json.dumps(data).encode("utf-8")
+        if self.content_addressed:
+            checksum = hashlib.sha256(body).hexdigest()
+            return self._save_content_addressed(body, key, checksum, len(body))
+        return self.save_bytes(body, key, content_type="application/json")
+
+    def save_many(
+        self, items: Iterable[tuple[dict[str, Any] | bytes, str]]
+    ) -> list[StoredObject]:
+        """
+        Save JSON documents concurrently with `save_json`.
+
+        Parameters
+        ----------
+        items : iterable of (dict or bytes, str)
+            Pairs of document and object key.
+
+        Returns
+        -------
+        list of StoredObject
+            The stored objects, in the order of ``items``.
         """
-        json_bytes = json.dumps(data)
-        self.s3_client.put_object(
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(lambda item: self.save_json(*item), items))
+
+    def exists_many(self, keys: Iterable[str]) -> dict[str, bool]:
+        """
+        Check which objects exist, with concurrent HEAD requests.
+
+        Parameters
+        ----------
+        keys : iterable of str
+            The object keys to check.
+
+        Returns
+        -------
+        dict of (str, bool)
+            Whether each key exists.
+        """
+        keys = list(keys)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            etags = executor.map(self._head_etag, keys)
+            return {key: etag is not None for key, etag in zip(keys, etags)}
+
+    def save_stream(
+        self, stream: IO[bytes], key: str, content_type: str = "application/json"
+    ) -> StoredObject:
+        """
+        Save a seekable binary stream, e.g. a spooled response body.
+
+        The stream is read twice in chunks, once to compute its checksum and
+        once to upload it, so it is never loaded into memory as a whole.
+
+        Parameters
+        ----------
+        stream : IO of bytes
+            A seekable binary file object positioned at its start.
+        key : str
+            The object key (path/filename) in the S3 bucket.
+        content_type : str, optional
+            MIME type stored with the object. Default is ``"application/json"``.
+
+        Returns
+        -------
+        StoredObject
+            Key, size, SHA-256 checksum and ETag of the uploaded object.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in iter(partial(stream.read, STREAM_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+        stream.seek(0)
+        if self.content_addressed:
+            return self._save_content_addressed(stream, key, digest.hexdigest(), size)
+        return StoredObject(
+            key=key,
+            size=size,
+            checksum=digest.hexdigest(),
+            etag=self._put(stream, key, content_type),
+        )
+
+    def _save_content_addressed(
+        self, body: bytes | IO[bytes], key: str, checksum: str, size: int
+    ) -> StoredObject:
+        object_key = f"{self.object_prefix}{checksum}"
+        with self._known_etags_lock:
+            known = object_key in self._known_etags
+            if known:
+                self._known_etags.move_to_end(object_key)
+                etag = self._known_etags[object_key]
+        if not known:
+            etag = self._head_etag(object_key)
+            if etag is None:
+                etag = self._put(body, object_key, "application/json")
+            with self._known_etags_lock:
+                self._known_etags[object_key] = etag
+                self._known_etags.move_to_end(object_key)
+                while len(self._known_etags) > self.known_objects:
+                    self._known_etags.popitem(last=False)
+        pointer = {"object": object_key, "sha256": checksum, "size": size}
+        self.save_bytes(
+            json.dumps(pointer).encode("utf-8"), key, content_type=POINTER_CONTENT_TYPE
+        )
+        return StoredObject(key=key, size=size, checksum=checksum, etag=etag)
+
+    def _put(self, body: bytes | IO[bytes], key: str, content_type: str) -> str | None:
+        response = self.s3_client.put_object(
             Bucket=self.bucket_name,
             Key=key,
-            Body=json_bytes.encode("utf-8"),
-            ContentType="application/json",
+            Body=body,
+            ContentType=content_type,
+        )
+        return response.get("ETag", "").strip('"') or None
+
+    def _head_etag(self, key: str) -> str | None:
+        try:
+            response = self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return None
+            raise
+        return response.get("ETag", "").strip('"') or None
+
+    def save_bytes(
+        self, body: bytes, key: str, content_type: str = "application/octet-stream"
+    ) -> StoredObject:
+        """
+        Save raw bytes as an object in the configured S3 bucket.
+
+        Parameters
+        ----------
+        body : bytes
+            The object content to upload.
+        key : str
+            The object key (path/filename) in the S3 bucket.
+        content_type : str, optional
+            MIME type stored with the object. Default is
+            ``"application/octet-stream"``.
+
+        Returns
+        -------
+        StoredObject
+            Key, size, SHA-256 checksum and ETag of the uploaded object.
+        """
+        return StoredObject(
+            key=key,
+            size=len(body),
+            checksum=hashlib.sha256(body).hexdigest(),
+            etag=self._put(body, key, content_type),
         )
+
+    def read_bytes(self, key: str, byte_range: tuple[int, int] | None = None) -> bytes:
+        """
+        Read an object, or a byte range of it, from the configured S3 bucket.
+
+        Parameters
+        ----------
+        key : str
+            The object key to read.
+        byte_range : tuple of (int, int), optional
+            Start offset and length of the range to fetch with a ranged GET.
+            If ``None``, the whole object is read, following content pointers.
+
+        Returns
+        -------
+        bytes
+            The object content.
+        """
+        kwargs: dict[str, Any] = {"Bucket": self.bucket_name, "Key": key}
+        if byte_range is not None:
+            offset, length = byte_range
+            kwargs["Range"] = f"bytes={offset}-{offset + length - 1}"
+        response = self.s3_client.get_object(**kwargs)
+        body = response["Body"].read()
+        if byte_range is None and response.get("ContentType") == POINTER_CONTENT_TYPE:
+            return self.read_bytes(json.loads(body)["object"])
+        return body
+
+    def read_buffer(self, key: str) -> bytes:
+        """
+        Read a whole object for parsing.
+
+        Objects are downloaded, so unlike local files they cannot be mapped;
+        the content is returned as bytes.
+
+        Parameters
+        ----------
+        key : str
+            The object key to read.
+
+        Returns
+        -------
+        bytes
+            The object content.
+        """
+        return self.read_bytes(key)
+
+    def list_keys(self, prefix: str = "") -> list[str]:
+        """
+        List object keys under a prefix in the configured S3 bucket.
+
+        Parameters
+        ----------
+        prefix : str, optional
+            Key prefix to list. Default lists the whole bucket.
+
+        Returns
+        -------
+        list of str
+            The matching object keys in lexicographic order.
+        """
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        return [
+            obj["Key"]
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
+            for obj in page.get("Contents", [])
+        ]
+
+    def delete(self, keys: list[str]) -> None:
+        """
+        Delete objects from the configured S3 bucket.
+
+        Parameters
+        ----------
+        keys : list of str
+            The object keys to delete. Deleted in batches of 1000.
+        """
+        for start in range(0, len(keys), 1000):
+            self.s3_client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={"Objects": [{"Key": k} for k in keys[start : start + 1000]]},
+            )
+
+    def flush(self) -> None:
+        """
+        Do nothing, every object is uploaded when it is saved.
+        """
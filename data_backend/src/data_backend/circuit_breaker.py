@@ -0,0 +1,127 @@
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Literal
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class CircuitBreaker:
+    """
+    Tracks the health of a remote endpoint and stops calls while it is failing.
+
+    The circuit starts closed. It opens after ``failure_threshold`` consecutive
+    failures, or when the failure rate over the last ``window`` calls reaches
+    ``error_rate``. While open, calls are refused until ``reset_timeout``
+    seconds have passed; then a single probe call is let through (half-open).
+    A successful probe closes the circuit, a failed one opens it again. A probe
+    that never reports back is replaced by a new one after another timeout.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        error_rate: float = 0.5,
+        window: int = 20,
+        reset_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize a CircuitBreaker.
+
+        Parameters
+        ----------
+        failure_threshold : int, optional
+            Consecutive failures that open the circuit. Default is ``5``.
+        error_rate : float, optional
+            Failure rate over a full window that opens the circuit.
+            Default is ``0.5``.
+        window : int, optional
+            Number of most recent calls the failure rate is computed over.
+            Default is ``20``.
+        reset_timeout : float, optional
+            Seconds the circuit stays open before a probe call is allowed.
+            Default is ``60.0``.
+        clock : callable, optional
+            Monotonic clock returning seconds. Default is ``time.monotonic``.
+        """
+        self.failure_threshold = failure_threshold
+        self.error_rate = error_rate
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._consecutive_failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        """
+        Current state of the circuit.
+
+        Returns
+        -------
+        {"closed", "open", "half_open"}
+            ``"half_open"`` once the reset timeout of an open circuit passed.
+        """
+        if self._opened_at is None:
+            return "closed"
+        if self.clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def retry_after(self) -> float:
+        """
+        Seconds until an open circuit lets a probe call through.
+
+        Returns
+        -------
+        float
+            ``0.0`` unless the circuit is open.
+        """
+        if self.state != "open" or self._opened_at is None:
+            return 0.0
+        return self._opened_at + self.reset_timeout - self.clock()
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may be made.
+
+        Returns
+        -------
+        bool
+            ``True`` if the circuit is closed, or if it is half-open, in which
+            case the call is the probe and the timeout starts over.
+        """
+        state = self.state
+        if state == "half_open":
+            self._opened_at = self.clock()
+            self._probing = True
+        return state != "open"
+
+    def record_success(self) -> None:
+        """
+        Record a successful call, closing the circuit.
+        """
+        self._outcomes.append(True)
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """
+        Record a failed call, opening the circuit if it trips a threshold.
+        """
+        self._outcomes.append(False)
+        self._consecutive_failures += 1
+        if self._probing or self._tripped():
+            self._opened_at = self.clock()
+        self._probing = False
+
+    def _tripped(self) -> bool:
+        if self._consecutive_failures >= self.failure_threshold:
+            return True
+        if len(self._outcomes) < (self._outcomes.maxlen or 0):
+            return False
+        failures = self._outcomes.count(False)
+        return failures / len(self._outcomes) >= self.error_rate
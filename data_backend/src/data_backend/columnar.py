@@ -0,0 +1,140 @@
+import io
+import logging
+import uuid
+from collections import defaultdict
+from typing import Any
+
+from data_backend.models import StoredObject
+from data_backend.storage import StorageBackend
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+TableSchema = dict[str, str]
+
+
+class ColumnarWriter:
+    """
+    Buffers flattened rows and writes them as partitioned Parquet files.
+
+    Rows are buffered per table and partition value, converted to typed Arrow
+    record batches and written in large row groups. Files are laid out as
+    ``{table}/data/{partition_by}={value}/{uuid}.parquet``, which matches the
+    Iceberg data layout, so the files can be registered with an Iceberg table
+    (e.g. with Spark's ``add_files`` procedure).
+    """
+
+    def __init__(
+        self,
+        storage_client: StorageBackend,
+        schemas: dict[str, TableSchema],
+        partition_by: str = "date",
+        row_group_size: int = 128_000,
+        compression: str = "zstd",
+    ) -> None:
+        """
+        Initialize a ColumnarWriter.
+
+        Parameters
+        ----------
+        storage_client : StorageBackend
+            Object storage client the Parquet files are written to.
+        schemas : dict of (str, TableSchema)
+            Mapping from table name to its columns, given as a mapping from
+            column name to Arrow type alias (e.g. ``"int64"``, ``"string"``).
+        partition_by : str, optional
+            Name of the partition column used in the file layout.
+            Default is ``"date"``.
+        row_group_size : int, optional
+            Number of buffered rows per partition that triggers a write.
+            Also used as the Parquet row group size. Default is ``128_000``.
+        compression : str, optional
+            Parquet compression codec. Default is ``"zstd"``.
+
+        Raises
+        ------
+        ImportError
+            If pyarrow is not installed.
+        """
+        if pa is None:
+            raise ImportError(
+                "pyarrow is required for ColumnarWriter. "
+                "Install it with the 'columnar' extra of data-backend."
+            )
+        self.storage = storage_client
+        self.schemas: dict[str, pa.Schema] = {
+            table: pa.schema(
+                [(name, pa.type_for_alias(type_)) for name, type_ in columns.items()]
+            )
+            for table, columns in schemas.items()
+        }
+        self.partition_by = partition_by
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self._buffers: dict[tuple[str, str], list[pa.RecordBatch]] = defaultdict(list)
+        self._buffered_rows: dict[tuple[str, str], int] = defaultdict(int)
+
+    def write(self, table: str, rows: list[dict[str, Any]], partition: str) -> None:
+        """
+        Buffer rows for a table partition, writing a file if the buffer is full.
+
+        Parameters
+        ----------
+        table : str
+            Name of the target table. Must be present in the schemas.
+        rows : list of dict of (str, Any)
+            Flattened rows. Missing columns are stored as nulls.
+        partition : str
+            Partition value (e.g. the match date).
+
+        Raises
+        ------
+        ValueError
+            If no schema is registered for the table.
+        """
+        schema = self.schemas.get(table)
+        if schema is None:
+            raise ValueError(f"No schema registered for table '{table}'")
+        if not rows:
+            return
+        buffer_key = (table, partition)
+        self._buffers[buffer_key].append(
+            pa.RecordBatch.from_pylist(rows, schema=schema)
+        )
+        self._buffered_rows[buffer_key] += len(rows)
+        if self._buffered_rows[buffer_key] >= self.row_group_size:
+            self._write_partition(buffer_key)
+
+    def flush(self) -> list[StoredObject]:
+        """
+        Write all buffered rows to storage.
+
+        Returns
+        -------
+        list of StoredObject
+            The Parquet files written.
+        """
+        return [self._write_partition(key) for key in list(self._buffers)]
+
+    def _write_partition(self, buffer_key: tuple[str, str]) -> StoredObject:
+        table, partition = buffer_key
+        batches = self._buffers.pop(buffer_key)
+        num_rows = self._buffered_rows.pop(buffer_key)
+        sink = io.BytesIO()
+        pq.write_table(
+            pa.Table.from_batches(batches, schema=self.schemas[table]),
+            sink,
+            row_group_size=self.row_group_size,
+            compression=self.compression,
+        )
+        key = f"{table}/data/{self.partition_by}={partition}/{uuid.uuid4()}.parquet"
+        logger.info(f"Writing {num_rows} rows to {key}")
+        return self.storage.save_bytes(
+            sink.getvalue(), key, content_type="application/vnd.apache.parquet"
+        )
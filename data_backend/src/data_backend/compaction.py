@@ -0,0 +1,136 @@
+import gzip
+import io
+import json
+import logging
+from typing import Any
+
+from data_backend.database.manifest import ManifestStore
+from data_backend.models import StoredObject
+from data_backend.storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_SUFFIX = ".jsonl.gz"
+INDEX_SUFFIX = ".index.json"
+
+
+def compact(
+    storage_client: StorageBackend,
+    keys: list[str],
+    bundle_key: str,
+    delete_sources: bool = False,
+    manifest_store: ManifestStore | None = None,
+) -> StoredObject:
+    """
+    Pack small JSON objects into one compressed JSON-lines bundle.
+
+    Every document is compressed as a separate gzip member, so the bundle is a
+    valid ``.jsonl.gz`` file as a whole while each document can still be
+    fetched on its own with a ranged GET. A sidecar index maps every source key
+    to the byte offset and length of its member.
+
+    Parameters
+    ----------
+    storage_client : StorageBackend
+        Object storage holding the source objects. The bundle and its index
+        are written to the same bucket.
+    keys : list of str
+        Keys of the JSON objects to pack.
+    bundle_key : str
+        Key of the bundle without suffix. The bundle is written to
+        ``{bundle_key}.jsonl.gz`` and the index to ``{bundle_key}.index.json``.
+    delete_sources : bool, optional
+        Delete the source objects once the bundle and index are written.
+        Default is ``False``.
+    manifest_store : ManifestStore, optional
+        Manifest of the source objects. When the sources are deleted, their
+        entries are first pointed at the bundle, so they never reference a
+        missing object.
+
+    Returns
+    -------
+    StoredObject
+        The written bundle.
+    """
+    bundle = io.BytesIO()
+    documents: dict[str, dict[str, int]] = {}
+    for key in keys:
+        body = storage_client.read_bytes(key).rstrip(b"\n") + b"\n"
+        member = gzip.compress(body)
+        documents[key] = {
+            "offset": bundle.tell(),
+            "length": len(member),
+            "size": len(body),
+        }
+        bundle.write(member)
+
+    stored = storage_client.save_bytes(
+        bundle.getvalue(), bundle_key + BUNDLE_SUFFIX, content_type="application/gzip"
+    )
+    index = {"bundle": stored.key, "checksum": stored.checksum, "documents": documents}
+    storage_client.save_json(index, bundle_key + INDEX_SUFFIX)
+    logger.info(f"Compacted {len(keys)} objects into {stored.key} ({stored.size} B)")
+
+    if delete_sources:
+        if manifest_store is not None:
+            manifest_store.move_to_bundle(stored.key, documents)
+        storage_client.delete(keys)
+    return stored
+
+
+class BundleReader:
+    """
+    Reads individual documents from a compacted bundle with ranged GETs.
+    """
+
+    def __init__(self, storage_client: StorageBackend, bundle_key: str) -> None:
+        """
+        Initialize a BundleReader by loading the bundle index.
+
+        Parameters
+        ----------
+        storage_client : StorageBackend
+            Object storage holding the bundle.
+        bundle_key : str
+            Key of the bundle without suffix, as passed to `compact`.
+        """
+        self.storage = storage_client
+        index = json.loads(storage_client.read_bytes(bundle_key + INDEX_SUFFIX))
+        self.bundle: str = index["bundle"]
+        self.documents: dict[str, dict[str, int]] = index["documents"]
+
+    def keys(self) -> list[str]:
+        """
+        List the source keys packed in the bundle.
+
+        Returns
+        -------
+        list of str
+            Source keys in bundle order.
+        """
+        return list(self.documents)
+
+    def get(self, key: str) -> Any:
+        """
+        Fetch and decode a single document from the bundle.
+
+        Parameters
+        ----------
+        key : str
+            The source key of the document.
+
+        Returns
+        -------
+        Any
+            The decoded JSON document.
+
+        Raises
+        ------
+        KeyError
+            If the key is not part of the bundle.
+        """
+        entry = self.documents[key]
+        member = self.storage.read_bytes(
+            self.bundle, byte_range=(entry["offset"], entry["length"])
+        )
+        return json.loads(gzip.decompress(member))
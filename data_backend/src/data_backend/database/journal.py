@@ -0,0 +1,411 @@
+import logging
+import sqlite3
+import threading
+from collections.abc import Collection
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.orm import sessionmaker
+
+from data_backend.database.models import RequestStatusEnum
+from data_backend.database.requests import DEFAULT_SESSION_FACTORY, RequestStore
+from data_backend.models import APIRequest, StoredRequest
+from data_backend.quota import quota_day
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    logical_date TEXT NOT NULL,
+    request TEXT NOT NULL,
+    status TEXT NOT NULL,
+    db_id INTEGER UNIQUE,
+    replicated_status TEXT,
+    error TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_journal_name_status ON journal (name, status);
+"""
+
+
+class JournaledRequestStore(RequestStore):
+    """
+    A request store that records changes in a local journal first.
+
+    Enqueues and completions are appended to a local SQLite database in WAL
+    mode, which is cheap and survives process crashes, and a background thread
+    replicates them to the ``requests`` table. Database writes are therefore
+    off the download path, and a temporarily unavailable database does not
+    lose work.
+
+    Requests handed out by this store carry journal ids, so they must be
+    completed through the same store. Journal entries are removed once their
+    final status is replicated. On start-up, entries left over by a previous
+    run are replicated and their pending requests returned by `get_pending`.
+    Replication is at-least-once: a crash between the database insert and the
+    journal update right after it can leave a duplicate row.
+
+    Use one journal file per process.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        session_factory: sessionmaker = DEFAULT_SESSION_FACTORY,
+        replication_interval: float = 1.0,
+        batch_size: int = 500,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Initialize the JournaledRequestStore and start replication.
+
+        Parameters
+        ----------
+        path : str or Path
+            Path of the local journal database. Created if it does not exist.
+        session_factory : sessionmaker, optional
+            A callable that returns a SQLAlchemy/SQLModel session of the
+            database replicated to. Defaults to the application database.
+        replication_interval : float, optional
+            Seconds between replication passes when there are no new changes,
+            and between retries after a failure. Default is ``1.0``.
+        batch_size : int, optional
+            Maximum number of journal entries replicated in one pass.
+            Default is ``500``.
+        **kwargs
+            Retry settings passed to `RequestStore`.
+        """
+        super().__init__(session_factory, **kwargs)
+        self.path = Path(path)
+        self.replication_interval = replication_interval
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(JOURNAL_SCHEMA)
+        self._lock = threading.Lock()
+        self._replication_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._replicate_forever, name="request-journal", daemon=True
+        )
+        self._thread.start()
+
+    def add(self, request: StoredRequest) -> None:
+        """
+        Append a new request to the journal.
+
+        Parameters
+        ----------
+        request : StoredRequest
+            The request to add. Its `id` is set to the journal id.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO journal (name, logical_date, request, status, updated_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    request.name,
+                    request.logical_date,
+                    request.request.json(),
+                    RequestStatusEnum.PENDING.value,
+                    _now(),
+                ),
+            )
+        request.id = cursor.lastrowid
+        self._wake.set()
+
+    def complete(
+        self,
+        request: StoredRequest,
+        status: RequestStatusEnum,
+        error: str | None = None,
+    ) -> None:
+        """
+        Record the final status of a request in the journal.
+
+        Parameters
+        ----------
+        request : StoredRequest
+            A request returned by this store.
+        status : RequestStatusEnum
+            The final status to assign to the request.
+        error : str, optional
+            The error of a failed attempt.
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE journal SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (RequestStatusEnum(status).value, error, _now(), request.id),
+            )
+        self._wake.set()
+
+    def get_pending(
+        self,
+        name: str,
+        include_failed: bool = False,
+        limit: int | None = None,
+        exclude_ids: Collection[int] = (),
+    ) -> list[StoredRequest]:
+        """
+        Retrieve the pending requests of the journal and the database.
+
+        Pending database rows that are not in the journal yet are imported,
+        so that they can be completed through this store. If the database is
+        unavailable, only the journal is used. Follow-up pages, requested with
+        ``exclude_ids``, are read from the journal only: requests added since
+        the first page were written to the journal anyway.
+
+        Parameters
+        ----------
+        name : str
+            The name of the request batch to filter by.
+        include_failed : bool, optional
+            Also import failed database rows whose next attempt is due.
+            Default is ``False``.
+        limit : int, optional
+            Maximum number of requests to return. If None, all are returned.
+        exclude_ids : collection of int, optional
+            Journal ids of requests to skip, e.g. the ones already queued.
+
+        Returns
+        -------
+        list of StoredRequest
+            Pending requests with journal ids, in the order they were added.
+        """
+        if not exclude_ids:
+            try:
+                self._import_pending(name, include_failed)
+            except Exception:
+                logger.warning(
+                    f"Could not read pending requests of {name} from the database, "
+                    "using the local journal only",
+                    exc_info=True,
+                )
+        query = "SELECT id, name, logical_date, request FROM journal"
+        query += " WHERE name = ? AND status = ?"
+        params: list[Any] = [name, RequestStatusEnum.PENDING.value]
+        if exclude_ids:
+            query += f" AND id NOT IN ({', '.join('?' * len(exclude_ids))})"
+            params.extend(exclude_ids)
+        query += " ORDER BY id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            StoredRequest(
+                request=APIRequest.parse_raw(request),
+                name=row_name,
+                logical_date=logical_date,
+                id=journal_id,
+            )
+            for journal_id, row_name, logical_date, request in rows
+        ]
+
+    def _import_pending(self, name: str, include_failed: bool) -> None:
+        db_pending = super().get_pending(name, include_failed)
+        with self._lock:
+            known = {
+                db_id
+                for (db_id,) in self._conn.execute(
+                    "SELECT db_id FROM journal WHERE name = ? AND db_id IS NOT NULL",
+                    (name,),
+                )
+            }
+            self._conn.executemany(
+                "INSERT INTO journal (name, logical_date, request, status, db_id,"
+                " replicated_status, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        r.name,
+                        r.logical_date,
+                        r.request.json(),
+                        RequestStatusEnum.PENDING.value,
+                        r.id,
+                        RequestStatusEnum.PENDING.value,
+                        _now(),
+                    )
+                    for r in db_pending
+                    if r.id not in known
+                ],
+            )
+
+    def get_today_count(self, name: str) -> int:
+        """
+        Count the requests completed this UTC day, including unreplicated ones.
+
+        Parameters
+        ----------
+        name : str
+            The name of the request batch to count.
+
+        Returns
+        -------
+        int
+            Completed requests in the database plus completions that are only
+            recorded in the journal. Database errors count as zero.
+        """
+        try:
+            replicated = super().get_today_count(name)
+        except Exception:
+            logger.warning(
+                f"Could not count requests of {name} in the database",
+                exc_info=True,
+            )
+            replicated = 0
+        with self._lock:
+            (journaled,) = self._conn.execute(
+                "SELECT count(*) FROM journal WHERE name = ? AND status != ?"
+                " AND replicated_status IS NOT status AND updated_at >= ?",
+                (name, RequestStatusEnum.PENDING.value, quota_day()),
+            ).fetchone()
+        return replicated + journaled
+
+    def count(self, name: str) -> int:
+        """
+        Count the requests recorded for a name in the journal or the database.
+
+        Parameters
+        ----------
+        name : str
+            The name of the request batch to count.
+
+        Returns
+        -------
+        int
+            The number of journal entries of the name, or the number of
+            database rows if the journal has none.
+        """
+        with self._lock:
+            (journaled,) = self._conn.execute(
+                "SELECT count(*) FROM journal WHERE name = ?", (name,)
+            ).fetchone()
+        return journaled or super().count(name)
+
+    def backlog(self) -> int:
+        """
+        Count the journal entries waiting for replication.
+
+        Returns
+        -------
+        int
+            Entries not yet inserted into the database or whose status
+            differs from the replicated one.
+        """
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT count(*) FROM journal"
+                " WHERE db_id IS NULL OR replicated_status IS NOT status"
+            ).fetchone()
+        return count
+
+    def flush(self) -> None:
+        """
+        Replicate all journal entries to the database in the calling thread.
+
+        Raises
+        ------
+        Exception
+            Any database error raised while replicating. Unreplicated entries
+            stay in the journal.
+        """
+        while self._replicate():
+            pass
+
+    def close(self) -> None:
+        """
+        Stop the replication thread, replicate what is left and close the journal.
+
+        If the database is unavailable, the remaining entries stay in the
+        journal and are replicated by the next store opened on it.
+        """
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join()
+        try:
+            self.flush()
+        except Exception:
+            logger.warning(
+                f"{self.backlog()} journal entries were not replicated, "
+                f"they are kept in {self.path}",
+                exc_info=True,
+            )
+        self._conn.close()
+
+    def _replicate_forever(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.replication_interval)
+            self._wake.clear()
+            if self._stopped.is_set():
+                return
+            try:
+                self.flush()
+            except Exception:
+                logger.warning(
+                    "Replicating the request journal failed, retrying",
+                    exc_info=True,
+                )
+
+    def _replicate(self) -> int:
+        with self._replication_lock:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, name, logical_date, request, status, db_id,"
+                    " replicated_status, error FROM journal"
+                    " WHERE db_id IS NULL OR replicated_status IS NOT status"
+                    " ORDER BY id LIMIT ?",
+                    (self.batch_size,),
+                ).fetchall()
+            for (
+                journal_id,
+                name,
+                logical_date,
+                request,
+                status,
+                db_id,
+                replicated,
+                error,
+            ) in rows:
+                stored = StoredRequest(
+                    request=APIRequest.parse_raw(request),
+                    name=name,
+                    logical_date=logical_date,
+                    id=db_id,
+                )
+                if db_id is None:
+                    super().add(stored)
+                    replicated = RequestStatusEnum.PENDING.value
+                    # Record the row before completing it, so a failed
+                    # completion is retried without inserting it again.
+                    self._mark_replicated(journal_id, stored.id, replicated)
+                if status != replicated:
+                    super().complete(stored, RequestStatusEnum(status), error)
+                    replicated = status
+                    self._mark_replicated(journal_id, stored.id, replicated)
+            return len(rows)
+
+    def _mark_replicated(
+        self, journal_id: int, db_id: int | None, replicated: str
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE journal SET db_id = ?, replicated_status = ? WHERE id = ?",
+                (db_id, replicated, journal_id),
+            )
+            if replicated != RequestStatusEnum.PENDING.value:
+                self._conn.execute(
+                    "DELETE FROM journal WHERE id = ? AND status = ?",
+                    (journal_id, replicated),
+                )
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
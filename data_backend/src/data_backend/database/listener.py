@@ -0,0 +1,119 @@
+import select
+import time
+from collections.abc import Callable
+from typing import Any
+
+import psycopg2
+from sqlalchemy.engine import make_url
+
+from data_backend.database.connection import get_db_url
+from data_backend.database.requests import PENDING_CHANNEL
+
+# Errors of a lost listener connection, e.g. a database restart.
+CONNECTION_ERRORS = (psycopg2.Error, OSError)
+
+
+class RequestListener:
+    """
+    Waits for PostgreSQL notifications of new pending requests.
+
+    `RequestStore.add` notifies the ``requests_pending`` channel with the name
+    of every inserted request. The listener blocks on the connection socket
+    until a notification arrives, so waiting costs no queries. Bursts of
+    inserts are debounced: after the first notification, the listener keeps
+    collecting names until the channel has been quiet for ``debounce``
+    seconds, or ``max_delay`` seconds have passed.
+    """
+
+    def __init__(
+        self,
+        connection_factory: Callable[[], Any] | None = None,
+        channel: str = PENDING_CHANNEL,
+        debounce: float = 1.0,
+        max_delay: float = 10.0,
+    ) -> None:
+        """
+        Initialize a RequestListener.
+
+        Parameters
+        ----------
+        connection_factory : callable, optional
+            Returns the psycopg2 connection to listen on. Defaults to a new,
+            unpooled connection to the application database.
+        channel : str, optional
+            The notification channel. Default is ``"requests_pending"``.
+        debounce : float, optional
+            Seconds of quiet that end a burst of notifications. Default is
+            ``1.0``.
+        max_delay : float, optional
+            Maximum seconds a burst is collected for. Default is ``10.0``.
+        """
+        self.connection_factory = connection_factory or _default_connection
+        self.channel = channel
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._connection: Any | None = None
+
+    def listen(self) -> None:
+        """
+        Open the connection and subscribe to the channel.
+        """
+        self._connection = self.connection_factory()
+        self._connection.autocommit = True
+        with self._connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+
+    def wait(self, timeout: float | None = None) -> set[str]:
+        """
+        Wait for a burst of notifications.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum seconds to wait for the first notification. If None,
+            waits until one arrives.
+
+        Returns
+        -------
+        set of str
+            Names of the requests added during the burst, empty if the
+            timeout passed without a notification.
+        """
+        names = set(self._poll(timeout))
+        if names:
+            deadline = time.monotonic() + self.max_delay
+            while (remaining := deadline - time.monotonic()) > 0:
+                burst = self._poll(min(self.debounce, remaining))
+                if not burst:
+                    break
+                names.update(burst)
+        return names
+
+    def close(self) -> None:
+        """
+        Close the connection.
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _poll(self, timeout: float | None) -> list[str]:
+        if self._connection is None:
+            raise RuntimeError("Call listen() before waiting for notifications")
+        connection = self._connection
+        if not connection.notifies:
+            readable, _, _ = select.select([connection], [], [], timeout)
+            if readable:
+                connection.poll()
+        payloads = [notify.payload for notify in connection.notifies]
+        connection.notifies.clear()
+        return payloads
+
+
+def _default_connection() -> Any:
+    # A dedicated connection: a pooled one would be handed to other sessions
+    # with the LISTEN still active.
+    url = make_url(get_db_url())
+    return psycopg2.connect(
+        **url.translate_connect_args(username="user", database="dbname")
+    )
@@ -0,0 +1,144 @@
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import col, select
+
+from data_backend.database.models import ManifestDB
+from data_backend.database.requests import DEFAULT_SESSION_FACTORY
+from data_backend.models import ManifestEntry
+
+
+class ManifestStore:
+    """
+    A data access layer for the index of objects saved to object storage.
+
+    Every object written by the downloader gets one row in the `manifest`
+    table, so consumers can look objects up by key, fixture, league or date
+    without listing the bucket.
+    """
+
+    def __init__(self, session_factory: sessionmaker = DEFAULT_SESSION_FACTORY) -> None:
+        """
+        Initialize the ManifestStore with a session factory.
+
+        Parameters
+        ----------
+        session_factory : sessionmaker, optional
+            A callable that returns a SQLAlchemy/SQLModel session.
+            Defaults to a sessionmaker bound to the application database.
+        """
+        self.session_factory = session_factory
+
+    def add(self, entry: ManifestEntry) -> None:
+        """
+        Insert a manifest entry, replacing any existing entry with the same key.
+
+        Parameters
+        ----------
+        entry : ManifestEntry
+            The entry describing a stored object.
+        """
+        with self.session_factory() as session:
+            db_entry = session.exec(
+                select(ManifestDB).where(ManifestDB.key == entry.key)
+            ).first()
+            if db_entry is None:
+                session.add(entry.to_orm())
+            else:
+                for field, value in vars(entry).items():
+                    setattr(db_entry, field, value)
+            session.commit()
+
+    def get(self, key: str) -> ManifestEntry | None:
+        """
+        Retrieve the manifest entry for an object key.
+
+        Parameters
+        ----------
+        key : str
+            The object key to look up.
+
+        Returns
+        -------
+        ManifestEntry or None
+            The entry for the key, or ``None`` if the object is not indexed.
+        """
+        with self.session_factory() as session:
+            db_entry = session.exec(
+                select(ManifestDB).where(ManifestDB.key == key)
+            ).first()
+            return ManifestEntry.from_orm(db_entry) if db_entry else None
+
+    def find(
+        self,
+        fixture_id: int | None = None,
+        league_id: int | None = None,
+        date: str | None = None,
+        type: str | None = None,
+        month: str | None = None,
+    ) -> list[ManifestEntry]:
+        """
+        Retrieve manifest entries matching all of the given attributes.
+
+        Parameters
+        ----------
+        fixture_id : int, optional
+            Fixture the object belongs to.
+        league_id : int, optional
+            League the object belongs to.
+        date : str, optional
+            Match date in ``YYYY-MM-DD`` format.
+        type : str, optional
+            Request type that produced the object.
+        month : str, optional
+            Match month in ``YYYY-MM`` format.
+
+        Returns
+        -------
+        list of ManifestEntry
+            Matching entries ordered by insertion.
+        """
+        filters = [
+            (ManifestDB.fixture_id, fixture_id),
+            (ManifestDB.league_id, league_id),
+            (ManifestDB.date, date),
+            (ManifestDB.type, type),
+        ]
+        with self.session_factory() as session:
+            stmt = select(ManifestDB).where(
+                *(column == value for column, value in filters if value is not None)
+            )
+            if month is not None:
+                stmt = stmt.where(col(ManifestDB.date).startswith(f"{month}-"))
+            result = session.exec(stmt.order_by(ManifestDB.id)).all()
+            return [ManifestEntry.from_orm(r) for r in result]
+
+    def move_to_bundle(self, bundle: str, documents: dict[str, dict[str, int]]) -> int:
+        """
+        Point the entries of compacted objects at their bundle.
+
+        The entries keep their source keys, which still identify the documents
+        within the bundle.
+
+        Parameters
+        ----------
+        bundle : str
+            Key of the bundle object the documents were packed into.
+        documents : dict of (str, dict of (str, int))
+            Mapping from source key to the ``offset`` and ``length`` of its
+            member in the bundle, as in the bundle index.
+
+        Returns
+        -------
+        int
+            The number of updated entries.
+        """
+        with self.session_factory() as session:
+            db_entries = session.exec(
+                select(ManifestDB).where(col(ManifestDB.key).in_(list(documents)))
+            ).all()
+            for db_entry in db_entries:
+                member = documents[db_entry.key]
+                db_entry.bundle = bundle
+                db_entry.bundle_offset = member["offset"]
+                db_entry.bundle_length = member["length"]
+            session.commit()
+            return len(db_entries)
@@ -27,6 +27,38 @@ class RequestDB(SQLModel, table=True):  # type: ignore[call-arg]
     params: dict[str, Any] | None = Field(default=None, sa_type=JSON)
     payload: dict[str, Any] | None = Field(default=None, sa_type=JSON)
     type: str | None = Field(default=None)
+    tags: dict[str, Any] | None = Field(default=None, sa_type=JSON)
     status: RequestStatus = Field(default=RequestStatusEnum.PENDING, sa_type=String)
+    attempts: int = Field(default=0)
+    last_error: str | None = Field(default=None)
+    next_attempt_at: datetime | None = Field(default=None)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class ManifestDB(SQLModel, table=True):  # type: ignore[call-arg]
+    __tablename__ = "manifest"
+
+    id: int | None = Field(default=None, primary_key=True)
+    key: str = Field(unique=True, index=True)
+    name: str
+    logical_date: str
+    type: str
+    size: int
+    checksum: str
+    etag: str | None = Field(default=None)
+    fixture_id: int | None = Field(default=None, index=True)
+    league_id: int | None = Field(default=None, index=True)
+    date: str | None = Field(default=None, index=True)
+    bundle: str | None = Field(default=None)
+    bundle_offset: int | None = Field(default=None)
+    bundle_length: int | None = Field(default=None)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class QuotaUsageDB(SQLModel, table=True):  # type: ignore[call-arg]
+    __tablename__ = "quota_usage"
+
+    key: str = Field(primary_key=True)
+    day: str = Field(primary_key=True)
+    used: int = Field(default=0)
@@ -0,0 +1,120 @@
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import col, select
+
+from data_backend.database.models import QuotaUsageDB
+from data_backend.database.requests import DEFAULT_SESSION_FACTORY
+
+
+class QuotaStore:
+    """
+    A data access layer for daily request counters in the `quota_usage` table.
+
+    Every counter is one row per key and quota day, incremented by a single
+    conditional ``UPDATE``, so concurrent processes never exceed a limit and
+    checking a counter is a primary-key lookup.
+    """
+
+    def __init__(self, session_factory: sessionmaker = DEFAULT_SESSION_FACTORY) -> None:
+        """
+        Initialize the QuotaStore with a session factory.
+
+        Parameters
+        ----------
+        session_factory : sessionmaker, optional
+            A callable that returns a SQLAlchemy/SQLModel session.
+            Defaults to a sessionmaker bound to the application database.
+        """
+        self.session_factory = session_factory
+
+    def try_acquire(self, key: str, day: str, limit: int | None = None) -> bool:
+        """
+        Count one request against a key, unless its limit is reached.
+
+        Parameters
+        ----------
+        key : str
+            The counted key, e.g. the name of an API key.
+        day : str
+            The quota day, see `quota_day`.
+        limit : int, optional
+            Maximum requests of the key per day. If None, unlimited.
+
+        Returns
+        -------
+        bool
+            ``True`` if the request was counted, ``False`` if the limit is
+            reached.
+        """
+        if limit is not None and limit <= 0:
+            return False
+        for _ in range(2):
+            if self._increment(key, day, limit):
+                return True
+            with self.session_factory() as session:
+                session.add(QuotaUsageDB(key=key, day=day, used=1))
+                try:
+                    session.commit()
+                    return True
+                except IntegrityError:
+                    # The row exists: either at its limit, or inserted
+                    # concurrently since the update.
+                    session.rollback()
+        return False
+
+    def get_used(self, key: str, day: str) -> int:
+        """
+        Number of requests counted against a key on a day.
+
+        Parameters
+        ----------
+        key : str
+            The counted key.
+        day : str
+            The quota day.
+
+        Returns
+        -------
+        int
+            The request count, ``0`` if none was counted.
+        """
+        with self.session_factory() as session:
+            usage = session.get(QuotaUsageDB, (key, day))
+            return usage.used if usage is not None else 0
+
+    def get_used_many(self, keys: list[str], day: str) -> dict[str, int]:
+        """
+        Number of requests counted against several keys on a day.
+
+        Parameters
+        ----------
+        keys : list of str
+            The counted keys.
+        day : str
+            The quota day.
+
+        Returns
+        -------
+        dict of (str, int)
+            Request count of every key, ``0`` for keys without requests.
+        """
+        with self.session_factory() as session:
+            stmt = select(QuotaUsageDB).where(
+                col(QuotaUsageDB.key).in_(keys), QuotaUsageDB.day == day
+            )
+            used = {usage.key: usage.used for usage in session.exec(stmt).all()}
+        return {key: used.get(key, 0) for key in keys}
+
+    def _increment(self, key: str, day: str, limit: int | None) -> bool:
+        stmt = (
+            update(QuotaUsageDB)
+            .where(col(QuotaUsageDB.key) == key, col(QuotaUsageDB.day) == day)
+            .values(used=col(QuotaUsageDB.used) + 1)
+        )
+        if limit is not None:
+            stmt = stmt.where(col(QuotaUsageDB.used) < limit)
+        with self.session_factory() as session:
+            result = session.execute(stmt)
+            session.commit()
+            return result.rowcount > 0
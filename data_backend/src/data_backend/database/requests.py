@@ -1,13 +1,32 @@
-from datetime import date, datetime, timezone
+from collections.abc import Collection
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
 
-from sqlalchemy import create_engine
+from sqlalchemy import and_, create_engine, or_, text
+from sqlalchemy import select as sa_select
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import Session, func, select
+from sqlmodel import Session, col, func, select
 
 from data_backend.database.connection import get_db_url
 from data_backend.database.models import RequestDB, RequestStatusEnum
 from data_backend.models import StoredRequest
 
+PENDING_CHANNEL = "requests_pending"
+
+REQUEST_COLUMNS = [
+    RequestDB.__table__.c[column]  # type: ignore[attr-defined]
+    for column in (
+        "id",
+        "name",
+        "logical_date",
+        "url",
+        "type",
+        "params",
+        "payload",
+        "tags",
+    )
+]
+
 DEFAULT_SESSION_FACTORY = sessionmaker(
     bind=create_engine(get_db_url()), class_=Session, expire_on_commit=False
 )
@@ -19,9 +38,24 @@ class RequestStore:
 
     Provides methods to fetch, insert, update, and count
     requests stored in the `requests` table.
+
+    Failed requests are retried with exponential backoff: every failure
+    schedules the next attempt in ``next_attempt_at`` until ``max_attempts``
+    is reached, after which the request is dead-lettered.
+
+    On PostgreSQL, every insert notifies the ``requests_pending`` channel with
+    the name of the request, so listeners can pick up new work immediately.
+
+    Requests are read with Core selects of the columns they need, mapped
+    straight into `StoredRequest` records: no ORM instances are loaded.
     """
 
-    def __init__(self, session_factory: sessionmaker = DEFAULT_SESSION_FACTORY) -> None:
+    def __init__(
+        self,
+        session_factory: sessionmaker = DEFAULT_SESSION_FACTORY,
+        max_attempts: int = 3,
+        retry_backoff: float = 900.0,
+    ) -> None:
         """
         Initialize the RequestStore with a session factory.
 
@@ -30,10 +64,23 @@ class RequestStore:
         session_factory : sessionmaker, optional
             A callable that returns a SQLAlchemy/SQLModel session.
             Defaults to a sessionmaker bound to the application database.
+        max_attempts : int, optional
+            Maximum number of attempts of a request. Default is ``3``.
+        retry_backoff : float, optional
+            Seconds before the first retry of a failed request, doubled after
+            every further failure. Default is ``900.0``.
         """
         self.session_factory = session_factory
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
 
-    def get_pending(self, name: str) -> list[StoredRequest]:
+    def get_pending(
+        self,
+        name: str,
+        include_failed: bool = False,
+        limit: int | None = None,
+        exclude_ids: Collection[int] = (),
+    ) -> list[StoredRequest]:
         """
         Retrieve all pending requests, optionally filtering by historical or ongoing.
 
@@ -41,20 +88,53 @@ class RequestStore:
         ----------
         name : str
             The name of the request batch to filter by.
+        include_failed : bool, optional
+            Also return failed requests whose next attempt is due.
+            Default is ``False``.
+        limit : int, optional
+            Maximum number of requests to return. If None, all are returned.
+        exclude_ids : collection of int, optional
+            Ids of requests to skip, e.g. the ones already queued in memory.
 
         Returns
         -------
         list of StoredRequest
-            A list of StoredRequest objects with status ``PENDING`` and matching the
-            specified name.
+            A list of StoredRequest objects with status ``PENDING`` (or due for
+            a retry) and matching the specified name.
         """
-        with self.session_factory() as session:
-            stmt = select(RequestDB).where(
-                RequestDB.status == RequestStatusEnum.PENDING,
-                RequestDB.name == name,
+        condition = RequestDB.status == RequestStatusEnum.PENDING
+        if include_failed:
+            condition = or_(
+                condition,
+                and_(
+                    RequestDB.status == RequestStatusEnum.FAILED,
+                    col(RequestDB.next_attempt_at) <= datetime.now(timezone.utc),
+                ),
             )
-            result = session.exec(stmt).all()
-            return [StoredRequest.from_orm(r) for r in result]
+        conditions: list[Any] = [condition, RequestDB.name == name]
+        if exclude_ids:
+            conditions.append(col(RequestDB.id).not_in(list(exclude_ids)))
+        return self._select(*conditions, limit=limit)
+
+    def get_dead_letters(self, name: str) -> list[StoredRequest]:
+        """
+        Retrieve failed requests that will not be retried.
+
+        Parameters
+        ----------
+        name : str
+            The name of the request batch to filter by.
+
+        Returns
+        -------
+        list of StoredRequest
+            Failed requests without a scheduled next attempt.
+        """
+        return self._select(
+            RequestDB.status == RequestStatusEnum.FAILED,
+            col(RequestDB.next_attempt_at).is_(None),
+            RequestDB.name == name,
+        )
 
     def get_today_count(self, name: str) -> int:
         """
@@ -75,10 +155,69 @@ class RequestStore:
             )
             return session.exec(stmt).one()
 
+    def count(self, name: str) -> int:
+        """
+        Count all requests recorded for a name, regardless of status.
+
+        Parameters
+        ----------
+        name : str
+            The name of the request batch to count.
+
+        Returns
+        -------
+        int
+            The number of requests stored under the name.
+        """
+        with self.session_factory() as session:
+            stmt = sa_select(func.count(RequestDB.id)).where(RequestDB.name == name)
+            return session.execute(stmt).scalar_one()
+
+    def count_by_status(
+        self, name: str, logical_date: str | None = None
+    ) -> dict[str, dict[str, int]]:
+        """
+        Count requests by status for a name and its shards.
+
+        Shards of a name are stored as ``"{name}:{shard}"``.
+
+        Parameters
+        ----------
+        name : str
+            The name of the request batch.
+        logical_date : str, optional
+            Only count requests of this logical date.
+
+        Returns
+        -------
+        dict of (str, dict of (str, int))
+            Mapping from request name to the number of requests per status.
+        """
+        condition = or_(
+            RequestDB.name == name,
+            col(RequestDB.name).startswith(f"{name}:", autoescape=True),
+        )
+        if logical_date is not None:
+            condition = and_(condition, RequestDB.logical_date == logical_date)
+        with self.session_factory() as session:
+            stmt = (
+                sa_select(RequestDB.name, RequestDB.status, func.count(RequestDB.id))
+                .where(condition)
+                .group_by(RequestDB.name, RequestDB.status)
+                .order_by(RequestDB.name)
+            )
+            counts: dict[str, dict[str, int]] = {}
+            for row_name, status, count in session.execute(stmt).all():
+                counts.setdefault(row_name, {})[status] = count
+            return counts
+
     def add(self, request: StoredRequest) -> None:
         """
         Insert new API requests into the database.
 
+        On PostgreSQL, the request is announced on the ``requests_pending``
+        channel once its insert commits.
+
         Parameters
         ----------
         request : StoredRequest
@@ -88,22 +227,55 @@ class RequestStore:
         db_request = request.to_orm()
         with self.session_factory() as session:
             session.add(db_request)
+            if session.get_bind().dialect.name == "postgresql":
+                session.execute(
+                    text("SELECT pg_notify(:channel, :name)"),
+                    {"channel": PENDING_CHANNEL, "name": request.name},
+                )
             session.commit()
         request.id = db_request.id
 
-    def complete(self, request: StoredRequest, status: RequestStatusEnum) -> None:
+    def complete(
+        self,
+        request: StoredRequest,
+        status: RequestStatusEnum,
+        error: str | None = None,
+    ) -> None:
         """
         Mark a request as completed by updating its status and updated_at timestamp.
 
+        Every call counts as an attempt. A failed request is scheduled for a
+        retry unless it has used up ``max_attempts``.
+
         Parameters
         ----------
         request : StoredRequest
             The request object to update.
         status : RequestStatusEnum
             The final status to assign to the request.
+        error : str, optional
+            The error of a failed attempt, stored in ``last_error``.
         """
+        now = datetime.now(timezone.utc)
         with self.session_factory() as session:
             db_request = session.get(RequestDB, request.id)
             db_request.status = status
-            db_request.updated_at = datetime.now(timezone.utc)
+            db_request.attempts += 1
+            db_request.updated_at = now
+            db_request.next_attempt_at = None
+            if status == RequestStatusEnum.FAILED:
+                db_request.last_error = error
+                if db_request.attempts < self.max_attempts:
+                    delay = self.retry_backoff * 2 ** (db_request.attempts - 1)
+                    db_request.next_attempt_at = now + timedelta(seconds=delay)
             session.commit()
+
+    def _select(
+        self, *conditions: Any, limit: int | None = None
+    ) -> list[StoredRequest]:
+        stmt = select(*REQUEST_COLUMNS).where(*conditions).order_by(RequestDB.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        with self.session_factory() as session:
+            rows = session.connection().execute(stmt)
+            return [StoredRequest.from_row(row) for row in rows]
@@ -1,6 +1,25 @@
+from datetime import datetime
+
+
 class APIRequestException(Exception):
     """Raised on request exception"""
 
 
 class RequestLimitReachedException(Exception):
     """Raised when the request limit is reached."""
+
+
+class CircuitOpenException(Exception):
+    """Raised when a request is refused because its circuit is open."""
+
+    def __init__(self, message: str, retry_after: float = 0.0) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DownloadDeferredException(RequestLimitReachedException):
+    """Raised when a limit would make the download wait longer than allowed."""
+
+    def __init__(self, message: str, resume_at: datetime) -> None:
+        super().__init__(message)
+        self.resume_at = resume_at
@@ -1,11 +1,24 @@
 from collections import defaultdict
-from collections.abc import Callable, Generator
-from typing import Any
+from collections.abc import Callable, Generator, Iterator
+from concurrent.futures import Executor, Future
+from typing import IO, Any
 
-from data_backend.models import APIRequest, APIResponse
+from data_backend.models import APIRequest, APIResponse, ParsedDocument
 
-ParserFunc = Callable[[str], tuple[dict[str, Any], str]]
-RequestGeneratorFunc = Callable[[str], list[APIRequest]]
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+Body = str | bytes
+ParserFunc = Callable[[Body], tuple[dict[str, Any], str]]
+SplitterFunc = Callable[[Body], list[ParsedDocument]]
+RequestGeneratorFunc = Callable[[Body], list[APIRequest]]
+FlattenerFunc = Callable[[Any], dict[str, list[dict[str, Any]]]]
+StreamParserFunc = Callable[[APIRequest], str]
+ItemGeneratorFunc = Callable[[Iterator[dict[str, Any]]], list[APIRequest]]
+
+ITEMS_PREFIX = "response.item"
 
 
 class ResponseHandler:
@@ -14,28 +27,69 @@ class ResponseHandler:
 
     This class allows registering parsers for different request types as well as
     request generators that may produce follow-up requests based on responses.
+
+    With an executor, e.g. a ``ProcessPoolExecutor``, parsers, splitters and
+    request generators run in the executor's workers. The functions are sent
+    by reference, so they must be importable (module-level functions or
+    partials of them); the body is sent in and only the parsed data and new
+    requests come back. `submit_all` returns without waiting for the result,
+    so the caller can download the next response while this one is parsed.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, executor: Executor | None = None) -> None:
         """
         Initialize the ResponseHandler.
 
+        Parameters
+        ----------
+        executor : Executor, optional
+            Executor running parsers, splitters and request generators. If
+            None, they run in the calling thread. The caller owns the
+            executor and shuts it down.
+
         Attributes
         ----------
         parsers : dict of (str, HandlerFunc)
             Mapping from request type to parser function.
+        splitters : dict of (str, SplitterFunc)
+            Mapping from request type to a function that splits a combined
+            response into several documents.
         generators : dict of (str, list of RequestGeneratorFunc)
             Mapping from request type to a list of generator functions that can
             create new requests from the response body.
+        flatteners : dict of (str, FlattenerFunc)
+            Mapping from request type to a function that flattens parsed data
+            into table rows for columnar output.
+        stream_parsers : dict of (str, StreamParserFunc)
+            Mapping from request type to a function returning the storage path
+            of a streamed response. Registering one opts the type into
+            streaming.
+        item_generators : dict of (str, list of ItemGeneratorFunc)
+            Mapping from request type to generator functions run on the
+            ``response[]`` items of streamed responses.
+        raw_types : set of str
+            Request types whose functions receive the undecoded response bytes
+            and whose bodies are stored as received.
         _new_requests : list of APIRequest
             Queue of new requests generated from responses.
         """
         self.parsers: dict[str, ParserFunc] = {}
+        self.splitters: dict[str, SplitterFunc] = {}
         self.generators: dict[str, list[RequestGeneratorFunc]] = defaultdict(list)
+        self.flatteners: dict[str, FlattenerFunc] = {}
+        self.stream_parsers: dict[str, StreamParserFunc] = {}
+        self.item_generators: dict[str, list[ItemGeneratorFunc]] = defaultdict(list)
+        self.raw_types: set[str] = set()
+        self.executor: Executor | None = executor
         self._new_requests: list[APIRequest] = []
 
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["executor"] = None
+        return state
+
     def add_parser(
-        self, request_type: str, handler_func: ParserFunc
+        self, request_type: str, handler_func: ParserFunc, raw: bool = False
     ) -> "ResponseHandler":
         """
         Register a parser for a specific request type.
@@ -47,6 +101,11 @@ class ResponseHandler:
         handler_func : ParserFunc
             A function that takes the response body as input and returns
             parsed data as a dictionary and an identifier (e.g., version).
+        raw : bool, optional
+            Pass the undecoded response bytes to the parser, splitter and
+            request generators of this type, and store the bytes as received
+            instead of re-serializing the parsed data. Use it for parsers that
+            accept bytes and return the body unchanged. Default is ``False``.
 
         Returns
         -------
@@ -54,6 +113,32 @@ class ResponseHandler:
             The current instance, to allow method chaining.
         """
         self.parsers[request_type] = handler_func
+        if raw:
+            self.raw_types.add(request_type)
+        else:
+            self.raw_types.discard(request_type)
+        return self
+
+    def add_splitter(
+        self, request_type: str, handler_func: SplitterFunc
+    ) -> "ResponseHandler":
+        """
+        Register a splitter for a request type returning combined responses.
+
+        Parameters
+        ----------
+        request_type : str
+            The type of request this splitter can handle.
+        handler_func : SplitterFunc
+            A function that takes the response body and returns the documents
+            it contains, each with its own type, path and tags.
+
+        Returns
+        -------
+        ResponseHandler
+            The current instance, to allow method chaining.
+        """
+        self.splitters[request_type] = handler_func
         return self
 
     def add_request_generator(
@@ -78,6 +163,75 @@ class ResponseHandler:
         self.generators[request_type].append(handler_func)
         return self
 
+    def add_stream_parser(
+        self, request_type: str, handler_func: StreamParserFunc
+    ) -> "ResponseHandler":
+        """
+        Register a stream parser, opting a request type into streaming.
+
+        Responses of the type are streamed to a temporary file and stored
+        as-is, without being loaded into memory.
+
+        Parameters
+        ----------
+        request_type : str
+            The type of request to stream.
+        handler_func : StreamParserFunc
+            A function that takes the request and returns the storage path
+            of its response.
+
+        Returns
+        -------
+        ResponseHandler
+            The current instance, to allow method chaining.
+        """
+        self.stream_parsers[request_type] = handler_func
+        return self
+
+    def add_item_generator(
+        self, request_type: str, handler_func: ItemGeneratorFunc
+    ) -> "ResponseHandler":
+        """
+        Register a request generator for the items of streamed responses.
+
+        Parameters
+        ----------
+        request_type : str
+            The type of request this generator applies to.
+        handler_func : ItemGeneratorFunc
+            A function that takes an iterator over the ``response[]`` items,
+            decoded one at a time, and returns new requests.
+
+        Returns
+        -------
+        ResponseHandler
+            The current instance, to allow method chaining.
+        """
+        self.item_generators[request_type].append(handler_func)
+        return self
+
+    def add_flattener(
+        self, request_type: str, handler_func: FlattenerFunc
+    ) -> "ResponseHandler":
+        """
+        Register a flattener for a specific request type.
+
+        Parameters
+        ----------
+        request_type : str
+            The type of request this flattener applies to.
+        handler_func : FlattenerFunc
+            A function that takes the parsed data and returns a mapping from
+            table name to a list of flat rows.
+
+        Returns
+        -------
+        ResponseHandler
+            The current instance, to allow method chaining.
+        """
+        self.flatteners[request_type] = handler_func
+        return self
+
     def handle(self, response: APIResponse) -> tuple[Any, str]:
         """
         Process an API response by running request generators and parsing.
@@ -97,18 +251,204 @@ class ResponseHandler:
         ValueError
             If no parser is registered for the response type.
         """
-        for generator in self.generators.get(response.request.type, []):
-            new_requests = generator(response.body)
-            if new_requests:
-                self._new_requests.extend(new_requests)
         parser = self.parsers.get(response.request.type)
+        if self.executor is not None and parser:
+            data, path, new_requests = self.executor.submit(
+                _parse, parser, self._generators(response), self._body(response)
+            ).result()
+            self._new_requests.extend(new_requests)
+            return data, path
+        self._generate(response)
         if not parser:
             raise ValueError(
                 f"No parser registered for response type '{response.request.type}'"
             )
-        data, path = parser(response.body)
+        data, path = parser(self._body(response))
         return data, path
 
+    def handle_all(self, response: APIResponse) -> list[ParsedDocument]:
+        """
+        Process an API response into all documents it contains.
+
+        Responses of types with a registered splitter are split into several
+        documents. Any other response is parsed with `handle` into a single
+        document carrying the request type and tags.
+
+        Parameters
+        ----------
+        response : APIResponse
+            The response object containing the request type and body.
+
+        Returns
+        -------
+        list of ParsedDocument
+            The documents to store.
+
+        Raises
+        ------
+        ValueError
+            If neither a splitter nor a parser is registered for the response type.
+        """
+        splitter = self.splitters.get(response.request.type)
+        if self.executor is not None:
+            return self.submit_all(response).result()
+        if splitter is None:
+            data, path = self.handle(response)
+            return [self._document(response, data, path)]
+        self._generate(response)
+        return splitter(self._body(response))
+
+    def submit_all(self, response: APIResponse) -> "PendingDocuments":
+        """
+        Start processing an API response into documents without waiting.
+
+        With an executor, the response is parsed in the executor's workers
+        while the caller goes on. Without one, it is parsed right away.
+
+        Parameters
+        ----------
+        response : APIResponse
+            The response object containing the request type and body.
+
+        Returns
+        -------
+        PendingDocuments
+            The documents being processed. Their `result` waits for them and
+            queues the new requests generated from the response.
+
+        Raises
+        ------
+        ValueError
+            If neither a splitter nor a parser is registered for the response type.
+        """
+        splitter = self.splitters.get(response.request.type)
+        parser = self.parsers.get(response.request.type)
+        generators = self._generators(response)
+        body = self._body(response)
+        if splitter is not None:
+            future = self._submit(_split, splitter, generators, body)
+        elif parser is not None:
+            future = self._submit(_parse, parser, generators, body)
+        else:
+            raise ValueError(
+                f"No parser registered for response type '{response.request.type}'"
+            )
+        return PendingDocuments(self, response, future, split=splitter is not None)
+
+    def _submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        if self.executor is not None:
+            return self.executor.submit(func, *args)
+        future: Future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _document(self, response: APIResponse, data: Any, path: str) -> ParsedDocument:
+        raw = response.content if response.request.type in self.raw_types else None
+        return ParsedDocument(
+            type=response.request.type,
+            data=data,
+            path=path,
+            tags=response.request.tags,
+            raw=raw,
+        )
+
+    def streams(self, request_type: str) -> bool:
+        """
+        Check whether responses of a request type should be streamed.
+
+        Parameters
+        ----------
+        request_type : str
+            The type of request.
+
+        Returns
+        -------
+        bool
+            ``True`` if a stream parser is registered for the type.
+        """
+        return request_type in self.stream_parsers
+
+    def handle_stream(self, response: APIResponse) -> ParsedDocument:
+        """
+        Process a streamed API response.
+
+        Item generators are run on the ``response[]`` items, decoded
+        incrementally from ``response.stream``, so at most one item is held in
+        memory at a time. The stream is rewound afterwards, ready to be stored.
+
+        Parameters
+        ----------
+        response : APIResponse
+            The response object with the body in ``stream``.
+
+        Returns
+        -------
+        ParsedDocument
+            The document to store. Its ``data`` is ``None``; the body stays in
+            ``response.stream``.
+
+        Raises
+        ------
+        ValueError
+            If no stream parser is registered for the response type or the
+            response has no stream.
+        """
+        parser = self.stream_parsers.get(response.request.type)
+        if not parser or response.stream is None:
+            raise ValueError(
+                f"Cannot stream response of type '{response.request.type}'"
+            )
+        for generator in self.item_generators.get(response.request.type, []):
+            response.stream.seek(0)
+            new_requests = generator(_iter_items(response.stream))
+            if new_requests:
+                self._new_requests.extend(new_requests)
+        response.stream.seek(0)
+        return ParsedDocument(
+            type=response.request.type,
+            data=None,
+            path=parser(response.request),
+            tags=response.request.tags,
+        )
+
+    def _generate(self, response: APIResponse) -> None:
+        self._new_requests.extend(
+            _run_generators(self._generators(response), self._body(response))
+        )
+
+    def _generators(self, response: APIResponse) -> list[RequestGeneratorFunc]:
+        return self.generators.get(response.request.type, [])
+
+    def _body(self, response: APIResponse) -> Body:
+        if response.request.type in self.raw_types:
+            return response.content
+        return response.body
+
+    def flatten(self, request_type: str, data: Any) -> dict[str, list[dict[str, Any]]]:
+        """
+        Flatten parsed data into table rows.
+
+        Parameters
+        ----------
+        request_type : str
+            The type of request the data was parsed from.
+        data : Any
+            The parsed output returned by the parser.
+
+        Returns
+        -------
+        dict of (str, list of dict)
+            Mapping from table name to rows. Empty if no flattener is registered
+            for the request type.
+        """
+        flattener = self.flatteners.get(request_type)
+        if not flattener:
+            return {}
+        return flattener(data)
+
     def collect_new_requests(self) -> Generator[APIRequest, None, None]:
         """
         Yield and remove new requests generated from responses.
@@ -120,3 +460,71 @@ class ResponseHandler:
         """
         while self._new_requests:
             yield self._new_requests.pop(0)
+
+
+class PendingDocuments:
+    """
+    Documents of a response being processed by a `ResponseHandler`.
+    """
+
+    def __init__(
+        self,
+        handler: ResponseHandler,
+        response: APIResponse,
+        future: Future,
+        split: bool,
+    ) -> None:
+        self.handler = handler
+        self.response = response
+        self.future = future
+        self.split = split
+
+    def result(self) -> list[ParsedDocument]:
+        """
+        Wait for the documents and queue the requests generated from them.
+
+        Returns
+        -------
+        list of ParsedDocument
+            The documents to store.
+        """
+        if self.split:
+            documents, new_requests = self.future.result()
+        else:
+            data, path, new_requests = self.future.result()
+            documents = [self.handler._document(self.response, data, path)]
+        self.handler._new_requests.extend(new_requests)
+        return documents
+
+
+def _run_generators(
+    generators: list[RequestGeneratorFunc], body: Body
+) -> list[APIRequest]:
+    new_requests: list[APIRequest] = []
+    for generator in generators:
+        new_requests.extend(generator(body) or [])
+    return new_requests
+
+
+def _parse(
+    parser: ParserFunc, generators: list[RequestGeneratorFunc], body: Body
+) -> tuple[Any, str, list[APIRequest]]:
+    new_requests = _run_generators(generators, body)
+    data, path = parser(body)
+    return data, path, new_requests
+
+
+def _split(
+    splitter: SplitterFunc, generators: list[RequestGeneratorFunc], body: Body
+) -> tuple[list[ParsedDocument], list[APIRequest]]:
+    new_requests = _run_generators(generators, body)
+    return splitter(body), new_requests
+
+
+def _iter_items(stream: IO[bytes]) -> Iterator[dict[str, Any]]:
+    if ijson is None:
+        raise ImportError(
+            "ijson is required for streamed responses. "
+            "Install it with the 'streaming' extra of data-backend."
+        )
+    return ijson.items(stream, ITEMS_PREFIX, use_float=True)
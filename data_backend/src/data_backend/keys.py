@@ -0,0 +1,259 @@
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Literal
+
+from data_backend.database.quota import QuotaStore
+from data_backend.exceptions import RequestLimitReachedException
+from data_backend.quota import quota_day
+from data_backend.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class APIKey:
+    """
+    One credential of a key pool.
+
+    ``name`` identifies the key in logs and quota counters; the secret itself
+    only lives in ``headers``.
+    """
+
+    name: str
+    headers: dict[str, str]
+    daily_limit: int | None = None
+    rate_limit: RateLimiter | None = field(default=None, repr=False)
+
+    @classmethod
+    def from_secret(
+        cls,
+        secret: str,
+        header: str,
+        daily_limit: int | None = None,
+        rate_limit: RateLimiter | None = None,
+    ) -> "APIKey":
+        """
+        Create a key named by a fingerprint of its secret.
+
+        Parameters
+        ----------
+        secret : str
+            The API key.
+        header : str
+            The request header carrying the key.
+        daily_limit : int, optional
+            Maximum requests of the key per quota day. If None, unlimited.
+        rate_limit : RateLimiter, optional
+            The rate limit of the key.
+
+        Returns
+        -------
+        APIKey
+            The key, named ``key-<first 8 hex digits of its SHA-256>``.
+        """
+        name = f"key-{hashlib.sha256(secret.encode()).hexdigest()[:8]}"
+        return cls(name, {header: secret}, daily_limit, rate_limit)
+
+
+class KeyPool:
+    """
+    Spreads requests over several API keys.
+
+    Every key has its own rate limit and daily quota. Daily usage is counted
+    in the `quota_usage` table when a store is given, so processes sharing the
+    keys share their quotas. Keys are picked round-robin, or least-loaded:
+    the key available soonest, then the one with the most quota left.
+
+    A key answered with ``429 Too Many Requests`` is cooled down; a key
+    answered with ``403 Forbidden`` (quota used up or subscription expired) is
+    dropped for the rest of the quota day. Requests then fail over to the
+    other keys.
+    """
+
+    def __init__(
+        self,
+        keys: list[APIKey],
+        quota_store: QuotaStore | None = None,
+        strategy: Literal["least_loaded", "round_robin"] = "least_loaded",
+        cooldown: float = 60.0,
+    ) -> None:
+        """
+        Initialize a KeyPool.
+
+        Parameters
+        ----------
+        keys : list of APIKey
+            The keys of the pool.
+        quota_store : QuotaStore, optional
+            Store of the daily usage of the keys. If None, usage is only
+            counted in memory.
+        strategy : {"least_loaded", "round_robin"}, optional
+            How keys are picked. Default is ``"least_loaded"``.
+        cooldown : float, optional
+            Seconds a key is skipped after a 429 response. Default is ``60.0``.
+
+        Raises
+        ------
+        ValueError
+            If the pool is empty or the strategy is unknown.
+        """
+        if not keys:
+            raise ValueError("A key pool needs at least one key")
+        if strategy not in ("least_loaded", "round_robin"):
+            raise ValueError(f"Invalid key selection strategy: {strategy}")
+        self.keys = keys
+        self.quota_store = quota_store
+        self.strategy = strategy
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._order = itertools.cycle(range(len(keys)))
+        self._day: str | None = None
+        self._used: dict[str, int] = {}
+        self._exhausted: set[str] = set()
+        self._cooldown_until: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def select(self) -> APIKey:
+        """
+        Pick the key for the next request.
+
+        Returns
+        -------
+        APIKey
+            A key with quota left, possibly still cooling down or rate
+            limited; see `wait_time`.
+
+        Raises
+        ------
+        RequestLimitReachedException
+            If every key is used up for the quota day.
+        """
+        with self._lock:
+            day = self._roll_day()
+            usable = [key for key in self.keys if key.name not in self._exhausted]
+            if not usable:
+                raise RequestLimitReachedException(
+                    f"All {len(self.keys)} API keys are used up for {day}."
+                )
+            if self.strategy == "round_robin":
+                while (key := self.keys[next(self._order)]) not in usable:
+                    pass
+                return key
+            return min(usable, key=lambda k: (self.wait_time(k), self._load(k)))
+
+    def wait_time(self, key: APIKey) -> float:
+        """
+        Time left until a key may send a request.
+
+        Parameters
+        ----------
+        key : APIKey
+            The key.
+
+        Returns
+        -------
+        float
+            Seconds until the cooldown and rate limit of the key pass.
+        """
+        cooldown = self._cooldown_until.get(key.name, 0.0) - time.monotonic()
+        rate = key.rate_limit.wait_time() if key.rate_limit is not None else 0.0
+        return max(0.0, cooldown, rate)
+
+    def wait(self, key: APIKey) -> None:
+        """
+        Sleep until a key may send a request, and record the request.
+
+        Parameters
+        ----------
+        key : APIKey
+            The key.
+        """
+        cooldown = self._cooldown_until.get(key.name, 0.0) - time.monotonic()
+        if cooldown > 0:
+            time.sleep(cooldown)
+        if key.rate_limit is not None:
+            key.rate_limit.acquire()
+
+    def reserve(self, key: APIKey) -> bool:
+        """
+        Count one request against the daily quota of a key.
+
+        Parameters
+        ----------
+        key : APIKey
+            The key.
+
+        Returns
+        -------
+        bool
+            ``True`` if the request was counted, ``False`` if the key is used
+            up; it is then skipped for the rest of the day.
+        """
+        with self._lock:
+            day = self._roll_day()
+            if self.quota_store is not None:
+                reserved = self.quota_store.try_acquire(key.name, day, key.daily_limit)
+            else:
+                reserved = (
+                    key.daily_limit is None
+                    or self._used.get(key.name, 0) < key.daily_limit
+                )
+            if not reserved:
+                logger.warning(f"API key {key.name} is used up for {day}")
+                self._exhausted.add(key.name)
+                return False
+            self._used[key.name] = self._used.get(key.name, 0) + 1
+            return True
+
+    def report(self, key: APIKey, status_code: int | None) -> bool:
+        """
+        Record the response status of a request sent with a key.
+
+        Parameters
+        ----------
+        key : APIKey
+            The key the request was sent with.
+        status_code : int or None
+            HTTP status of a failed response, None for a successful one.
+
+        Returns
+        -------
+        bool
+            ``True`` if the key was refused and the request should be retried
+            with another key.
+        """
+        if status_code == 429:
+            logger.warning(f"API key {key.name} is rate limited, cooling it down")
+            with self._lock:
+                self._cooldown_until[key.name] = time.monotonic() + self.cooldown
+            return True
+        if status_code == 403:
+            logger.warning(f"API key {key.name} was refused, dropping it for today")
+            with self._lock:
+                self._exhausted.add(key.name)
+            return True
+        return False
+
+    def _load(self, key: APIKey) -> float:
+        used = self._used.get(key.name, 0)
+        return used / key.daily_limit if key.daily_limit else float(used)
+
+    def _roll_day(self) -> str:
+        day = quota_day()
+        if day == self._day:
+            return day
+        self._day = day
+        self._exhausted.clear()
+        if self.quota_store is not None:
+            self._used = self.quota_store.get_used_many(
+                [key.name for key in self.keys], day
+            )
+        else:
+            self._used = {}
+        return day
@@ -0,0 +1,251 @@
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from data_backend.database.quota import QuotaStore
+from data_backend.exceptions import CircuitOpenException, RequestLimitReachedException
+from data_backend.handlers import ResponseHandler
+from data_backend.models import APIRequest, ParsedDocument
+from data_backend.quota import next_quota_reset, quota_day
+from data_backend.requester import HTTPRequester
+from data_backend.storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+IntervalFunc = Callable[[list[ParsedDocument]], float]
+
+
+def _seconds_until_reset(now: datetime) -> float:
+    return (next_quota_reset(now) - now).total_seconds()
+
+
+class LivePoller:
+    """
+    Polls an endpoint in a long-lived loop, storing only changed documents.
+
+    Every poll is a conditional request revalidating the previous response,
+    so an unchanged endpoint costs no parsing. Documents of a changed
+    response are written only if their content differs from the last version
+    written under the same key. The interval between polls comes from the
+    documents, e.g. shorter while matches are in play, and is stretched so
+    the remaining daily budget and request limit last until the UTC reset.
+    While the circuit of the endpoint is open, polling pauses until it lets
+    a probe through.
+
+    Memory stays bounded: at most ``max_documents`` content hashes are kept,
+    the least recently written are forgotten first.
+    """
+
+    def __init__(
+        self,
+        requester: HTTPRequester,
+        response_handler: ResponseHandler,
+        storage_client: StorageBackend,
+        interval: IntervalFunc,
+        max_documents: int = 10_000,
+        budget: int | None = None,
+        quota_store: QuotaStore | None = None,
+        budget_key: str = "live",
+    ) -> None:
+        """
+        Initialize a LivePoller.
+
+        Parameters
+        ----------
+        requester : HTTPRequester
+            Requester of the polls. Its ``request_limit`` also applies; with
+            a quota store and a shared ``quota_key``, it is spent together
+            with other downloads of the same API.
+        response_handler : ResponseHandler
+            Handler splitting or parsing the responses into documents.
+        storage_client : StorageBackend
+            Storage of the changed documents, under keys prefixed with the UTC
+            date of the poll.
+        interval : callable
+            Returns the seconds until the next poll, given the documents of
+            the latest response.
+        max_documents : int, optional
+            Maximum number of content hashes kept for change detection.
+            Default is ``10_000``.
+        budget : int, optional
+            Maximum polls per UTC day. If None, only the request limit of the
+            requester applies.
+        quota_store : QuotaStore, optional
+            Store counting the polls of the budget under ``budget_key``, so
+            the budget holds across restarts. If None, polls are counted in
+            memory.
+        budget_key : str, optional
+            The counter of the budget in ``quota_store``. Default is
+            ``"live"``.
+        """
+        self.requester = requester
+        self.handler = response_handler
+        self.files = storage_client
+        self.interval = interval
+        self.max_documents = max_documents
+        self.budget = budget
+        self.quota_store = quota_store
+        self.budget_key = budget_key
+        self.polls = 0
+        self._polls_today = 0
+        self.written = 0
+        self._hashes: OrderedDict[str, str] = OrderedDict()
+        self._validators: dict[str, str] | None = None
+        self._documents: list[ParsedDocument] = []
+        self._day = datetime.now(timezone.utc).date()
+
+    def poll(self, request: APIRequest) -> list[ParsedDocument]:
+        """
+        Poll once and store the changed documents.
+
+        Parameters
+        ----------
+        request : APIRequest
+            The request to poll. Its validators are those of the previous
+            poll, so it should stay the same between polls.
+
+        Returns
+        -------
+        list of ParsedDocument
+            All documents of the latest response; those of the previous poll
+            if the response did not change or failed.
+        """
+        remaining = self._remaining_budget()
+        if remaining is not None and remaining <= 0:
+            raise RequestLimitReachedException(
+                f"Live polling budget of {self.budget} reached."
+            )
+        response = self.requester.get(request, headers=self._validators)
+        self.polls += 1
+        self._count_poll()
+        if response.error:
+            logger.error(f"Polling {request.url} failed: {response.error}")
+            return self._documents
+        if response.not_modified:
+            logger.debug(f"{request.url} not modified")
+            return self._documents
+        self._validators = response.validators
+        self._documents = self.handler.handle_all(response)
+        list(self.handler.collect_new_requests())
+        date = datetime.now(timezone.utc).date().isoformat()
+        for document in self._documents:
+            self._store(f"{date}/{document.path}", document)
+        return self._documents
+
+    def next_interval(self, documents: list[ParsedDocument]) -> float:
+        """
+        Seconds until the next poll.
+
+        Parameters
+        ----------
+        documents : list of ParsedDocument
+            Documents of the latest poll.
+
+        Returns
+        -------
+        float
+            The interval for the documents, at least the remaining time until
+            the UTC reset divided by the remaining polls of the budget and
+            requests of the request limit.
+        """
+        interval = self.interval(documents)
+        left = [
+            count
+            for count in (
+                self._remaining_budget(),
+                self.requester.remaining_requests(),
+            )
+            if count is not None
+        ]
+        if not left:
+            return interval
+        remaining = min(left)
+        until_reset = _seconds_until_reset(datetime.now(timezone.utc))
+        if remaining <= 0:
+            return until_reset
+        return max(interval, until_reset / remaining)
+
+    def run(
+        self, request_factory: Callable[[], APIRequest], stop: threading.Event
+    ) -> None:
+        """
+        Poll until ``stop`` is set.
+
+        Parameters
+        ----------
+        request_factory : callable
+            Returns the request to poll.
+        stop : threading.Event
+            Ends the loop once set, also while waiting for the next poll.
+        """
+        while not stop.is_set():
+            self._roll_day()
+            try:
+                documents = self.poll(request_factory())
+                wait = self.next_interval(documents)
+            except RequestLimitReachedException as e:
+                documents = self._documents
+                wait = _seconds_until_reset(datetime.now(timezone.utc))
+                logger.info(f"{e} Pausing live polling for {wait:.0f}s.")
+            except CircuitOpenException as e:
+                documents = self._documents
+                wait = e.retry_after
+                logger.warning(f"{e} Pausing live polling for {wait:.0f}s.")
+            logger.info(
+                f"{len(documents)} live documents, {self.written} written in "
+                f"{self.polls} polls, next poll in {wait:.0f}s"
+            )
+            stop.wait(wait)
+
+    def _roll_day(self) -> None:
+        today = datetime.now(timezone.utc).date()
+        if today != self._day:
+            self._day = today
+            self.requester.request_count = 0
+            self._polls_today = 0
+
+    def _remaining_budget(self) -> int | None:
+        if self.budget is None:
+            return None
+        used = self._polls_today
+        if self.quota_store is not None:
+            try:
+                used = self.quota_store.get_used(self.budget_key, quota_day())
+            except Exception:
+                logger.warning(
+                    f"Could not read the poll count of {self.budget_key}",
+                    exc_info=True,
+                )
+        return self.budget - used
+
+    def _count_poll(self) -> None:
+        self._polls_today += 1
+        if self.budget is None or self.quota_store is None:
+            return
+        try:
+            self.quota_store.try_acquire(self.budget_key, quota_day())
+        except Exception:
+            logger.warning(
+                f"Could not count the poll against {self.budget_key}", exc_info=True
+            )
+
+    def _store(self, key: str, document: ParsedDocument) -> None:
+        body = (
+            document.raw
+            if document.raw is not None
+            else json.dumps(document.data, sort_keys=True).encode("utf-8")
+        )
+        digest = hashlib.sha256(body).hexdigest()
+        if self._hashes.get(key) == digest:
+            self._hashes.move_to_end(key)
+            return
+        self.files.save_json(body, key)
+        self.written += 1
+        self._hashes[key] = digest
+        self._hashes.move_to_end(key)
+        while len(self._hashes) > self.max_documents:
+            self._hashes.popitem(last=False)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import datetime
+from io import IOBase
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
-from data_backend.database.models import RequestDB
+from data_backend.database.models import ManifestDB, RequestDB
 
 
 class APIRequest(BaseModel):
@@ -13,6 +15,7 @@ class APIRequest(BaseModel):
     type: str
     params: dict[str, str] | None = None
     payload: dict[str, Any] | None = None
+    tags: dict[str, Any] | None = None
 
 
 @dataclass
@@ -38,6 +41,7 @@ class StoredRequest:
             params=self.request.params,
             payload=self.request.payload,
             type=self.request.type,
+            tags=self.request.tags,
         )
 
     @classmethod
@@ -60,6 +64,7 @@ class StoredRequest:
             type=db_request.type,
             params=db_request.params,
             payload=db_request.payload,
+            tags=db_request.tags,
         )
         return cls(
             request=api_request,
@@ -68,9 +73,266 @@ class StoredRequest:
             id=db_request.id,
         )
 
+    @classmethod
+    def from_row(cls, row: Any) -> StoredRequest:
+        """
+        Create a StoredRequest instance from a row of `RequestDB` columns.
+
+        The request is built without validation: stored rows were validated
+        when they were added.
+
+        Parameters
+        ----------
+        row : Row
+            A row with the ``id``, ``name``, ``logical_date``, ``url``,
+            ``type``, ``params``, ``payload`` and ``tags`` columns.
+
+        Returns
+        -------
+        StoredRequest
+            The corresponding StoredRequest instance.
+        """
+        api_request = APIRequest.construct(
+            url=row.url,
+            type=row.type,
+            params=row.params,
+            payload=row.payload,
+            tags=row.tags,
+        )
+        return cls(
+            request=api_request,
+            name=row.name,
+            logical_date=row.logical_date,
+            id=row.id,
+        )
+
 
 class APIResponse(BaseModel):
-    body: str
+    """
+    A downloaded response.
+
+    The body is kept as the undecoded ``content`` bytes received from the
+    server. ``body`` decodes it to text lazily, on first access, so consumers
+    that accept bytes never pay for decoding.
+
+    ``validators`` holds the conditional request headers (``If-None-Match``,
+    ``If-Modified-Since``) that revalidate this response; a revalidated,
+    unchanged response has ``not_modified`` set and no content. A response
+    failed with an HTTP error carries its ``status_code``.
+    """
+
+    content: bytes = b""
     request: APIRequest
+    encoding: str = "utf-8"
     path: str | None = None
     error: str | None = None
+    stream: IOBase | None = None
+    validators: dict[str, str] | None = None
+    not_modified: bool = False
+    status_code: int | None = None
+    _body: str | None = PrivateAttr(default=None)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def __init__(self, body: str | None = None, **data: Any) -> None:
+        if body is not None:
+            data["content"] = body.encode(data.get("encoding") or "utf-8")
+        super().__init__(**data)
+        self._body = body
+
+    @property
+    def body(self) -> str:
+        """
+        The response body decoded to text.
+
+        Returns
+        -------
+        str
+            The content decoded with the response encoding.
+        """
+        if self._body is None:
+            self._body = self.content.decode(self.encoding, errors="replace")
+        return self._body
+
+
+@dataclass
+class ParsedDocument:
+    type: str
+    data: Any
+    path: str
+    tags: dict[str, Any] | None = None
+    raw: bytes | None = None
+
+
+@dataclass
+class StoredObject:
+    key: str
+    size: int
+    checksum: str
+    etag: str | None = None
+
+
+@dataclass
+class ManifestEntry:
+    key: str
+    name: str
+    logical_date: str
+    type: str
+    size: int
+    checksum: str
+    etag: str | None = None
+    fixture_id: int | None = None
+    league_id: int | None = None
+    date: str | None = None
+    bundle: str | None = None
+    bundle_offset: int | None = None
+    bundle_length: int | None = None
+
+    @classmethod
+    def from_stored(
+        cls, stored: StoredObject, request: StoredRequest, document: ParsedDocument
+    ) -> ManifestEntry:
+        """
+        Build a manifest entry for an object saved while processing a request.
+
+        Index attributes (fixture, league and date) are taken from the document
+        tags, which default to the tags set by the request generator.
+
+        Parameters
+        ----------
+        stored : StoredObject
+            Metadata of the object written to storage.
+        request : StoredRequest
+            The request whose response produced the object.
+        document : ParsedDocument
+            The parsed document that was stored.
+
+        Returns
+        -------
+        ManifestEntry
+            The manifest entry describing the stored object.
+        """
+        tags = document.tags or {}
+        return cls(
+            key=stored.key,
+            name=request.name,
+            logical_date=request.logical_date,
+            type=document.type,
+            size=stored.size,
+            checksum=stored.checksum,
+            etag=stored.etag,
+            fixture_id=tags.get("fixture_id"),
+            league_id=tags.get("league_id"),
+            date=tags.get("date"),
+        )
+
+    def to_orm(self) -> ManifestDB:
+        """
+        Convert this ManifestEntry to the corresponding ORM model.
+
+        Returns
+        -------
+        ManifestDB
+            The database representation of this entry.
+        """
+        return ManifestDB(
+            key=self.key,
+            name=self.name,
+            logical_date=self.logical_date,
+            type=self.type,
+            size=self.size,
+            checksum=self.checksum,
+            etag=self.etag,
+            fixture_id=self.fixture_id,
+            league_id=self.league_id,
+            date=self.date,
+            bundle=self.bundle,
+            bundle_offset=self.bundle_offset,
+            bundle_length=self.bundle_length,
+        )
+
+    @classmethod
+    def from_orm(cls, db_entry: ManifestDB) -> ManifestEntry:
+        """
+        Create a ManifestEntry instance from a ManifestDB ORM object.
+
+        Parameters
+        ----------
+        db_entry : ManifestDB
+            The database manifest row to convert.
+
+        Returns
+        -------
+        ManifestEntry
+            The corresponding ManifestEntry instance.
+        """
+        return cls(
+            key=db_entry.key,
+            name=db_entry.name,
+            logical_date=db_entry.logical_date,
+            type=db_entry.type,
+            size=db_entry.size,
+            checksum=db_entry.checksum,
+            etag=db_entry.etag,
+            fixture_id=db_entry.fixture_id,
+            league_id=db_entry.league_id,
+            date=db_entry.date,
+            bundle=db_entry.bundle,
+            bundle_offset=db_entry.bundle_offset,
+            bundle_length=db_entry.bundle_length,
+        )
+
+
+@dataclass
+class ReplayStats:
+    objects: int = 0
+    bytes: int = 0
+    documents: int = 0
+    rows: int = 0
+    requests: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def report(self) -> str:
+        """Format the throughput of a replay."""
+        elapsed = self.elapsed or 1e-9
+        megabytes = self.bytes / 1024**2
+        return (
+            f"Replayed {self.objects} objects ({megabytes:.1f} MB) into "
+            f"{self.documents} documents, {self.rows} rows and {self.requests} "
+            f"new requests in {self.elapsed:.1f}s: "
+            f"{self.objects / elapsed:.0f} objects/s, {megabytes / elapsed:.1f} MB/s, "
+            f"{self.errors} errors"
+        )
+
+
+@dataclass
+class DownloadJob:
+    id: str
+    name: str
+    logical_date: str
+    requests: list[APIRequest]
+    status: str = "queued"
+    submitted_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    requests_made: int = 0
+    resume_at: datetime | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the job as JSON-serializable data, without its requests."""
+        data: dict[str, Any] = {
+            "id": self.id,
+            "name": self.name,
+            "logical_date": self.logical_date,
+            "requests": len(self.requests),
+            "status": self.status,
+            "requests_made": self.requests_made,
+            "error": self.error,
+        }
+        for key in ["submitted_at", "started_at", "finished_at", "resume_at"]:
+            value = getattr(self, key)
+            data[key] = value.isoformat() if value is not None else None
+        return data
@@ -0,0 +1,198 @@
+import cProfile
+import logging
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Generator
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from types import FrameType
+from typing import ContextManager
+
+logger = logging.getLogger(__name__)
+
+
+class StageProfiler:
+    """
+    Measures where the time of a download run goes.
+
+    Pipeline stages (HTTP call, rate-limit sleep, parsing, storage, database
+    writes, ...) are wrapped with `stage`, which accumulates their wall time.
+    Optionally, the run is also profiled with cProfile, and a sampling thread
+    records the call stacks of the profiled thread, prefixed with the active
+    stage, for flamegraphs.
+    """
+
+    def __init__(
+        self, cprofile: bool = False, sample_interval: float | None = None
+    ) -> None:
+        """
+        Initialize a StageProfiler.
+
+        Parameters
+        ----------
+        cprofile : bool, optional
+            Run cProfile between `start` and `stop`. Default is ``False``.
+        sample_interval : float, optional
+            Seconds between stack samples. If ``None``, no stacks are sampled.
+            Default is ``None``.
+        """
+        self.cprofile = cprofile
+        self.sample_interval = sample_interval
+        self.totals: dict[str, float] = defaultdict(float)
+        self.calls: dict[str, int] = defaultdict(int)
+        self.stacks: Counter[str] = Counter()
+        self._active: list[str] = []
+        self._profile: cProfile.Profile | None = None
+        self._sampler: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._thread_id: int | None = None
+        self._started_at: float | None = None
+        self.elapsed: float = 0.0
+
+    @contextmanager
+    def stage(self, name: str) -> Generator[None, None, None]:
+        """
+        Measure the wall time of a pipeline stage.
+
+        Nested stages are measured separately; the outer stage includes the
+        time of the inner ones.
+
+        Parameters
+        ----------
+        name : str
+            Name of the stage.
+        """
+        self._active.append(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[name] += time.perf_counter() - started
+            self.calls[name] += 1
+            self._active.pop()
+
+    def start(self) -> None:
+        """
+        Start the run clock, cProfile and the stack sampler.
+        """
+        self._started_at = time.perf_counter()
+        self._thread_id = threading.get_ident()
+        if self.cprofile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        if self.sample_interval is not None:
+            self._stopped.clear()
+            self._sampler = threading.Thread(
+                target=self._sample, name="stage-profiler", daemon=True
+            )
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """
+        Stop the run clock, cProfile and the stack sampler.
+        """
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._stopped.set()
+            self._sampler.join()
+            self._sampler = None
+        if self._started_at is not None:
+            self.elapsed += time.perf_counter() - self._started_at
+            self._started_at = None
+
+    def report(self) -> str:
+        """
+        Format the per-stage breakdown.
+
+        Returns
+        -------
+        str
+            A table with the calls, total and mean time of every stage and its
+            share of the run time, slowest first.
+        """
+        elapsed = self.elapsed or sum(self.totals.values()) or 1.0
+        lines = [f"{'stage':<16}{'calls':>8}{'total s':>12}{'mean ms':>12}{'share':>8}"]
+        for name, total in sorted(self.totals.items(), key=lambda x: -x[1]):
+            calls = self.calls[name]
+            lines.append(
+                f"{name:<16}{calls:>8}{total:>12.3f}"
+                f"{1000 * total / calls:>12.2f}{total / elapsed:>8.1%}"
+            )
+        lines.append(f"{'run':<16}{'':>8}{self.elapsed:>12.3f}")
+        return "\n".join(lines)
+
+    def dump(self, directory: str | Path) -> list[Path]:
+        """
+        Write the profiling results to a directory.
+
+        Writes ``stages.txt`` with the per-stage breakdown, ``profile.pstats``
+        with the cProfile statistics (readable with `pstats` or snakeviz) and
+        ``stacks.collapsed`` with the sampled stacks in the collapsed format
+        of flamegraph.pl and speedscope.
+
+        Parameters
+        ----------
+        directory : str or Path
+            Output directory. Created if it does not exist.
+
+        Returns
+        -------
+        list of Path
+            The written files.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        written = [directory / "stages.txt"]
+        written[0].write_text(self.report() + "\n")
+        if self._profile is not None:
+            written.append(directory / "profile.pstats")
+            self._profile.dump_stats(written[-1])
+        if self.stacks:
+            written.append(directory / "stacks.collapsed")
+            written[-1].write_text(
+                "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+            )
+        logger.info(f"Profile written to {directory}")
+        return written
+
+    def _sample(self) -> None:
+        thread_id = self._thread_id
+        if thread_id is None:
+            return
+        while not self._stopped.wait(self.sample_interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                self.stacks[self._collapse(frame)] += 1
+
+    def _collapse(self, frame: FrameType | None) -> str:
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f"{code.co_name} ({Path(code.co_filename).name})")
+            frame = frame.f_back
+        stages = [f"stage:{name}" for name in list(self._active)]
+        return ";".join(stages + frames[::-1])
+
+
+def stage(profiler: StageProfiler | None, name: str) -> ContextManager[None]:
+    """
+    Measure a stage with an optional profiler.
+
+    Parameters
+    ----------
+    profiler : StageProfiler or None
+        The profiler. If ``None``, nothing is measured.
+    name : str
+        Name of the stage.
+
+    Returns
+    -------
+    ContextManager
+        The stage context, or a no-op context without a profiler.
+    """
+    if profiler is None:
+        return nullcontext()
+    return profiler.stage(name)
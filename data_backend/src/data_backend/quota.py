@@ -0,0 +1,96 @@
+import multiprocessing
+from datetime import datetime, time, timedelta, timezone
+
+
+def quota_day(now: datetime | None = None) -> str:
+    """
+    Return the quota day of a moment, the UTC date the API provider counts it in.
+
+    Parameters
+    ----------
+    now : datetime, optional
+        The moment. Defaults to the current time.
+
+    Returns
+    -------
+    str
+        The UTC date in ISO format.
+    """
+    now = now or datetime.now(timezone.utc)
+    return now.astimezone(timezone.utc).date().isoformat()
+
+
+def next_quota_reset(now: datetime | None = None) -> datetime:
+    """
+    Return the moment the daily quota of the API provider resets.
+
+    Parameters
+    ----------
+    now : datetime, optional
+        The moment to look from. Defaults to the current time.
+
+    Returns
+    -------
+    datetime
+        The next midnight UTC.
+    """
+    day = datetime.fromisoformat(quota_day(now)).date()
+    return datetime.combine(day + timedelta(days=1), time.min, timezone.utc)
+
+
+class SharedQuota:
+    """
+    A request quota shared between threads and worker processes.
+
+    The counter lives in shared memory, so one instance passed to worker
+    processes at start-up (e.g. through a pool initializer) enforces a single
+    limit across all of them.
+    """
+
+    def __init__(self, limit: int, used: int = 0) -> None:
+        """
+        Initialize a SharedQuota.
+
+        Parameters
+        ----------
+        limit : int
+            Maximum number of requests allowed.
+        used : int, optional
+            Number of requests already made against the quota. Default is ``0``.
+        """
+        self.limit: int = limit
+        self._used = multiprocessing.Value("i", used)
+
+    @property
+    def used(self) -> int:
+        """
+        Number of requests made against the quota so far.
+
+        Returns
+        -------
+        int
+            The current request count.
+        """
+        return self._used.value
+
+    def try_acquire(self) -> bool:
+        """
+        Reserve one request from the quota.
+
+        Returns
+        -------
+        bool
+            ``True`` if a request was reserved, ``False`` if the quota is used up.
+        """
+        with self._used.get_lock():
+            if self._used.value >= self.limit:
+                return False
+            self._used.value += 1
+            return True
+
+    def release(self) -> None:
+        """
+        Give back a request reserved with `try_acquire` that was not sent.
+        """
+        with self._used.get_lock():
+            self._used.value -= 1
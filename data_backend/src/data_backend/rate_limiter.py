@@ -1,3 +1,5 @@
+import threading
+import time
 from typing import Literal
 
 
@@ -7,7 +9,8 @@ class RateLimiter:
 
     This utility helps enforce rate limits by calculating the minimum
     delay between consecutive events based on a given number of allowed
-    events per time unit.
+    events per time unit. A limiter can be shared between threads; their
+    events are let through one interval apart.
     """
 
     SECONDS_PER_UNIT: dict[str, int] = {
@@ -17,14 +20,14 @@ class RateLimiter:
     }
 
     def __init__(
-        self, events_per_unit: int, unit: Literal["second", "minute", "hour"]
+        self, events_per_unit: float, unit: Literal["second", "minute", "hour"]
     ) -> None:
         """
         Initialize a RateLimiter instance.
 
         Parameters
         ----------
-        events_per_unit : int
+        events_per_unit : float
             The maximum number of events allowed within the given time unit.
         unit : {"second", "minute", "hour"}
             The time unit over which the event rate is defined.
@@ -40,9 +43,11 @@ class RateLimiter:
                 f"Choose from: {list(self.SECONDS_PER_UNIT.keys())}"
             )
 
-        self.events_per_unit: int = events_per_unit
+        self.events_per_unit: float = events_per_unit
         self.unit: Literal["second", "minute", "hour"] = unit
         self._interval_seconds: float = self.SECONDS_PER_UNIT[unit] / events_per_unit
+        self._last_event: float = time.monotonic()
+        self._lock = threading.Lock()
 
     @property
     def interval_seconds(self) -> float:
@@ -56,3 +61,28 @@ class RateLimiter:
             two consecutive events.
         """
         return self._interval_seconds
+
+    def wait_time(self) -> float:
+        """
+        Time left until the next event is allowed.
+
+        Time spent since the previous event, e.g. on processing its response,
+        counts towards the interval. The first event is measured from the
+        creation of the limiter.
+
+        Returns
+        -------
+        float
+            Seconds to wait, ``0.0`` if the event may happen now.
+        """
+        return max(0.0, self._last_event + self._interval_seconds - time.monotonic())
+
+    def acquire(self) -> None:
+        """
+        Sleep until the next event is allowed and record it.
+
+        Concurrent callers wait for each other, so each gets its own interval.
+        """
+        with self._lock:
+            time.sleep(self.wait_time())
+            self._last_event = time.monotonic()
@@ -0,0 +1,186 @@
+import logging
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from data_backend.columnar import ColumnarWriter
+from data_backend.handlers import ResponseHandler
+from data_backend.models import APIRequest, APIResponse, ReplayStats
+from data_backend.storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+REPLAY_URL_PREFIX = "replay://"
+
+KeyClassifier = Callable[[str], str | None]
+
+
+@dataclass
+class _Replayed:
+    key: str
+    size: int = 0
+    documents: int = 0
+    tables: list[tuple[str, str, list[dict[str, Any]]]] = field(default_factory=list)
+    requests: list[APIRequest] = field(default_factory=list)
+    error: str | None = None
+
+
+_handler: ResponseHandler | None = None
+_storage: StorageBackend | None = None
+
+
+def _init_worker(
+    handler: ResponseHandler, storage_factory: Callable[[], StorageBackend]
+) -> None:
+    global _handler, _storage
+    _handler = handler
+    _storage = storage_factory()
+
+
+def _replay_object(item: tuple[str, str, dict[str, Any] | None]) -> _Replayed:
+    if _handler is None or _storage is None:
+        raise RuntimeError("Replay worker was not initialized")
+    key, request_type, tags = item
+    try:
+        body = _storage.read_bytes(key)
+        response = APIResponse(
+            content=body,
+            request=APIRequest(
+                url=f"{REPLAY_URL_PREFIX}{key}", type=request_type, tags=tags
+            ),
+        )
+        documents = _handler.handle_all(response)
+        logical_date = key.split("/", 1)[0]
+        tables = [
+            (table, (document.tags or {}).get("date") or logical_date, rows)
+            for document in documents
+            for table, rows in _handler.flatten(document.type, document.data).items()
+        ]
+        requests = list(_handler.collect_new_requests())
+    except Exception as e:
+        list(_handler.collect_new_requests())
+        return _Replayed(key=key, error=repr(e))
+    return _Replayed(
+        key=key,
+        size=len(body),
+        documents=len(documents),
+        tables=tables,
+        requests=requests,
+    )
+
+
+class Replayer:
+    """
+    Re-runs response handlers over stored raw objects, without API calls.
+
+    Every object is read back from storage and passed to the handler as a
+    synthetic `APIResponse` of the type its key classifies to. Parsing and
+    flattening are spread over a process pool; the flattened rows are written
+    by the parent process. Requests generated by the handler are only counted,
+    nothing is downloaded.
+    """
+
+    def __init__(
+        self,
+        handler: ResponseHandler,
+        storage_factory: Callable[[], StorageBackend],
+        classify: KeyClassifier,
+        columnar_writer: ColumnarWriter | None = None,
+        processes: int | None = None,
+        chunksize: int = 8,
+    ) -> None:
+        """
+        Initialize a Replayer.
+
+        Parameters
+        ----------
+        handler : ResponseHandler
+            The handler to replay. It is pickled to the worker processes, so its
+            functions must be importable, e.g. module-level functions or
+            partials of them.
+        storage_factory : callable
+            Picklable factory of the storage holding the raw objects, called
+            once in every worker.
+        classify : callable
+            Maps an object key to its request type, or ``None`` to skip it.
+        columnar_writer : ColumnarWriter, optional
+            Writer of the flattened rows. If None, rows are only counted.
+        processes : int, optional
+            Number of worker processes. ``1`` replays in the calling process.
+            Default is the number of CPUs.
+        chunksize : int, optional
+            Number of objects sent to a worker at once. Default is ``8``.
+        """
+        self.handler = handler
+        self.storage_factory = storage_factory
+        self.classify = classify
+        self.columnar = columnar_writer
+        self.processes = processes
+        self.chunksize = chunksize
+
+    def replay(
+        self,
+        keys: Iterable[str],
+        tags: Mapping[str, dict[str, Any]] | None = None,
+    ) -> ReplayStats:
+        """
+        Replay the stored objects under the given keys.
+
+        Parameters
+        ----------
+        keys : iterable of str
+            Object keys, starting with their logical date, e.g.
+            ``"2026-02-20/2026-02-20_schedule.json"``.
+        tags : mapping of (str, dict), optional
+            Tags of the requests that downloaded the objects, by key. The
+            documents of an object carry them, as they did when downloaded,
+            so their rows land in the same partitions. Objects without tags
+            are partitioned by their logical date.
+
+        Returns
+        -------
+        ReplayStats
+            Counts and throughput of the replay.
+        """
+        tags = tags or {}
+        items = [
+            (key, t, tags.get(key))
+            for key in keys
+            if (t := self.classify(key)) is not None
+        ]
+        stats = ReplayStats()
+        started = time.perf_counter()
+        for result in self._run(items):
+            if result.error is not None:
+                stats.errors += 1
+                logger.error(f"Could not replay {result.key}: {result.error}")
+                continue
+            stats.objects += 1
+            stats.bytes += result.size
+            stats.documents += result.documents
+            stats.requests += len(result.requests)
+            for table, partition, rows in result.tables:
+                stats.rows += len(rows)
+                if self.columnar is not None:
+                    self.columnar.write(table, rows, partition=partition)
+        if self.columnar is not None:
+            self.columnar.flush()
+        stats.elapsed = time.perf_counter() - started
+        logger.info(stats.report())
+        return stats
+
+    def _run(
+        self, items: list[tuple[str, str, dict[str, Any] | None]]
+    ) -> Iterator[_Replayed]:
+        if self.processes == 1:
+            _init_worker(self.handler, self.storage_factory)
+            yield from map(_replay_object, items)
+            return
+        with ProcessPoolExecutor(
+            max_workers=self.processes,
+            initializer=_init_worker,
+            initargs=(self.handler, self.storage_factory),
+        ) as executor:
+            yield from executor.map(_replay_object, items, chunksize=self.chunksize)
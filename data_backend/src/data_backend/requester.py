@@ -1,10 +1,23 @@
 import logging
-import time
+import tempfile
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from typing import NoReturn
+from urllib.parse import urlsplit
 
 import requests
 
-from data_backend.exceptions import RequestLimitReachedException
+from data_backend.circuit_breaker import CircuitBreaker
+from data_backend.database.quota import QuotaStore
+from data_backend.exceptions import (
+    CircuitOpenException,
+    DownloadDeferredException,
+    RequestLimitReachedException,
+)
+from data_backend.keys import APIKey, KeyPool
 from data_backend.models import APIRequest, APIResponse
+from data_backend.profiling import StageProfiler, stage
+from data_backend.quota import SharedQuota, next_quota_reset, quota_day
 from data_backend.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
@@ -25,6 +38,16 @@ class HTTPRequester:
         rate_limit: RateLimiter | None = None,
         request_limit: int | None = None,
         request_count: int = 0,
+        quota: SharedQuota | None = None,
+        chunk_size: int = 64 * 1024,
+        spool_max_size: int = 8 * 1024 * 1024,
+        circuit_breaker: Callable[[], CircuitBreaker] | None = None,
+        circuit_per_endpoint: bool = False,
+        profiler: StageProfiler | None = None,
+        max_wait: float | None = None,
+        key_pool: KeyPool | None = None,
+        quota_store: QuotaStore | None = None,
+        quota_key: str = "requests",
     ) -> None:
         """
         Initialize an HTTPRequester.
@@ -35,21 +58,79 @@ class HTTPRequester:
             A custom requests session to use for HTTP requests. If ``None``,
             a new session is created. Default is ``None``.
         rate_limit : RateLimiter, optional
-            An optional rate limiter. If provided, a sleep interval is enforced
-            before each request. Default is ``None``.
+            An optional rate limiter. If provided, the rest of its interval is
+            slept before each request. Default is ``None``.
         request_limit : int, optional
             The maximum number of requests allowed. If ``None``, there is no limit.
             Default is ``None``.
         request_count : int, optional
             Initial request count (e.g., for resuming an interrupted run).
             Default is ``0``.
+        quota : SharedQuota, optional
+            A quota shared with other requesters, e.g. in worker processes.
+            Checked in addition to ``request_limit``. Default is ``None``.
+        chunk_size : int, optional
+            Size in bytes of the chunks read from streamed responses.
+            Default is 64 KiB.
+        spool_max_size : int, optional
+            Size in bytes up to which a streamed body is kept in memory before
+            it is spooled to a temporary file. Default is 8 MiB.
+        circuit_breaker : callable, optional
+            Factory of circuit breakers, e.g. the ``CircuitBreaker`` class. If
+            provided, one breaker is kept per host, and requests to a host
+            whose circuit is open are refused. Connection errors, 5xx and 429
+            responses count as failures. Default is ``None``.
+        circuit_per_endpoint : bool, optional
+            Keep one breaker per host and path instead of per host.
+            Default is ``False``.
+        profiler : StageProfiler, optional
+            Profiler measuring the ``rate_limit`` and ``http`` stages.
+            Default is ``None``.
+        max_wait : float, optional
+            Longest wait in seconds for the rate limit. Longer waits, and a
+            reached request limit or quota, raise `DownloadDeferredException`
+            with the time to resume at instead: the next quota reset, at
+            midnight UTC, for a reached limit. If ``None``, rate waits are
+            always slept. Default is ``None``.
+        key_pool : KeyPool, optional
+            API keys to spread the requests over. Every request is sent with
+            the headers of a key picked from the pool, within the rate limit
+            and daily quota of that key, in addition to ``rate_limit`` and
+            ``request_limit``. Requests refused with 429 or 403 are retried
+            with another key. Default is ``None``.
+        quota_store : QuotaStore, optional
+            Store of daily request counters. If provided, ``request_limit`` is
+            a limit per UTC day on the counter ``quota_key``, shared by all
+            requesters using the key: every request is counted atomically
+            right before it is sent, once even if it is retried with another
+            key. If the store fails, this requester's own count
+            is used instead. Default is ``None``.
+        quota_key : str, optional
+            The counter of ``request_limit`` in ``quota_store``. Default is
+            ``"requests"``.
         """
         self.http_session: requests.Session = http_session or requests.Session()
         self.rate_limit: RateLimiter | None = rate_limit
         self.request_limit: int | None = request_limit
         self.request_count: int = request_count
+        self.quota: SharedQuota | None = quota
+        self.chunk_size: int = chunk_size
+        self.spool_max_size: int = spool_max_size
+        self.circuit_breaker: Callable[[], CircuitBreaker] | None = circuit_breaker
+        self.circuit_per_endpoint: bool = circuit_per_endpoint
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.profiler: StageProfiler | None = profiler
+        self.max_wait: float | None = max_wait
+        self.key_pool: KeyPool | None = key_pool
+        self.quota_store: QuotaStore | None = quota_store
+        self.quota_key: str = quota_key
 
-    def get(self, request: APIRequest) -> APIResponse:
+    def get(
+        self,
+        request: APIRequest,
+        stream: bool = False,
+        headers: dict[str, str] | None = None,
+    ) -> APIResponse:
         """
         Perform an HTTP GET request with optional rate and request limits.
 
@@ -57,55 +138,282 @@ class HTTPRequester:
         ----------
         request : APIRequest
             The request object containing URL, parameters, and payload.
+        stream : bool, optional
+            Stream the body into a spooled temporary file instead of reading
+            it as text. The file is returned as ``APIResponse.stream`` and
+            ``content`` is left empty. Default is ``False``.
+        headers : dict of (str, str), optional
+            Extra request headers, e.g. the ``validators`` of an earlier
+            response to make the request conditional.
 
         Returns
         -------
         APIResponse
             The response object containing body, request, and error (if any).
+            A ``304 Not Modified`` response has ``not_modified`` set.
 
         Raises
         ------
         RequestLimitReachedException
-            If the request limit has been reached.
+            If the request limit, the shared quota or the quotas of all pooled
+            keys have been reached.
+        DownloadDeferredException
+            With ``max_wait``, if a limit was reached or the rate limit would
+            wait longer than ``max_wait``; no quota is spent on the request.
+        CircuitOpenException
+            If the circuit of the request's host is open. No limit, quota or
+            rate-limit slot is spent on the request. Its ``retry_after`` is
+            the seconds until the circuit lets a probe through.
         """
-        if self.request_limit is not None and self.request_count >= self.request_limit:
-            raise RequestLimitReachedException(
-                f"Request limit of {self.request_limit} reached."
+        breaker = self._breaker(request)
+        if breaker is not None and breaker.state == "open":
+            raise CircuitOpenException(
+                f"Circuit for {self._circuit_key(request)} is open.",
+                retry_after=breaker.retry_after(),
             )
+        key, response = self._send(request, stream, headers, breaker)
+        retries = len(self.key_pool) - 1 if self.key_pool is not None else 0
+        while (
+            key is not None
+            and self.key_pool is not None
+            and self.key_pool.report(key, response.status_code)
+            and retries > 0
+        ):
+            retries -= 1
+            logger.warning(f"Retrying {request.url} with another API key")
+            # The request was counted against the daily limit when first sent.
+            key, response = self._send(request, stream, headers, breaker, retry=True)
+        return response
+
+    def _send(
+        self,
+        request: APIRequest,
+        stream: bool,
+        headers: dict[str, str] | None,
+        breaker: CircuitBreaker | None,
+        retry: bool = False,
+    ) -> tuple[APIKey | None, APIResponse]:
+        if (
+            self.request_limit is not None
+            and self.quota_store is None
+            and self.request_count >= self.request_limit
+        ):
+            self._limit_reached(f"Request limit of {self.request_limit} reached.")
+        key = self._select_key()
+        if breaker is not None:
+            breaker.allow()
+        # Quotas are spent only once nothing else can refuse the request, and
+        # the shared quota is given back if the quota store refuses it. A
+        # failover retry resends the same request, so it only spends the
+        # quota of its new key.
+        if not retry:
+            if self.quota is not None and not self.quota.try_acquire():
+                self._limit_reached(f"Shared quota of {self.quota.limit} reached.")
+            if self.quota_store is not None and not self._count_request():
+                if self.quota is not None:
+                    self.quota.release()
+                self._limit_reached(
+                    f"Daily request limit of {self.request_limit} reached "
+                    f"for {self.quota_key}."
+                )
+        pool = self.key_pool
+        while key is not None and pool is not None and not pool.reserve(key):
+            key = self._select_key()
 
+        if key is not None and self.key_pool is not None:
+            with stage(self.profiler, "rate_limit"):
+                self.key_pool.wait(key)
+            headers = {**(headers or {}), **key.headers}
         if self.rate_limit is not None:
-            time.sleep(self.rate_limit.interval_seconds)
+            with stage(self.profiler, "rate_limit"):
+                self.rate_limit.acquire()
 
         logger.info(f"Making GET request to {request.url}")
         self.request_count += 1
         try:
-            response = self.http_session.get(
-                request.url, params=request.params, json=request.payload
-            )
-            response.raise_for_status()
-            return APIResponse(
-                body=response.text,
-                request=request,
-                error=None,
-            )
+            with stage(self.profiler, "http"):
+                result = self._fetch(request, stream, headers)
 
         except requests.exceptions.HTTPError as e:
-            response_body = e.response.text if e.response else ""
+            content = e.response.content if e.response is not None else b""
+            status_code = e.response.status_code if e.response is not None else 500
+            # With a key pool, 429 and 403 are answers to a key, not to the host.
+            key_refused = key is not None and status_code in (403, 429)
+            self._record(
+                breaker,
+                healthy=status_code < 500 and (status_code != 429 or key_refused),
+            )
             error_msg = str(e)
             logger.error(
-                f"HTTP error for {request.url}: {error_msg}\nBody: {response_body}"
+                f"HTTP error for {request.url}: {error_msg}\n"
+                f"Body: {content.decode('utf-8', errors='replace')}"
             )
-            return APIResponse(
-                body=response_body,
+            return key, APIResponse(
+                content=content,
                 request=request,
                 error=error_msg,
+                status_code=status_code,
             )
 
         except requests.exceptions.RequestException as e:
+            self._record(breaker, healthy=False)
             error_msg = str(e)
             logger.error(f"Request failed for {request.url}: {error_msg}")
-            return APIResponse(
-                body="",
+            return key, APIResponse(
                 request=request,
                 error=error_msg,
             )
+
+        self._record(breaker, healthy=True)
+        return key, result
+
+    def _select_key(self) -> APIKey | None:
+        key = None
+        if self.key_pool is not None:
+            try:
+                key = self.key_pool.select()
+            except RequestLimitReachedException as e:
+                self._limit_reached(str(e))
+        if self.max_wait is not None:
+            wait = self.rate_limit.wait_time() if self.rate_limit is not None else 0.0
+            if key is not None and self.key_pool is not None:
+                wait = max(wait, self.key_pool.wait_time(key))
+            if wait > self.max_wait:
+                raise DownloadDeferredException(
+                    f"Rate limit requires waiting {wait:.0f}s.",
+                    resume_at=datetime.now(timezone.utc) + timedelta(seconds=wait),
+                )
+        return key
+
+    def _count_request(self) -> bool:
+        if self.quota_store is None or self.request_limit is None:
+            return True
+        try:
+            return self.quota_store.try_acquire(
+                self.quota_key, quota_day(), self.request_limit
+            )
+        except Exception:
+            logger.warning(
+                f"Could not count the request against {self.quota_key}",
+                exc_info=True,
+            )
+            return self.request_count < self.request_limit
+
+    def remaining_requests(self) -> int | None:
+        """
+        Number of requests left under the request limit.
+
+        With a quota store, this is what is left of the day's counter, which
+        other requesters using the same key also spend.
+
+        Returns
+        -------
+        int or None
+            The requests left, ``None`` without a request limit.
+        """
+        if self.request_limit is None:
+            return None
+        used = self.request_count
+        if self.quota_store is not None:
+            try:
+                used = self.quota_store.get_used(self.quota_key, quota_day())
+            except Exception:
+                logger.warning(
+                    f"Could not read the request count of {self.quota_key}",
+                    exc_info=True,
+                )
+        return self.request_limit - used
+
+    def _limit_reached(self, message: str) -> NoReturn:
+        if self.max_wait is None:
+            raise RequestLimitReachedException(message)
+        raise DownloadDeferredException(message, resume_at=next_quota_reset())
+
+    def _fetch(
+        self, request: APIRequest, stream: bool, headers: dict[str, str] | None
+    ) -> APIResponse:
+        response = self.http_session.get(
+            request.url,
+            params=request.params,
+            json=request.payload,
+            headers=headers,
+            stream=stream,
+        )
+        response.raise_for_status()
+        validators = {
+            header: response.headers[name]
+            for name, header in [
+                ("ETag", "If-None-Match"),
+                ("Last-Modified", "If-Modified-Since"),
+            ]
+            if name in response.headers
+        } or None
+        if response.status_code == 304:
+            response.close()
+            return APIResponse(
+                request=request, validators=validators, not_modified=True
+            )
+        if stream:
+            return APIResponse(
+                request=request,
+                error=None,
+                stream=self._spool(response),
+                validators=validators,
+            )
+        return APIResponse(
+            content=response.content,
+            encoding=response.encoding or "utf-8",
+            request=request,
+            error=None,
+            validators=validators,
+        )
+
+    def circuit_open(self, request: APIRequest) -> bool:
+        """
+        Check whether the circuit of a request's host is open.
+
+        Parameters
+        ----------
+        request : APIRequest
+            The request to check.
+
+        Returns
+        -------
+        bool
+            ``True`` if requests like this one are currently refused.
+        """
+        breaker = self._breaker(request)
+        return breaker is not None and breaker.state == "open"
+
+    def _circuit_key(self, request: APIRequest) -> str:
+        url = urlsplit(request.url)
+        return url.netloc + url.path if self.circuit_per_endpoint else url.netloc
+
+    def _breaker(self, request: APIRequest) -> CircuitBreaker | None:
+        if self.circuit_breaker is None:
+            return None
+        key = self._circuit_key(request)
+        if key not in self.breakers:
+            self.breakers[key] = self.circuit_breaker()
+        return self.breakers[key]
+
+    def _record(self, breaker: CircuitBreaker | None, healthy: bool) -> None:
+        if breaker is None:
+            return
+        if healthy:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    def _spool(self, response: requests.Response) -> tempfile.SpooledTemporaryFile:
+        spool = tempfile.SpooledTemporaryFile(max_size=self.spool_max_size)
+        try:
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                spool.write(chunk)
+        except BaseException:
+            spool.close()
+            raise
+        finally:
+            response.close()
+        spool.seek(0)
+        return spool
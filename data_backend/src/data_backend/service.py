@@ -0,0 +1,377 @@
+import json
+import logging
+import queue
+import threading
+import uuid
+from collections.abc import Callable, Collection
+from datetime import datetime, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from pydantic import ValidationError
+
+from data_backend.api import APIDownloader
+from data_backend.database.listener import CONNECTION_ERRORS, RequestListener
+from data_backend.models import APIRequest, DownloadJob
+
+logger = logging.getLogger(__name__)
+
+DownloaderFactory = Callable[[str, str], APIDownloader]
+
+
+class DownloadService:
+    """
+    Runs submitted download jobs in a long-lived process.
+
+    Jobs are queued and run one after another by each of the ``workers``
+    threads; jobs of the same name wait for each other, so a pending backlog
+    is never downloaded twice at the same time. The downloader factory is
+    called once per job, so whatever it shares between calls (HTTP sessions,
+    database engines, S3 clients) stays warm across jobs instead of being set
+    up again for every run.
+    """
+
+    def __init__(
+        self,
+        downloader_factory: DownloaderFactory,
+        workers: int = 1,
+        finished_jobs: int = 1000,
+    ) -> None:
+        """
+        Initialize a DownloadService.
+
+        Parameters
+        ----------
+        downloader_factory : callable
+            Called with the name and logical date of a job, returns the
+            downloader that runs it.
+        workers : int, optional
+            Number of jobs run at the same time. Default is ``1``.
+        finished_jobs : int, optional
+            Number of finished jobs kept for lookup. Older finished jobs are
+            evicted. Default is ``1000``.
+        """
+        self.downloader_factory = downloader_factory
+        self.workers = workers
+        self.finished_jobs = finished_jobs
+        self.jobs: dict[str, DownloadJob] = {}
+        self._queue: queue.Queue[DownloadJob | None] = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._name_locks: dict[str, threading.Lock] = {}
+
+    def start(self) -> None:
+        """
+        Start the worker threads.
+        """
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f"download-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """
+        Finish the queued jobs and stop the worker threads.
+        """
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+    def submit(
+        self, name: str, logical_date: str, requests: list[APIRequest]
+    ) -> DownloadJob:
+        """
+        Queue a download job.
+
+        Parameters
+        ----------
+        name : str
+            Name of the download; its pending requests are resumed first.
+        logical_date : str
+            Logical date the requests and stored objects belong to.
+        requests : list of APIRequest
+            The requests to download.
+
+        Returns
+        -------
+        DownloadJob
+            The queued job.
+        """
+        job = DownloadJob(
+            id=uuid.uuid4().hex,
+            name=name,
+            logical_date=logical_date,
+            requests=requests,
+            submitted_at=datetime.now(timezone.utc),
+        )
+        with self._lock:
+            self.jobs[job.id] = job
+        self._queue.put(job)
+        logger.info(f"Queued job {job.id} for {name} with {len(requests)} requests")
+        return job
+
+    def get(self, job_id: str) -> DownloadJob | None:
+        """
+        Look up a job.
+
+        Parameters
+        ----------
+        job_id : str
+            The id returned by `submit`.
+
+        Returns
+        -------
+        DownloadJob or None
+            The job, or ``None`` if it is unknown.
+        """
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self) -> list[DownloadJob]:
+        """
+        List the jobs that are not evicted, in the order they were submitted.
+
+        Returns
+        -------
+        list of DownloadJob
+            The queued, running and most recently finished jobs.
+        """
+        with self._lock:
+            return list(self.jobs.values())
+
+    def run(self, job: DownloadJob) -> None:
+        """
+        Run a job in the calling thread, recording its outcome on the job.
+
+        Waits until no other job of the same name is running.
+
+        Parameters
+        ----------
+        job : DownloadJob
+            The job to run.
+        """
+        with self._lock:
+            name_lock = self._name_locks.setdefault(job.name, threading.Lock())
+        with name_lock:
+            job.status = "running"
+            job.started_at = datetime.now(timezone.utc)
+            try:
+                downloader = self.downloader_factory(job.name, job.logical_date)
+                initial_count = downloader.requester.request_count
+                downloader.download_backlog()
+                for request in job.requests:
+                    downloader.add(request)
+                downloader.download()
+                job.requests_made = downloader.requester.request_count - initial_count
+                job.resume_at = downloader.resume_at
+                job.status = "deferred" if job.resume_at is not None else "succeeded"
+            except Exception as e:
+                logger.exception(f"Job {job.id} failed")
+                job.status = "failed"
+                job.error = repr(e)
+        job.finished_at = datetime.now(timezone.utc)
+        self._evict()
+
+    def follow(
+        self,
+        listener: RequestListener,
+        names: Collection[str],
+        idle_timeout: float = 900.0,
+        stop: threading.Event | None = None,
+        reconnect_delay: float = 5.0,
+    ) -> None:
+        """
+        Download new pending requests as soon as they are added.
+
+        Blocks until ``stop`` is set. Whenever the listener reports added
+        requests of one of the names, or of its shards (``"{name}:{shard}"``),
+        a job without requests is queued for that name; it downloads the
+        pending backlog. No job is queued while one of the name is queued or
+        running, so a backlog is never downloaded twice at the same time; the
+        requests a running job adds itself are downloaded by that job. Every
+        ``idle_timeout`` seconds without notifications, jobs are queued for
+        all names, to pick up failed requests due for a retry.
+
+        If the listener connection is lost, it is reopened every
+        ``reconnect_delay`` seconds until it succeeds; jobs are then queued
+        for all names, as notifications may have been missed meanwhile.
+
+        Parameters
+        ----------
+        listener : RequestListener
+            The listener of the ``requests_pending`` channel.
+        names : collection of str
+            Names of the downloads to follow.
+        idle_timeout : float, optional
+            Seconds between backlog checks without notifications. Default is
+            ``900.0``.
+        stop : threading.Event, optional
+            Stops following once set. If None, follows forever.
+        reconnect_delay : float, optional
+            Seconds between attempts to reopen a lost listener connection.
+            Default is ``5.0``.
+        """
+        stop = stop or threading.Event()
+        listener.listen()
+        try:
+            while not stop.is_set():
+                try:
+                    added = listener.wait(idle_timeout)
+                except CONNECTION_ERRORS as e:
+                    logger.warning(f"Lost the request listener connection: {e!r}")
+                    if not self._reconnect(listener, stop, reconnect_delay):
+                        break
+                    added = set()
+                due = set(names) if not added else self._match(added, names)
+                for name in sorted(due):
+                    if not self._is_active(name):
+                        logical_date = datetime.now(timezone.utc).date().isoformat()
+                        self.submit(name, logical_date, [])
+        finally:
+            listener.close()
+
+    @staticmethod
+    def _reconnect(
+        listener: RequestListener, stop: threading.Event, delay: float
+    ) -> bool:
+        listener.close()
+        while not stop.wait(delay):
+            try:
+                listener.listen()
+            except CONNECTION_ERRORS as e:
+                logger.warning(f"Could not reconnect the request listener: {e!r}")
+                listener.close()
+                continue
+            logger.info("Reconnected the request listener")
+            return True
+        return False
+
+    @staticmethod
+    def _match(added: set[str], names: Collection[str]) -> set[str]:
+        return {
+            name
+            for name in added
+            if any(name == n or name.startswith(f"{n}:") for n in names)
+        }
+
+    def _is_active(self, name: str) -> bool:
+        with self._lock:
+            return any(
+                job.name == name and job.status in ("queued", "running")
+                for job in self.jobs.values()
+            )
+
+    def _evict(self) -> None:
+        with self._lock:
+            finished = [
+                job_id
+                for job_id, job in self.jobs.items()
+                if job.finished_at is not None
+            ]
+            for job_id in finished[: max(0, len(finished) - self.finished_jobs)]:
+                del self.jobs[job_id]
+
+    def _work(self) -> None:
+        while (job := self._queue.get()) is not None:
+            self.run(job)
+
+
+def make_server(
+    service: DownloadService, host: str = "127.0.0.1", port: int = 8080
+) -> "DownloadServer":
+    """
+    Create the HTTP server of a download service.
+
+    Endpoints:
+
+    - ``POST /jobs`` with ``{"name", "logical_date", "requests"}`` queues a
+      job and answers ``202`` with it.
+    - ``GET /jobs/<id>`` returns a job, ``GET /jobs`` all of them.
+    - ``GET /health`` answers ``200`` while the server runs.
+
+    Parameters
+    ----------
+    service : DownloadService
+        The service the requests are served from.
+    host : str, optional
+        Address to bind. Default is ``"127.0.0.1"``.
+    port : int, optional
+        Port to bind, ``0`` for any free port. Default is ``8080``.
+
+    Returns
+    -------
+    DownloadServer
+        The server; run it with ``serve_forever``.
+    """
+    return DownloadServer((host, port), _JobRequestHandler, service)
+
+
+class DownloadServer(ThreadingHTTPServer):
+    """
+    HTTP server exposing a `DownloadService`.
+    """
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        handler: type[BaseHTTPRequestHandler],
+        service: DownloadService,
+    ) -> None:
+        super().__init__(address, handler)
+        self.service = service
+
+
+class _JobRequestHandler(BaseHTTPRequestHandler):
+    server: DownloadServer
+
+    @property
+    def service(self) -> DownloadService:
+        return self.server.service
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._reply(HTTPStatus.OK, {"status": "ok"})
+        elif self.path == "/jobs":
+            jobs = self.service.list_jobs()
+            self._reply(HTTPStatus.OK, [job.to_dict() for job in jobs])
+        elif self.path.startswith("/jobs/"):
+            job = self.service.get(self.path.removeprefix("/jobs/"))
+            if job is None:
+                self._reply(HTTPStatus.NOT_FOUND, {"error": "Unknown job"})
+            else:
+                self._reply(HTTPStatus.OK, job.to_dict())
+        else:
+            self._reply(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+
+    def do_POST(self) -> None:
+        if self.path != "/jobs":
+            self._reply(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            spec = json.loads(self.rfile.read(length))
+            job = self.service.submit(
+                name=spec["name"],
+                logical_date=spec["logical_date"],
+                requests=[APIRequest.parse_obj(r) for r in spec.get("requests", [])],
+            )
+        except (ValueError, KeyError, TypeError, ValidationError) as e:
+            self._reply(HTTPStatus.BAD_REQUEST, {"error": f"Invalid job: {e!r}"})
+            return
+        self._reply(HTTPStatus.ACCEPTED, job.to_dict())
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(format % args)
+
+    def _reply(self, status: HTTPStatus, data: Any) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
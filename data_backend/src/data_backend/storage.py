@@ -0,0 +1,432 @@
+import hashlib
+import json
+import mmap
+import os
+import uuid
+from collections.abc import Generator
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from typing import IO, Any, Protocol
+
+from data_backend.models import StoredObject
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+TMP_SUFFIX = ".tmp"
+
+
+class StorageBackend(Protocol):
+    """
+    Object storage for raw responses and derived files.
+
+    Implemented by `S3Client`, `LocalStorage` and `MemoryStorage`.
+    """
+
+    def save_json(self, data: dict[str, Any] | bytes, key: str) -> StoredObject: ...
+
+    def save_stream(
+        self, stream: IO[bytes], key: str, content_type: str = "application/json"
+    ) -> StoredObject: ...
+
+    def save_bytes(
+        self, body: bytes, key: str, content_type: str = "application/octet-stream"
+    ) -> StoredObject: ...
+
+    def read_bytes(
+        self, key: str, byte_range: tuple[int, int] | None = None
+    ) -> bytes: ...
+
+    def read_buffer(self, key: str) -> bytes | memoryview | mmap.mmap: ...
+
+    def list_keys(self, prefix: str = "") -> list[str]: ...
+
+    def delete(self, keys: list[str]) -> None: ...
+
+    def flush(self) -> None: ...
+
+
+def _json_body(data: dict[str, Any] | bytes) -> bytes:
+    if isinstance(data, bytes):
+        return data
+    return json.dumps(data).encode("utf-8")
+
+
+class LocalStorage:
+    """
+    Stores objects as files under a root directory.
+
+    Every object is written to a temporary file next to its target, fsynced
+    and atomically renamed into place, so readers never see a partial file.
+    Syncing the directories, which makes the renames durable, is batched:
+    every ``fsync_batch`` writes and on `flush`. A crash may lose the renames
+    since the last sync, but never leaves a torn object behind.
+    """
+
+    def __init__(self, root: str | Path, fsync_batch: int = 100) -> None:
+        """
+        Initialize a LocalStorage.
+
+        Parameters
+        ----------
+        root : str or Path
+            Directory the object keys are relative to. Created if missing.
+        fsync_batch : int, optional
+            Number of writes between directory fsyncs. ``1`` syncs every
+            write before it returns, ``0`` leaves all flushing to the
+            operating system, without the guarantee against torn objects.
+            Default is ``100``.
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.fsync_batch = fsync_batch
+        self._unsynced: list[Path] = []
+
+    def save_json(self, data: dict[str, Any] | bytes, key: str) -> StoredObject:
+        """
+        Save a dictionary, or an already serialized document, as JSON.
+
+        Parameters
+        ----------
+        data : dict of (str, Any) or bytes
+            The dictionary to serialize, or JSON bytes written as-is.
+        key : str
+            The object key, a relative path under the root.
+
+        Returns
+        -------
+        StoredObject
+            Key, size and SHA-256 checksum of the written file.
+        """
+        return self.save_bytes(_json_body(data), key)
+
+    def save_stream(
+        self, stream: IO[bytes], key: str, content_type: str = "application/json"
+    ) -> StoredObject:
+        """
+        Save a binary stream in chunks, hashing it on the way.
+
+        Parameters
+        ----------
+        stream : IO of bytes
+            A binary file object positioned at its start.
+        key : str
+            The object key, a relative path under the root.
+        content_type : str, optional
+            Ignored, files carry no content type.
+
+        Returns
+        -------
+        StoredObject
+            Key, size and SHA-256 checksum of the written file.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        with self._atomic_write(key) as f:
+            for chunk in iter(partial(stream.read, STREAM_CHUNK_SIZE), b""):
+                digest.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+        return StoredObject(key=key, size=size, checksum=digest.hexdigest())
+
+    def save_bytes(
+        self, body: bytes, key: str, content_type: str = "application/octet-stream"
+    ) -> StoredObject:
+        """
+        Save raw bytes as a file.
+
+        Parameters
+        ----------
+        body : bytes
+            The file content.
+        key : str
+            The object key, a relative path under the root.
+        content_type : str, optional
+            Ignored, files carry no content type.
+
+        Returns
+        -------
+        StoredObject
+            Key, size and SHA-256 checksum of the written file.
+        """
+        with self._atomic_write(key) as f:
+            f.write(body)
+        return StoredObject(
+            key=key, size=len(body), checksum=hashlib.sha256(body).hexdigest()
+        )
+
+    def read_bytes(self, key: str, byte_range: tuple[int, int] | None = None) -> bytes:
+        """
+        Read a file, or a byte range of it.
+
+        Parameters
+        ----------
+        key : str
+            The object key to read.
+        byte_range : tuple of (int, int), optional
+            Start offset and length of the range to read.
+
+        Returns
+        -------
+        bytes
+            The file content.
+        """
+        with open(self._path(key), "rb") as f:
+            if byte_range is None:
+                return f.read()
+            offset, length = byte_range
+            f.seek(offset)
+            return f.read(length)
+
+    def read_buffer(self, key: str) -> mmap.mmap:
+        """
+        Memory-map a file for zero-copy reading.
+
+        The map is read-only and stays valid after the file is replaced or
+        deleted. Close it, or use it as a context manager, when done.
+
+        Parameters
+        ----------
+        key : str
+            The object key to map. Must not be empty.
+
+        Returns
+        -------
+        mmap.mmap
+            A read-only map of the whole file.
+        """
+        with open(self._path(key), "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def list_keys(self, prefix: str = "") -> list[str]:
+        """
+        List object keys under a prefix.
+
+        Parameters
+        ----------
+        prefix : str, optional
+            Key prefix to list. Default lists all objects.
+
+        Returns
+        -------
+        list of str
+            The matching object keys in lexicographic order.
+        """
+        keys = (
+            path.relative_to(self.root).as_posix()
+            for path in self.root.rglob("*")
+            if path.is_file() and not self._is_tmp(path)
+        )
+        return sorted(key for key in keys if key.startswith(prefix))
+
+    def delete(self, keys: list[str]) -> None:
+        """
+        Delete objects. Missing keys are ignored.
+
+        Parameters
+        ----------
+        keys : list of str
+            The object keys to delete.
+        """
+        for key in keys:
+            self._path(key).unlink(missing_ok=True)
+
+    def flush(self) -> None:
+        """
+        Fsync the directories of all files written since the last sync.
+        """
+        for directory in {path.parent for path in self._unsynced}:
+            try:
+                self._fsync(directory)
+            except FileNotFoundError:
+                pass
+        self._unsynced.clear()
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Key '{key}' is outside the storage root")
+        return path
+
+    @contextmanager
+    def _atomic_write(self, key: str) -> Generator[IO[bytes], None, None]:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}{TMP_SUFFIX}")
+        try:
+            with open(tmp_path, "wb") as f:
+                yield f
+                if self.fsync_batch != 0:
+                    # The data must be durable before the rename is.
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        if self.fsync_batch == 1:
+            self._fsync(path.parent)
+        elif self.fsync_batch > 1:
+            self._unsynced.append(path)
+            if len(self._unsynced) >= self.fsync_batch:
+                self.flush()
+
+    @staticmethod
+    def _is_tmp(path: Path) -> bool:
+        return path.name.startswith(".") and path.name.endswith(TMP_SUFFIX)
+
+    @staticmethod
+    def _fsync(path: Path) -> None:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class MemoryStorage:
+    """
+    Keeps objects in a dictionary.
+
+    Useful for tests and for benchmarking a download without storage costs.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty MemoryStorage.
+        """
+        self.objects: dict[str, bytes] = {}
+
+    def save_json(self, data: dict[str, Any] | bytes, key: str) -> StoredObject:
+        """
+        Save a dictionary, or an already serialized document, as JSON.
+
+        Parameters
+        ----------
+        data : dict of (str, Any) or bytes
+            The dictionary to serialize, or JSON bytes stored as-is.
+        key : str
+            The object key.
+
+        Returns
+        -------
+        StoredObject
+            Key, size and SHA-256 checksum of the object.
+        """
+        return self.save_bytes(_json_body(data), key)
+
+    def save_stream(
+        self, stream: IO[bytes], key: str, content_type: str = "application/json"
+    ) -> StoredObject:
+        """
+        Save the content of a binary stream.
+
+        Parameters
+        ----------
+        stream : IO of bytes
+            A binary file object positioned at its start.
+        key : str
+            The object key.
+        content_type : str, optional
+            Ignored.
+
+        Returns
+        -------
+        StoredObject
+            Key, size and SHA-256 checksum of the object.
+        """
+        return self.save_bytes(stream.read(), key)
+
+    def save_bytes(
+        self, body: bytes, key: str, content_type: str = "application/octet-stream"
+    ) -> StoredObject:
+        """
+        Save raw bytes.
+
+        Parameters
+        ----------
+        body : bytes
+            The object content.
+        key : str
+            The object key.
+        content_type : str, optional
+            Ignored.
+
+        Returns
+        -------
+        StoredObject
+            Key, size and SHA-256 checksum of the object.
+        """
+        self.objects[key] = body
+        return StoredObject(
+            key=key, size=len(body), checksum=hashlib.sha256(body).hexdigest()
+        )
+
+    def read_bytes(self, key: str, byte_range: tuple[int, int] | None = None) -> bytes:
+        """
+        Read an object, or a byte range of it.
+
+        Parameters
+        ----------
+        key : str
+            The object key to read.
+        byte_range : tuple of (int, int), optional
+            Start offset and length of the range to read.
+
+        Returns
+        -------
+        bytes
+            The object content.
+        """
+        body = self.objects[key]
+        if byte_range is None:
+            return body
+        offset, length = byte_range
+        return body[offset : offset + length]
+
+    def read_buffer(self, key: str) -> memoryview:
+        """
+        Return a zero-copy view of an object.
+
+        Parameters
+        ----------
+        key : str
+            The object key to read.
+
+        Returns
+        -------
+        memoryview
+            A read-only view of the object content.
+        """
+        return memoryview(self.objects[key])
+
+    def list_keys(self, prefix: str = "") -> list[str]:
+        """
+        List object keys under a prefix.
+
+        Parameters
+        ----------
+        prefix : str, optional
+            Key prefix to list. Default lists all objects.
+
+        Returns
+        -------
+        list of str
+            The matching object keys in lexicographic order.
+        """
+        return sorted(key for key in self.objects if key.startswith(prefix))
+
+    def delete(self, keys: list[str]) -> None:
+        """
+        Delete objects. Missing keys are ignored.
+
+        Parameters
+        ----------
+        keys : list of str
+            The object keys to delete.
+        """
+        for key in keys:
+            self.objects.pop(key, None)
+
+    def flush(self) -> None:
+        """
+        Do nothing, objects are kept in memory.
+        """
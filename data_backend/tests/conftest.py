@@ -31,7 +31,18 @@ def fake_s3_bucket():
 class FakeResponse:
     def __init__(self, text, status_code):
         self.text = text
+        self.content = text.encode("utf-8")
+        self.encoding = "utf-8"
         self.status_code = status_code
+        self.headers = {}
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+    def close(self):
+        self.closed = True
 
     def raise_for_status(self):
         if self.status_code >= 400:
@@ -0,0 +1,140 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from data_backend.database.journal import JournaledRequestStore
+from data_backend.database.models import RequestDB, RequestStatusEnum
+from data_backend.database.requests import RequestStore
+from data_backend.models import APIRequest, StoredRequest
+
+
+@pytest.fixture
+def file_session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'requests.db'}")
+    SQLModel.metadata.create_all(engine)
+    return sessionmaker(bind=engine, class_=Session, expire_on_commit=False)
+
+
+def _request(n):
+    return StoredRequest(
+        request=APIRequest(url=f"test.com/{n}", type="test", tags={"n": n}),
+        name="test_name",
+        logical_date="2026-02-20",
+    )
+
+
+def _db_statuses(session_factory):
+    with session_factory() as session:
+        rows = session.exec(select(RequestDB).order_by(RequestDB.id)).all()
+        return [(r.url, r.status) for r in rows]
+
+
+def test_add_and_complete_replicate(tmp_path, file_session_factory):
+    store = JournaledRequestStore(
+        tmp_path / "journal.db", file_session_factory, replication_interval=3600
+    )
+    r1, r2 = _request(1), _request(2)
+    store.add(r1)
+    store.add(r2)
+    store.complete(r1, RequestStatusEnum.SUCCEEDED)
+
+    assert store.get_today_count("test_name") >= 1
+    store.flush()
+
+    assert store.backlog() == 0
+    assert _db_statuses(file_session_factory) == [
+        ("test.com/1", "Succeeded"),
+        ("test.com/2", "Pending"),
+    ]
+    assert [r.request for r in store.get_pending("test_name")] == [r2.request]
+    assert store.count("test_name") == 1
+    store.close()
+
+
+def test_replays_journal_after_database_outage(
+    tmp_path, file_session_factory, monkeypatch
+):
+    def unavailable(self, request):
+        raise ConnectionError("database unavailable")
+
+    with monkeypatch.context() as m:
+        m.setattr(RequestStore, "add", unavailable)
+        store = JournaledRequestStore(
+            tmp_path / "journal.db", file_session_factory, replication_interval=3600
+        )
+        r1, r2 = _request(1), _request(2)
+        store.add(r1)
+        store.add(r2)
+        store.complete(r1, RequestStatusEnum.FAILED, "HTTP Error")
+        store.close()
+
+    assert _db_statuses(file_session_factory) == []
+
+    store = JournaledRequestStore(
+        tmp_path / "journal.db", file_session_factory, replication_interval=3600
+    )
+    assert [r.request for r in store.get_pending("test_name")] == [r2.request]
+    store.close()
+
+    assert _db_statuses(file_session_factory) == [
+        ("test.com/1", "Failed"),
+        ("test.com/2", "Pending"),
+    ]
+    with file_session_factory() as session:
+        failed = session.exec(select(RequestDB).where(RequestDB.url == "test.com/1"))
+        assert failed.one().last_error == "HTTP Error"
+
+
+def test_failed_completion_is_retried_without_duplicate_insert(
+    tmp_path, file_session_factory, monkeypatch
+):
+    def unavailable(self, request, status, error=None):
+        raise ConnectionError("database unavailable")
+
+    store = JournaledRequestStore(
+        tmp_path / "journal.db", file_session_factory, replication_interval=3600
+    )
+    r1 = _request(1)
+    store.add(r1)
+    store.complete(r1, RequestStatusEnum.SUCCEEDED)
+    with monkeypatch.context() as m:
+        m.setattr(RequestStore, "complete", unavailable)
+        with pytest.raises(ConnectionError):
+            store.flush()
+
+    store.flush()
+
+    assert store.backlog() == 0
+    assert _db_statuses(file_session_factory) == [("test.com/1", "Succeeded")]
+    store.close()
+
+
+def test_get_pending_imports_database_rows(tmp_path, file_session_factory):
+    existing = _request(1)
+    RequestStore(file_session_factory).add(existing)
+    store = JournaledRequestStore(
+        tmp_path / "journal.db", file_session_factory, replication_interval=3600
+    )
+
+    [pending] = store.get_pending("test_name")
+    assert pending.request == existing.request
+    assert len(store.get_pending("test_name")) == 1
+
+    store.complete(pending, RequestStatusEnum.SUCCEEDED)
+    store.close()
+
+    assert _db_statuses(file_session_factory) == [("test.com/1", "Succeeded")]
+
+
+def test_get_pending_pages_journal(tmp_path, file_session_factory):
+    store = JournaledRequestStore(
+        tmp_path / "journal.db", file_session_factory, replication_interval=3600
+    )
+    stored = [_request(n) for n in range(3)]
+    for r in stored:
+        store.add(r)
+
+    page = store.get_pending("test_name", limit=2, exclude_ids=[stored[0].id])
+
+    assert [r.request for r in page] == [stored[1].request, stored[2].request]
+    store.close()
@@ -0,0 +1,76 @@
+import os
+from dataclasses import dataclass
+
+import pytest
+
+from data_backend.database.listener import RequestListener
+
+
+@dataclass
+class FakeNotify:
+    payload: str
+
+
+class FakeConnection:
+    """Delivers notifications through a pipe, like a psycopg2 connection."""
+
+    def __init__(self):
+        self._read, self._write = os.pipe()
+        self.notifies = []
+        self.executed = []
+        self.autocommit = False
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, sql):
+        self.executed.append(sql)
+
+    def fileno(self):
+        return self._read
+
+    def notify(self, *payloads):
+        os.write(self._write, b"\n".join(p.encode() for p in payloads) + b"\n")
+
+    def poll(self):
+        data = os.read(self._read, 4096)
+        self.notifies.extend(FakeNotify(p.decode()) for p in data.split())
+
+    def close(self):
+        self.closed = True
+        os.close(self._read)
+        os.close(self._write)
+
+
+def test_wait_collects_a_burst_of_notifications():
+    connection = FakeConnection()
+    listener = RequestListener(lambda: connection, debounce=0.01)
+    listener.listen()
+    connection.notify("daily", "daily", "backfill")
+
+    assert listener.wait(timeout=1) == {"daily", "backfill"}
+    assert connection.autocommit
+    assert connection.executed == ['LISTEN "requests_pending"']
+
+    listener.close()
+    assert connection.closed
+
+
+def test_wait_returns_empty_set_after_timeout():
+    listener = RequestListener(FakeConnection)
+    listener.listen()
+
+    assert listener.wait(timeout=0.01) == set()
+    listener.close()
+
+
+def test_wait_requires_listen():
+    with pytest.raises(RuntimeError):
+        RequestListener(FakeConnection).wait(timeout=0)
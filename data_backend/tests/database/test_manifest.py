@@ -0,0 +1,79 @@
+from data_backend.database.manifest import ManifestStore
+from data_backend.models import ManifestEntry
+
+
+def make_entry(key, **kwargs):
+    return ManifestEntry(
+        key=key,
+        name="test_name",
+        logical_date="2026-02-20",
+        type=kwargs.pop("type", "player_stats"),
+        size=10,
+        checksum="abc",
+        **kwargs,
+    )
+
+
+def test_add_and_get(sqlite_session_factory):
+    manifest = ManifestStore(sqlite_session_factory)
+    entry = make_entry(
+        "2026-02-20/1_players.json", fixture_id=1, league_id=39, date="2026-02-19"
+    )
+    manifest.add(entry)
+
+    assert manifest.get("2026-02-20/1_players.json") == entry
+    assert manifest.get("2026-02-20/missing.json") is None
+
+
+def test_add_replaces_existing_key(sqlite_session_factory):
+    manifest = ManifestStore(sqlite_session_factory)
+    manifest.add(make_entry("2026-02-20/1_players.json", etag="first"))
+    manifest.add(make_entry("2026-02-20/1_players.json", etag="second"))
+
+    result = manifest.find(type="player_stats")
+    assert len(result) == 1
+    assert result[0].etag == "second"
+
+
+def test_find(sqlite_session_factory):
+    manifest = ManifestStore(sqlite_session_factory)
+    manifest.add(make_entry("a", fixture_id=1, league_id=39, date="2026-02-19"))
+    manifest.add(
+        make_entry(
+            "b", type="match_stats", fixture_id=1, league_id=39, date="2026-02-19"
+        )
+    )
+    manifest.add(make_entry("c", fixture_id=2, league_id=140, date="2026-02-19"))
+
+    assert [e.key for e in manifest.find(fixture_id=1)] == ["a", "b"]
+    assert [e.key for e in manifest.find(league_id=140)] == ["c"]
+    assert [e.key for e in manifest.find(date="2026-02-19", type="player_stats")] == [
+        "a",
+        "c",
+    ]
+
+
+def test_find_by_month(sqlite_session_factory):
+    manifest = ManifestStore(sqlite_session_factory)
+    manifest.add(make_entry("a", league_id=39, date="2026-02-19"))
+    manifest.add(make_entry("b", league_id=39, date="2026-03-01"))
+    manifest.add(make_entry("c", league_id=140, date="2026-02-20"))
+
+    assert [e.key for e in manifest.find(league_id=39, month="2026-02")] == ["a"]
+
+
+def test_move_to_bundle(sqlite_session_factory):
+    manifest = ManifestStore(sqlite_session_factory)
+    manifest.add(make_entry("a"))
+    manifest.add(make_entry("b"))
+
+    moved = manifest.move_to_bundle(
+        "bundles/daily/2026-02-20.jsonl.gz",
+        {"a": {"offset": 0, "length": 30, "size": 12}},
+    )
+
+    assert moved == 1
+    entry = manifest.get("a")
+    assert entry.bundle == "bundles/daily/2026-02-20.jsonl.gz"
+    assert (entry.bundle_offset, entry.bundle_length) == (0, 30)
+    assert manifest.get("b").bundle is None
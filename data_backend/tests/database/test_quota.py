@@ -0,0 +1,31 @@
+from data_backend.database.quota import QuotaStore
+
+
+def test_try_acquire_counts_up_to_limit(sqlite_session_factory):
+    quota = QuotaStore(sqlite_session_factory)
+
+    acquired = [quota.try_acquire("key-a", "2026-02-20", limit=2) for _ in range(3)]
+
+    assert acquired == [True, True, False]
+    assert quota.get_used("key-a", "2026-02-20") == 2
+
+
+def test_try_acquire_counts_per_key_and_day(sqlite_session_factory):
+    quota = QuotaStore(sqlite_session_factory)
+
+    quota.try_acquire("key-a", "2026-02-20")
+    quota.try_acquire("key-a", "2026-02-21")
+    quota.try_acquire("key-b", "2026-02-20")
+
+    assert quota.get_used_many(["key-a", "key-b", "key-c"], "2026-02-20") == {
+        "key-a": 1,
+        "key-b": 1,
+        "key-c": 0,
+    }
+
+
+def test_try_acquire_refuses_zero_limit(sqlite_session_factory):
+    quota = QuotaStore(sqlite_session_factory)
+
+    assert not quota.try_acquire("key-a", "2026-02-20", limit=0)
+    assert quota.get_used("key-a", "2026-02-20") == 0
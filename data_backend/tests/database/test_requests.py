@@ -149,3 +149,131 @@ def test_complete_request(sqlite_session_factory):
     with sqlite_session_factory() as session:
         result = session.exec(select(RequestDB).where(RequestDB.id == r1.id)).one()
     assert result.status == status
+
+
+def test_count(sqlite_session_factory):
+    requests = RequestStore(sqlite_session_factory)
+    for name in ["test_name", "test_name", "other_name"]:
+        requests.add(
+            StoredRequest(
+                request=APIRequest(url="test.com", type="test"),
+                name=name,
+                logical_date="2026-02-20",
+            )
+        )
+
+    assert requests.count(name="test_name") == 2
+    assert requests.count(name="missing") == 0
+
+
+def test_failed_requests_are_retried_with_backoff(sqlite_session_factory):
+    requests = RequestStore(sqlite_session_factory, max_attempts=2, retry_backoff=0)
+    r1 = StoredRequest(
+        request=APIRequest(url="test.com", type="test"),
+        name="test_name",
+        logical_date="2026-02-20",
+    )
+    requests.add(r1)
+
+    requests.complete(r1, RequestStatusEnum.FAILED, "HTTP Error")
+
+    assert requests.get_pending("test_name") == []
+    [retry] = requests.get_pending("test_name", include_failed=True)
+    assert retry.id == r1.id
+    assert requests.get_dead_letters("test_name") == []
+
+    requests.complete(retry, RequestStatusEnum.FAILED, "Timeout")
+
+    assert requests.get_pending("test_name", include_failed=True) == []
+    [dead] = requests.get_dead_letters("test_name")
+    assert dead.id == r1.id
+    with sqlite_session_factory() as session:
+        result = session.get(RequestDB, r1.id)
+    assert result.attempts == 2
+    assert result.last_error == "Timeout"
+    assert result.next_attempt_at is None
+
+
+def test_failed_request_waits_for_backoff(sqlite_session_factory):
+    requests = RequestStore(sqlite_session_factory, retry_backoff=3600)
+    r1 = StoredRequest(
+        request=APIRequest(url="test.com", type="test"),
+        name="test_name",
+        logical_date="2026-02-20",
+    )
+    requests.add(r1)
+
+    requests.complete(r1, RequestStatusEnum.FAILED, "HTTP Error")
+
+    assert requests.get_pending("test_name", include_failed=True) == []
+    with sqlite_session_factory() as session:
+        assert session.get(RequestDB, r1.id).next_attempt_at is not None
+
+
+def test_get_pending_pages(sqlite_session_factory):
+    requests = RequestStore(sqlite_session_factory)
+    stored = [
+        StoredRequest(
+            request=APIRequest(url=f"test.com/{n}", type="test"),
+            name="test_name",
+            logical_date="2026-02-20",
+        )
+        for n in range(4)
+    ]
+    for r in stored:
+        requests.add(r)
+
+    first = requests.get_pending("test_name", limit=2)
+    second = requests.get_pending(
+        "test_name", limit=2, exclude_ids=[stored[1].id, stored[2].id]
+    )
+
+    assert [r.id for r in first] == [stored[0].id, stored[1].id]
+    assert [r.id for r in second] == [stored[0].id, stored[3].id]
+
+
+def test_get_pending_maps_rows_like_orm(sqlite_session_factory):
+    requests = RequestStore(sqlite_session_factory)
+    stored = StoredRequest(
+        request=APIRequest(
+            url="test.com",
+            type="test",
+            params={"date": "2026-02-20"},
+            payload={"ids": [1, 2]},
+            tags={"league": 39},
+        ),
+        name="test_name",
+        logical_date="2026-02-20",
+    )
+    requests.add(stored)
+
+    (pending,) = requests.get_pending("test_name")
+
+    with sqlite_session_factory() as session:
+        assert pending == StoredRequest.from_orm(session.get(RequestDB, stored.id))
+    assert pending == stored
+
+
+def test_count_by_status_includes_shards(sqlite_session_factory):
+    requests = RequestStore(sqlite_session_factory)
+    for name, logical_date in [
+        ("daily", "2026-02-20"),
+        ("daily:hash=0/2", "2026-02-20"),
+        ("daily:hash=0/2", "2026-02-20"),
+        ("daily:hash=1/2", "2026-02-19"),
+        ("daily_other", "2026-02-20"),
+    ]:
+        requests.add(
+            StoredRequest(
+                request=APIRequest(url="test.com", type="test"),
+                name=name,
+                logical_date=logical_date,
+            )
+        )
+    [r] = requests.get_pending("daily")
+    requests.complete(r, RequestStatusEnum.SUCCEEDED)
+
+    assert requests.count_by_status("daily", logical_date="2026-02-20") == {
+        "daily": {"Succeeded": 1},
+        "daily:hash=0/2": {"Pending": 2},
+    }
@@ -1,14 +1,20 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
 from sqlmodel import select
 
 from data_backend.api import APIDownloader
 from data_backend.aws import S3Client
+from data_backend.circuit_breaker import CircuitBreaker
+from data_backend.columnar import ColumnarWriter
+from data_backend.database.manifest import ManifestStore
 from data_backend.database.models import RequestDB
 from data_backend.database.requests import RequestStore
 from data_backend.handlers import ResponseHandler
 from data_backend.models import APIRequest, StoredRequest
+from data_backend.rate_limiter import RateLimiter
+from data_backend.storage import MemoryStorage
 from tests.conftest import FakeHTTPSession, FakeResponse
 
 
@@ -147,6 +153,132 @@ def test_download_adds_generated_requests(fake_s3_bucket, sqlite_session_factory
     assert results[1].logical_date == "2026-02-20"
 
 
+def test_download_parses_while_fetching_the_next_response(sqlite_session_factory):
+    events = []
+
+    class RecordingSession(FakeHTTPSession):
+        def get(self, url, *args, **kwargs):
+            events.append(f"get {url}")
+            return super().get(url, *args, **kwargs)
+
+    class RecordingStorage(MemoryStorage):
+        def save_json(self, data, key):
+            events.append(f"save {key}")
+            return super().save_json(data, key)
+
+    def handle(path):
+        return lambda body: ({"message": body}, path)
+
+    def generate_requests(_body):
+        return [APIRequest(url="http://example.com/c", type="c")]
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        handler = (
+            ResponseHandler(executor=executor)
+            .add_parser("a", handle("a.json"))
+            .add_parser("b", handle("b.json"))
+            .add_parser("c", handle("c.json"))
+            .add_request_generator("b", generate_requests)
+        )
+        downloader = APIDownloader(
+            name="test_name",
+            logical_date="2026-02-20",
+            http_session=RecordingSession(FakeResponse("OK", 200)),
+            response_handler=handler,
+            request_store=RequestStore(sqlite_session_factory),
+            storage_client=RecordingStorage(),
+        )
+        downloader.add(APIRequest(url="http://example.com/a", type="a"))
+        downloader.add(APIRequest(url="http://example.com/b", type="b"))
+        downloader.download()
+
+    assert events == [
+        "get http://example.com/a",
+        "get http://example.com/b",
+        "save 2026-02-20/a.json",
+        "save 2026-02-20/b.json",
+        "get http://example.com/c",
+        "save 2026-02-20/c.json",
+    ]
+    with sqlite_session_factory() as session:
+        statuses = session.exec(select(RequestDB.status)).all()
+    assert statuses == ["Succeeded"] * 3
+
+
+def test_add_stored_adds_requests_generated_from_stored_response(
+    sqlite_session_factory,
+):
+    storage = MemoryStorage()
+    storage.save_json({"message": "seed"}, "2026-02-20/seed.json")
+    session = FakeHTTPSession(FakeResponse("OK", 200))
+    urls = []
+    session.get = lambda url, *args, **kwargs: urls.append(url) or session.response
+
+    def generate_requests(body):
+        assert json.loads(body) == {"message": "seed"}
+        return [APIRequest(url="http://example.com/follow-up", type="follow_up")]
+
+    handler = (
+        ResponseHandler()
+        .add_parser("seed", lambda body: ({}, "seed.json"))
+        .add_parser("follow_up", lambda body: ({"message": body}, "follow_up.json"))
+        .add_request_generator("seed", generate_requests)
+    )
+    downloader = APIDownloader(
+        name="test_name",
+        logical_date="2026-02-20",
+        http_session=session,
+        response_handler=handler,
+        request_store=RequestStore(sqlite_session_factory),
+        storage_client=storage,
+    )
+
+    downloader.add_stored(
+        APIRequest(url="http://example.com/seed", type="seed"), "2026-02-20/seed.json"
+    )
+    downloader.download()
+
+    assert urls == ["http://example.com/follow-up"]
+    with sqlite_session_factory() as db_session:
+        assert db_session.exec(select(RequestDB.url)).all() == [
+            "http://example.com/follow-up"
+        ]
+
+
+def test_add_stored_downloads_request_without_stored_response(
+    fake_s3_bucket, sqlite_session_factory
+):
+    session = FakeHTTPSession(FakeResponse("OK", 200))
+    urls = []
+    session.get = lambda url, *args, **kwargs: urls.append(url) or session.response
+    handler = (
+        ResponseHandler()
+        .add_parser("seed", lambda body: ({}, "seed.json"))
+        .add_parser("follow_up", lambda body: ({"message": body}, "follow_up.json"))
+        .add_request_generator(
+            "seed",
+            lambda body: [
+                APIRequest(url="http://example.com/follow-up", type="follow_up")
+            ],
+        )
+    )
+    downloader = APIDownloader(
+        name="test_name",
+        logical_date="2026-02-20",
+        http_session=session,
+        response_handler=handler,
+        request_store=RequestStore(sqlite_session_factory),
+        storage_client=S3Client(bucket_name=fake_s3_bucket),
+    )
+
+    downloader.add_stored(
+        APIRequest(url="http://example.com/seed", type="seed"), "2026-02-20/seed.json"
+    )
+    downloader.download()
+
+    assert urls == ["http://example.com/seed", "http://example.com/follow-up"]
+
+
 def test_download_requester_error(fake_s3_bucket, sqlite_session_factory):
     fake_session = FakeHTTPSession(FakeResponse("NOT OK", 404))
 
@@ -190,3 +322,371 @@ def test_download_limit_reached(fake_s3_bucket, sqlite_session_factory):
         result = session.exec(select(RequestDB).where(RequestDB.url == req.url)).one()
 
     assert result.status == "Pending"
+
+
+def test_daily_limit_is_shared_by_downloaders_of_a_name(sqlite_session_factory):
+    def make_downloader():
+        return APIDownloader(
+            name="test_name",
+            logical_date="2026-02-20",
+            http_session=FakeHTTPSession(FakeResponse('{"ok": 1}', 200)),
+            request_limit=2,
+            response_handler=ResponseHandler().add_parser(
+                "test", lambda body: (body, "response.json")
+            ),
+            request_store=RequestStore(sqlite_session_factory),
+            storage_client=MemoryStorage(),
+        )
+
+    first = make_downloader()
+    for n in range(3):
+        first.add(APIRequest(url=f"http://example.com/{n}", type="test"))
+    first.download()
+    second = make_downloader()
+    second.download_backlog()
+
+    assert first.requester.request_count == 2
+    assert second.requester.request_count == 0
+    assert len(RequestStore(sqlite_session_factory).get_pending("test_name")) == 1
+
+
+def test_daily_limit_is_shared_through_quota_key(sqlite_session_factory):
+    def make_downloader(name):
+        return APIDownloader(
+            name=name,
+            logical_date="2026-02-20",
+            http_session=FakeHTTPSession(FakeResponse('{"ok": 1}', 200)),
+            request_limit=2,
+            response_handler=ResponseHandler().add_parser(
+                "test", lambda body: (body, "response.json")
+            ),
+            request_store=RequestStore(sqlite_session_factory),
+            storage_client=MemoryStorage(),
+            quota_key="subscription",
+        )
+
+    daily = make_downloader("daily")
+    daily.add(APIRequest(url="http://example.com/daily", type="test"))
+    daily.download()
+    backfill = make_downloader("backfill")
+    for n in range(2):
+        backfill.add(APIRequest(url=f"http://example.com/{n}", type="test"))
+    backfill.download()
+
+    assert backfill.requester.request_count == 1
+    assert len(RequestStore(sqlite_session_factory).get_pending("backfill")) == 1
+
+
+def test_download_stops_when_circuit_opens(fake_s3_bucket, sqlite_session_factory):
+    fake_session = FakeHTTPSession(FakeResponse("Unavailable", 503))
+
+    downloader = APIDownloader(
+        name="test_name",
+        logical_date="2026-02-20",
+        http_session=fake_session,
+        response_handler=ResponseHandler(),
+        request_store=RequestStore(sqlite_session_factory),
+        storage_client=S3Client(bucket_name=fake_s3_bucket),
+        circuit_breaker=lambda: CircuitBreaker(failure_threshold=2),
+    )
+
+    for n in range(4):
+        downloader.add(APIRequest(url=f"http://example.com/{n}", type="test"))
+    downloader.download()
+
+    with sqlite_session_factory() as session:
+        statuses = session.exec(select(RequestDB.status).order_by(RequestDB.id)).all()
+
+    assert statuses == ["Failed", "Pending", "Pending", "Pending"]
+    assert downloader.requester.request_count == 2
+
+
+def test_download_writes_manifest(fake_s3_bucket, sqlite_session_factory):
+    fake_session = FakeHTTPSession(FakeResponse("OK", 200))
+    manifest = ManifestStore(sqlite_session_factory)
+
+    def handle(response):
+        return {"message": response}, "1_players.json"
+
+    downloader = APIDownloader(
+        name="test_name",
+        logical_date="2026-02-20",
+        http_session=fake_session,
+        response_handler=ResponseHandler().add_parser("player_stats", handle),
+        request_store=RequestStore(sqlite_session_factory),
+        storage_client=S3Client(bucket_name=fake_s3_bucket),
+        manifest_store=manifest,
+    )
+
+    downloader.add(
+        APIRequest(
+            url="http://example.com",
+            type="player_stats",
+            tags={"fixture_id": 1, "league_id": 39, "date": "2026-02-19"},
+        )
+    )
+    downloader.download()
+
+    entry = manifest.get("2026-02-20/1_players.json")
+    assert entry is not None
+    assert entry.type == "player_stats"
+    assert entry.fixture_id == 1
+    assert entry.league_id == 39
+    assert entry.date == "2026-02-19"
+    assert entry.size == len(json.dumps({"message": "OK"}))
+    assert entry.etag
+
+
+def test_download_writes_columnar_output(fake_s3_bucket, sqlite_session_factory):
+    fake_session = FakeHTTPSession(FakeResponse("OK", 200))
+    storage = S3Client(bucket_name=fake_s3_bucket)
+
+    def handle(response):
+        return {"message": response}, "response.json"
+
+    def flatten(data):
+        return {"messages": [{"message": data["message"]}]}
+
+    downloader = APIDownloader(
+        name="test_name",
+        logical_date="2026-02-20",
+        http_session=fake_session,
+        response_handler=(
+            ResponseHandler().add_parser("test", handle).add_flattener("test", flatten)
+        ),
+        request_store=RequestStore(sqlite_session_factory),
+        storage_client=storage,
+        columnar_writer=ColumnarWriter(storage, {"messages": {"message": "string"}}),
+    )
+
+    downloader.add(
+        APIRequest(url="http://example.com", type="test", tags={"date": "2026-02-19"})
+    )
+    downloader.download()
+
+    s3 = boto3.client("s3", region_name="us-east-1")
+    objects = s3.list_objects_v2(Bucket=fake_s3_bucket, Prefix="messages/")
+    assert len(objects["Contents"]) == 1
+    assert objects["Contents"][0]["Key"].startswith("messages/data/date=2026-02-19/")
+
+
+def test_download_streams_registered_types(fake_s3_bucket, sqlite_session_factory):
+    body = json.dumps({"response": [{"id": 1}, {"id": 2}]})
+    fake_session = FakeHTTPSession(FakeResponse(body, 200))
+    manifest = ManifestStore(sqlite_session_factory)
+
+    def generate(items):
+        return [
+            APIRequest(url=f"http://example.com/{item['id']}", type="item")
+            for item in items
+        ]
+
+    handler = (
+        ResponseHandler()
+        .add_stream_parser("season", lambda request: "season.json")
+        .add_item_generator("season", generate)
+        .add_parser("item", lambda body: ({}, "item.json"))
+    )
+    downloader = APIDownloader(
+        name="test_name",
+        logical_date="2026-02-20",
+        http_session=fake_session,
+        response_handler=handler,
+        request_store=RequestStore(sqlite_session_factory),
+        storage_client=S3Client(bucket_name=fake_s3_bucket),
+        manifest_store=manifest,
+    )
+
+    downloader.add(APIRequest(url="http://example.com", type="season"))
+    downloader.download()
+
+    s3 = boto3.client("s3", region_name="us-east-1")
+    obj = s3.get_object(Bucket=fake_s3_bucket, Key="2026-02-20/season.json")
+    assert obj["Body"].read().decode("utf-8") == body
+    assert manifest.get("2026-02-20/season.json").size == len(body)
+    with sqlite_session_factory() as session:
+        urls = session.exec(select(RequestDB.url).where(RequestDB.type == "item")).all()
+    assert urls == ["http://example.com/1", "http://example.com/2"]
+
+
+def test_download_stores_raw_body(fake_s3_bucket, sqlite_session_factory):
+    body = '{"message":  "OK"}'
+    fake_session = FakeHTTPSession(FakeResponse(body, 200))
+
+    handler = ResponseHandler().add_parser(
+        "test", lambda body: (json.loads(body), "raw.json"), raw=True
+    )
+    downloader = APIDownloader(
+        name="test_name",
+        logical_date="2026-02-20",
+        http_session=fake_session,
+        response_handler=handler,
+        request_store=RequestStore(sqlite_session_factory),
+        storage_client=S3Client(bucket_name=fake_s3_bucket),
+    )
+
+    downloader.add(APIRequest(url="http://example.com", type="test"))
+    downloader.download()
+
+    s3 = boto3.client("s3", region_name="us-east-1")
+    obj = s3.get_object(Bucket=fake_s3_bucket, Key="2026-02-20/raw.json")
+    assert obj["Body"].read().decode("utf-8") == body
+
+
+def test_download_spills_requests_above_high_watermark(
+    fake_s3_bucket, sqlite_session_factory
+):
+    fake_session = FakeHTTPSession(FakeResponse("OK", 200))
+    requests = RequestStore(sqlite_session_factory)
+    queue_lengths = []
+
+    def handle(response):
+        queue_lengths.append(len(downloader._queue))
+        return {"message": response}, "response.json"
+
+    def generate_requests(_body):
+        return [
+            APIRequest(url=f"http://example.com/{n}", type="follow_up")
+            for n in range(10)
+        ]
+
+    handler = (
+        ResponseHandler()
+        .add_parser("seed", handle)
+        .add_parser("follow_up", handle)
+        .add_request_generator("seed", generate_requests)
+    )
+    downloader = APIDownloader(
+        name="test_name",
+        logical_date="2026-02-20",
+        http_session=fake_session,
+        response_handler=handler,
+        request_store=requests,
+        storage_client=S3Client(bucket_name=fake_s3_bucket),
+        queue_high_watermark=3,
+        queue_low_watermark=1,
+    )
+
+    downloader.add(APIRequest(url="http://example.com/seed", type="seed"))
+    downloader.download()
+
+    with sqlite_session_factory() as session:
+        results = session.exec(select(RequestDB).order_by(RequestDB.id)).all()
+
+    assert len(results) == 11
+    assert {r.status for r in results} == {"Succeeded"}
+    assert len(queue_lengths) == 11
+    assert max(queue_lengths) <= 3
+
+
+def test_download_backlog_pages_pending_requests(
+    fake_s3_bucket, sqlite_session_factory
+):
+    fake_session = FakeHTTPSession(FakeResponse("OK", 200))
+    requests = RequestStore(sqlite_session_factory)
+    handler = ResponseHandler().add_parser(
+        "test", lambda response: ({"message": response}, "response.json")
+    )
+    for n in range(5):
+        requests.add(
+            StoredRequest(
+                request=APIRequest(url=f"http://example.com/{n}", type="test"),
+                name="test_name",
+                logical_date="2026-02-20",
+            )
+        )
+    downloader = APIDownloader(
+        name="test_name",
+        logical_date="2026-02-20",
+        http_session=fake_session,
+        response_handler=handler,
+        request_store=requests,
+        storage_client=S3Client(bucket_name=fake_s3_bucket),
+        queue_high_watermark=2,
+    )
+
+    downloader.download_backlog()
+
+    assert requests.get_pending("test_name") == []
+    assert requests.get_today_count("test_name") == 5
+
+
+def test_download_with_executor_and_watermarks_fetches_each_request_once(
+    sqlite_session_factory,
+):
+    fetched = []
+
+    class RecordingSession(FakeHTTPSession):
+        def get(self, url, *args, **kwargs):
+            fetched.append(url)
+            return super().get(url, *args, **kwargs)
+
+    requests = RequestStore(sqlite_session_factory)
+    for n in range(6):
+        requests.add(
+            StoredRequest(
+                request=APIRequest(url=f"http://example.com/{n}", type="test"),
+                name="test_name",
+                logical_date="2026-02-20",
+            )
+        )
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        handler = ResponseHandler(executor=executor).add_parser(
+            "test", lambda response: ({"message": response}, "response.json")
+        )
+        downloader = APIDownloader(
+            name="test_name",
+            logical_date="2026-02-20",
+            http_session=RecordingSession(FakeResponse("OK", 200)),
+            response_handler=handler,
+            request_store=requests,
+            storage_client=MemoryStorage(),
+            queue_high_watermark=2,
+            queue_low_watermark=0,
+        )
+        downloader.download_backlog()
+
+    assert fetched == [f"http://example.com/{n}" for n in range(6)]
+    assert requests.get_pending("test_name") == []
+
+
+def test_download_to_memory_storage(sqlite_session_factory):
+    storage = MemoryStorage()
+    handler = ResponseHandler().add_parser(
+        "test", lambda response: ({"message": response}, "response.json")
+    )
+    downloader = APIDownloader(
+        name="test_name",
+        logical_date="2026-02-20",
+        http_session=FakeHTTPSession(FakeResponse("OK", 200)),
+        response_handler=handler,
+        request_store=RequestStore(sqlite_session_factory),
+        storage_client=storage,
+    )
+
+    downloader.add(APIRequest(url="http://example.com", type="test"))
+    downloader.download()
+
+    assert json.loads(storage.read_bytes("2026-02-20/response.json")) == {
+        "message": "OK"
+    }
+
+
+def test_download_defers_instead_of_waiting(fake_s3_bucket, sqlite_session_factory):
+    requests = RequestStore(sqlite_session_factory)
+    downloader = APIDownloader(
+        name="test_name",
+        logical_date="2026-02-20",
+        http_session=FakeHTTPSession(FakeResponse("OK", 200)),
+        response_handler=ResponseHandler(),
+        rate_limit=RateLimiter(1, "hour"),
+        request_store=requests,
+        storage_client=S3Client(bucket_name=fake_s3_bucket),
+        max_wait=60,
+    )
+
+    downloader.add(APIRequest(url="http://example.com", type="test"))
+    downloader.download()
+
+    assert downloader.resume_at is not None
+    assert len(requests.get_pending("test_name")) == 1
@@ -1,8 +1,16 @@
+import hashlib
+import io
 import json
 
 import boto3
+from botocore.config import Config
 
-from data_backend.aws import S3Client
+from data_backend.aws import (
+    DEFAULT_CONFIG,
+    POINTER_CONTENT_TYPE,
+    S3Client,
+    get_s3_client,
+)
 
 
 def test_save_json_to_s3(fake_s3_bucket):
@@ -10,7 +18,7 @@ def test_save_json_to_s3(fake_s3_bucket):
     test_key = "test.json"
     test_data = {"foo": "bar", "number": 123}
 
-    client.save_json(test_data, test_key)
+    stored = client.save_json(test_data, test_key)
 
     s3 = boto3.client("s3", region_name="us-east-1")
     obj = s3.get_object(Bucket=fake_s3_bucket, Key=test_key)
@@ -19,3 +27,133 @@ def test_save_json_to_s3(fake_s3_bucket):
 
     assert json.loads(body) == test_data
     assert content_type == "application/json"
+    assert stored.key == test_key
+    assert stored.size == len(body)
+    assert stored.checksum == hashlib.sha256(body.encode("utf-8")).hexdigest()
+    assert stored.etag == obj["ETag"].strip('"')
+
+
+def test_list_read_and_delete(fake_s3_bucket):
+    client = S3Client(fake_s3_bucket)
+    client.save_bytes(b"0123456789", "a/1.bin")
+    client.save_bytes(b"abc", "a/2.bin")
+    client.save_bytes(b"xyz", "b/1.bin")
+
+    assert client.list_keys("a/") == ["a/1.bin", "a/2.bin"]
+    assert client.read_bytes("a/1.bin") == b"0123456789"
+    assert client.read_bytes("a/1.bin", byte_range=(2, 3)) == b"234"
+
+    client.delete(["a/1.bin", "b/1.bin"])
+    assert client.list_keys() == ["a/2.bin"]
+
+
+def test_save_json_content_addressed(fake_s3_bucket):
+    client = S3Client(fake_s3_bucket, content_addressed=True)
+    test_data = {"foo": "bar"}
+    body = json.dumps(test_data).encode("utf-8")
+    checksum = hashlib.sha256(body).hexdigest()
+
+    first = client.save_json(test_data, "2026-02-20/1_players.json")
+    second = client.save_json(test_data, "2026-02-21/1_players.json")
+
+    assert first.checksum == second.checksum == checksum
+    assert first.etag == second.etag
+    assert client.list_keys("objects/") == [f"objects/{checksum}"]
+
+    s3 = boto3.client("s3", region_name="us-east-1")
+    pointer = s3.get_object(Bucket=fake_s3_bucket, Key="2026-02-21/1_players.json")
+    assert pointer["ContentType"] == POINTER_CONTENT_TYPE
+    assert json.loads(pointer["Body"].read())["object"] == f"objects/{checksum}"
+    assert json.loads(client.read_bytes("2026-02-21/1_players.json")) == test_data
+
+
+def test_save_json_content_addressed_skips_existing_object(fake_s3_bucket):
+    test_data = {"foo": "bar"}
+    S3Client(fake_s3_bucket, content_addressed=True).save_json(test_data, "a.json")
+
+    client = S3Client(fake_s3_bucket, content_addressed=True)
+    uploaded = []
+
+    def record(params, **kwargs):
+        uploaded.append(params)
+
+    # The boto3 client is shared within the process, so the handler must not
+    # outlive the test.
+    events = client.s3_client.meta.events
+    events.register("provide-client-params.s3.PutObject", record)
+    try:
+        client.save_json(test_data, "b.json")
+    finally:
+        events.unregister("provide-client-params.s3.PutObject", record)
+
+    assert [p["Key"] for p in uploaded] == ["b.json"]
+
+
+def test_save_json_content_addressed_forgets_least_recent_objects(
+    fake_s3_bucket, monkeypatch
+):
+    client = S3Client(fake_s3_bucket, content_addressed=True, known_objects=1)
+    checked = []
+    head_etag = client._head_etag
+    monkeypatch.setattr(
+        client, "_head_etag", lambda key: checked.append(key) or head_etag(key)
+    )
+
+    for n, data in enumerate([{"a": 1}, {"a": 1}, {"b": 2}, {"a": 1}]):
+        client.save_json(data, f"{n}.json")
+
+    assert len(checked) == 3
+    assert len(client._known_etags) == 1
+
+
+def test_save_stream(fake_s3_bucket):
+    client = S3Client(fake_s3_bucket)
+    body = b'{"response": [1, 2, 3]}'
+
+    stored = client.save_stream(io.BytesIO(body), "stream.json")
+
+    s3 = boto3.client("s3", region_name="us-east-1")
+    obj = s3.get_object(Bucket=fake_s3_bucket, Key="stream.json")
+    assert obj["Body"].read() == body
+    assert obj["ContentType"] == "application/json"
+    assert stored.size == len(body)
+    assert stored.checksum == hashlib.sha256(body).hexdigest()
+    assert stored.etag == obj["ETag"].strip('"')
+
+
+def test_save_stream_content_addressed(fake_s3_bucket):
+    client = S3Client(fake_s3_bucket, content_addressed=True)
+    body = b'{"response": [1, 2, 3]}'
+
+    stored = client.save_stream(io.BytesIO(body), "stream.json")
+
+    checksum = hashlib.sha256(body).hexdigest()
+    assert stored.checksum == checksum
+    assert client.read_bytes("stream.json") == body
+    assert client.list_keys("objects/") == [f"objects/{checksum}"]
+
+
+def test_clients_are_shared_per_endpoint_and_config(fake_s3_bucket):
+    first = S3Client(fake_s3_bucket)
+    second = S3Client(fake_s3_bucket, content_addressed=True)
+    other = S3Client(fake_s3_bucket, config=Config(max_pool_connections=4))
+
+    assert first.s3_client is second.s3_client
+    assert first.s3_client is get_s3_client(None, DEFAULT_CONFIG)
+    assert other.s3_client is not first.s3_client
+    assert other.max_workers == 4
+    assert first.s3_client.meta.config.retries["mode"] == "adaptive"
+
+
+def test_save_many_and_exists_many(fake_s3_bucket):
+    client = S3Client(fake_s3_bucket)
+    items = [({"n": n}, f"batch/{n}.json") for n in range(20)]
+
+    stored = client.save_many(items)
+
+    assert [s.key for s in stored] == [key for _, key in items]
+    assert client.exists_many(["batch/3.json", "batch/missing.json"]) == {
+        "batch/3.json": True,
+        "batch/missing.json": False,
+    }
+    assert json.loads(client.read_bytes("batch/7.json")) == {"n": 7}
@@ -0,0 +1,50 @@
+from data_backend.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, clock=FakeClock())
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_opens_on_error_rate():
+    breaker = CircuitBreaker(failure_threshold=10, error_rate=0.5, window=4)
+
+    for _ in range(2):
+        breaker.record_success()
+        breaker.record_failure()
+
+    assert breaker.state == "open"
+
+
+def test_half_open_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 60
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 120
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
@@ -0,0 +1,59 @@
+import io
+
+import boto3
+import pyarrow.parquet as pq
+import pytest
+
+from data_backend.aws import S3Client
+from data_backend.columnar import ColumnarWriter
+
+SCHEMAS = {"players": {"player_id": "int64", "name": "string", "rating": "float64"}}
+
+
+def read_parquet(bucket, key):
+    s3 = boto3.client("s3", region_name="us-east-1")
+    body = s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+    return pq.read_table(io.BytesIO(body))
+
+
+def test_flush_writes_partitioned_parquet(fake_s3_bucket):
+    writer = ColumnarWriter(S3Client(fake_s3_bucket), SCHEMAS)
+    writer.write(
+        "players", [{"player_id": 1, "name": "A", "rating": 7.1}], "2026-02-19"
+    )
+    writer.write("players", [{"player_id": 2, "name": "B"}], "2026-02-19")
+    writer.write("players", [{"player_id": 3, "name": "C"}], "2026-02-20")
+
+    stored = writer.flush()
+
+    assert len(stored) == 2
+    assert stored[0].key.startswith("players/data/date=2026-02-19/")
+    assert stored[0].key.endswith(".parquet")
+    assert stored[1].key.startswith("players/data/date=2026-02-20/")
+
+    table = read_parquet(fake_s3_bucket, stored[0].key)
+    assert table.schema.field("player_id").type == "int64"
+    assert table.to_pylist() == [
+        {"player_id": 1, "name": "A", "rating": 7.1},
+        {"player_id": 2, "name": "B", "rating": None},
+    ]
+    assert writer.flush() == []
+
+
+def test_write_flushes_full_buffer(fake_s3_bucket):
+    writer = ColumnarWriter(S3Client(fake_s3_bucket), SCHEMAS, row_group_size=2)
+    writer.write("players", [{"player_id": 1}], "2026-02-19")
+    writer.write("players", [{"player_id": 2}, {"player_id": 3}], "2026-02-19")
+
+    s3 = boto3.client("s3", region_name="us-east-1")
+    objects = s3.list_objects_v2(Bucket=fake_s3_bucket)["Contents"]
+    assert len(objects) == 1
+    assert read_parquet(fake_s3_bucket, objects[0]["Key"]).num_rows == 3
+    assert writer.flush() == []
+
+
+def test_write_unknown_table(fake_s3_bucket):
+    writer = ColumnarWriter(S3Client(fake_s3_bucket), SCHEMAS)
+
+    with pytest.raises(ValueError, match="No schema registered"):
+        writer.write("teams", [{"team_id": 1}], "2026-02-19")
@@ -0,0 +1,85 @@
+import gzip
+import json
+
+import boto3
+import pytest
+
+from data_backend.aws import S3Client
+from data_backend.compaction import BundleReader, compact
+from data_backend.database.manifest import ManifestStore
+from data_backend.models import ManifestEntry
+
+
+@pytest.fixture
+def storage(fake_s3_bucket):
+    client = S3Client(fake_s3_bucket)
+    client.save_json({"fixture": 1}, "2026-02-20/1_players.json")
+    client.save_json({"fixture": 2}, "2026-02-20/2_players.json")
+    return client
+
+
+def test_compact_writes_bundle_and_index(storage):
+    keys = ["2026-02-20/1_players.json", "2026-02-20/2_players.json"]
+    stored = compact(storage, keys, "bundles/daily/2026-02-20")
+
+    assert stored.key == "bundles/daily/2026-02-20.jsonl.gz"
+    lines = gzip.decompress(storage.read_bytes(stored.key)).splitlines()
+    assert [json.loads(line) for line in lines] == [{"fixture": 1}, {"fixture": 2}]
+
+    index = json.loads(storage.read_bytes("bundles/daily/2026-02-20.index.json"))
+    assert index["bundle"] == stored.key
+    assert list(index["documents"]) == keys
+    assert storage.list_keys("2026-02-20/") == keys
+
+
+def test_bundle_reader_fetches_single_document(storage):
+    keys = ["2026-02-20/1_players.json", "2026-02-20/2_players.json"]
+    compact(storage, keys, "bundles/daily/2026-02-20")
+
+    reader = BundleReader(storage, "bundles/daily/2026-02-20")
+
+    assert reader.keys() == keys
+    assert reader.get("2026-02-20/2_players.json") == {"fixture": 2}
+    assert reader.get("2026-02-20/1_players.json") == {"fixture": 1}
+    with pytest.raises(KeyError):
+        reader.get("2026-02-20/3_players.json")
+
+
+def test_compact_delete_sources(storage, fake_s3_bucket):
+    keys = ["2026-02-20/1_players.json", "2026-02-20/2_players.json"]
+    compact(storage, keys, "bundles/daily/2026-02-20", delete_sources=True)
+
+    s3 = boto3.client("s3", region_name="us-east-1")
+    remaining = s3.list_objects_v2(Bucket=fake_s3_bucket, Prefix="2026-02-20/")
+    assert "Contents" not in remaining
+
+
+def test_compact_delete_sources_moves_manifest_entries(storage, sqlite_session_factory):
+    keys = ["2026-02-20/1_players.json", "2026-02-20/2_players.json"]
+    manifest = ManifestStore(sqlite_session_factory)
+    for key in keys:
+        manifest.add(
+            ManifestEntry(
+                key=key,
+                name="daily",
+                logical_date="2026-02-20",
+                type="player_stats",
+                size=14,
+                checksum="",
+            )
+        )
+
+    stored = compact(
+        storage,
+        keys,
+        "bundles/daily/2026-02-20",
+        delete_sources=True,
+        manifest_store=manifest,
+    )
+
+    entry = manifest.get("2026-02-20/2_players.json")
+    assert entry.bundle == stored.key
+    member = storage.read_bytes(
+        entry.bundle, byte_range=(entry.bundle_offset, entry.bundle_length)
+    )
+    assert json.loads(gzip.decompress(member)) == {"fixture": 2}
@@ -1,7 +1,12 @@
+import io
+import json
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
 import pytest
 
 from data_backend.handlers import ResponseHandler
-from data_backend.models import APIRequest, APIResponse
+from data_backend.models import APIRequest, APIResponse, ParsedDocument
 
 
 def test_add():
@@ -60,3 +65,175 @@ def test_handle_no_parser():
                 request=APIRequest(type="sample_type", url="http://example.com"),
             )
         )
+
+
+def test_flatten():
+    def sample_flattener(data):
+        return {"table": [{"value": data["value"]}]}
+
+    handler = ResponseHandler().add_flattener("sample_type", sample_flattener)
+
+    assert handler.flatten("sample_type", {"value": 1}) == {"table": [{"value": 1}]}
+    assert handler.flatten("other_type", {"value": 1}) == {}
+
+
+def test_handle_all_wraps_parsed_response():
+    handler = ResponseHandler().add_parser(
+        "sample_type", lambda body: ({"parsed": True}, "path.json")
+    )
+
+    documents = handler.handle_all(
+        APIResponse(
+            body="{}",
+            request=APIRequest(
+                type="sample_type", url="http://example.com", tags={"date": "d"}
+            ),
+        )
+    )
+
+    assert documents == [
+        ParsedDocument(
+            type="sample_type",
+            data={"parsed": True},
+            path="path.json",
+            tags={"date": "d"},
+        )
+    ]
+
+
+def test_handle_all_uses_splitter():
+    def sample_splitter(body):
+        return [
+            ParsedDocument(type="part", data={"id": i}, path=f"{i}.json")
+            for i in range(2)
+        ]
+
+    def sample_generator(body):
+        return [APIRequest(url="http://example.com/new", type="sample_type2")]
+
+    handler = (
+        ResponseHandler()
+        .add_splitter("combined", sample_splitter)
+        .add_request_generator("combined", sample_generator)
+    )
+
+    documents = handler.handle_all(
+        APIResponse(
+            body="{}", request=APIRequest(type="combined", url="http://example.com")
+        )
+    )
+
+    assert [d.path for d in documents] == ["0.json", "1.json"]
+    assert len(list(handler.collect_new_requests())) == 1
+
+
+def test_handle_stream_runs_item_generators():
+    def sample_generator(items):
+        return [
+            APIRequest(url=f"http://example.com/{item['id']}", type="item")
+            for item in items
+        ]
+
+    handler = (
+        ResponseHandler()
+        .add_stream_parser("season", lambda request: f"{request.params['s']}.json")
+        .add_item_generator("season", sample_generator)
+    )
+    stream = io.BytesIO(b'{"get": "x", "response": [{"id": 1}, {"id": 2}]}')
+
+    document = handler.handle_stream(
+        APIResponse(
+            body="",
+            request=APIRequest(type="season", url="http://x", params={"s": "2024"}),
+            stream=stream,
+        )
+    )
+
+    assert handler.streams("season")
+    assert not handler.streams("other")
+    assert document.path == "2024.json"
+    assert document.data is None
+    assert stream.tell() == 0
+    assert [r.url for r in handler.collect_new_requests()] == [
+        "http://example.com/1",
+        "http://example.com/2",
+    ]
+
+
+def test_handle_stream_not_registered():
+    with pytest.raises(ValueError):
+        ResponseHandler().handle_stream(
+            APIResponse(
+                body="",
+                request=APIRequest(type="season", url="http://x"),
+                stream=io.BytesIO(b"{}"),
+            )
+        )
+
+
+def test_raw_parser_receives_bytes():
+    received = []
+
+    def sample_parser(body):
+        received.append(body)
+        return {"parsed": True}, "path.json"
+
+    handler = (
+        ResponseHandler()
+        .add_parser("sample_type", sample_parser, raw=True)
+        .add_request_generator("sample_type", received.append)
+    )
+    response = APIResponse(
+        content=b'{"data": "value"}',
+        request=APIRequest(type="sample_type", url="http://example.com"),
+    )
+
+    [document] = handler.handle_all(response)
+
+    assert received == [response.content, response.content]
+    assert document.raw is response.content
+    assert response._body is None
+
+
+def parse_json(body):
+    data = json.loads(body)
+    return data, f"{data['id']}.json"
+
+
+def split_items(body):
+    return [
+        ParsedDocument(type="item", data=item, path=f"{item['id']}.json")
+        for item in json.loads(body)["items"]
+    ]
+
+
+def generate_follow_up(body):
+    return [APIRequest(url="http://example.com/follow-up", type="follow_up")]
+
+
+def test_handle_in_process_pool():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        handler = (
+            ResponseHandler(executor=executor)
+            .add_parser("single", parse_json, raw=True)
+            .add_splitter("batch", split_items)
+            .add_request_generator("single", generate_follow_up)
+            .add_request_generator("batch", generate_follow_up)
+        )
+        single = APIResponse(
+            content=b'{"id": 1}', request=APIRequest(url="test.com", type="single")
+        )
+        batch = APIResponse(
+            body='{"items": [{"id": 2}, {"id": 3}]}',
+            request=APIRequest(url="test.com", type="batch"),
+        )
+
+        [document] = handler.handle_all(single)
+        documents = handler.handle_all(batch)
+
+    assert document.data == {"id": 1}
+    assert document.path == "1.json"
+    assert document.raw == b'{"id": 1}'
+    assert [d.path for d in documents] == ["2.json", "3.json"]
+    assert [r.type for r in handler.collect_new_requests()] == ["follow_up"] * 2
+    assert pickle.loads(pickle.dumps(handler)).executor is None
@@ -0,0 +1,72 @@
+import pytest
+
+from data_backend.database.quota import QuotaStore
+from data_backend.exceptions import RequestLimitReachedException
+from data_backend.keys import APIKey, KeyPool
+from data_backend.quota import quota_day
+
+
+def make_keys(*limits):
+    return [
+        APIKey(f"key-{i}", {"x-api-key": f"secret-{i}"}, daily_limit=limit)
+        for i, limit in enumerate(limits)
+    ]
+
+
+def test_from_secret_hides_secret_in_name():
+    key = APIKey.from_secret("secret", "x-api-key", daily_limit=100)
+
+    assert key.name.startswith("key-")
+    assert "secret" not in key.name
+    assert key.headers == {"x-api-key": "secret"}
+
+
+def test_least_loaded_spreads_requests(sqlite_session_factory):
+    pool = KeyPool(make_keys(10, 10), quota_store=QuotaStore(sqlite_session_factory))
+
+    used = []
+    for _ in range(4):
+        key = pool.select()
+        assert pool.reserve(key)
+        used.append(key.name)
+
+    assert sorted(used) == ["key-0", "key-0", "key-1", "key-1"]
+    assert QuotaStore(sqlite_session_factory).get_used("key-0", quota_day()) == 2
+
+
+def test_round_robin_skips_used_up_keys():
+    pool = KeyPool(make_keys(1, 5, 5), strategy="round_robin")
+
+    assert pool.reserve(pool.select())
+    assert [pool.select().name for _ in range(3)] == ["key-1", "key-2", "key-0"]
+    assert not pool.reserve(pool.keys[0])
+    assert [pool.select().name for _ in range(3)] == ["key-1", "key-2", "key-1"]
+
+
+def test_select_raises_when_all_keys_are_used_up():
+    pool = KeyPool(make_keys(0))
+
+    assert not pool.reserve(pool.select())
+    with pytest.raises(RequestLimitReachedException):
+        pool.select()
+
+
+def test_report_cools_down_rate_limited_and_drops_refused_keys():
+    pool = KeyPool(make_keys(None, None), cooldown=60)
+    first, second = pool.keys
+
+    assert pool.report(first, 429)
+    assert pool.wait_time(first) > 0
+    assert pool.select() is second
+
+    assert pool.report(second, 403)
+    assert pool.select() is first
+    assert not pool.report(first, None)
+    assert not pool.report(first, 500)
+
+
+def test_invalid_pools_raise():
+    with pytest.raises(ValueError):
+        KeyPool([])
+    with pytest.raises(ValueError):
+        KeyPool(make_keys(1), strategy="random")
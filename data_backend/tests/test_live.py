@@ -0,0 +1,165 @@
+import json
+import threading
+
+import pytest
+
+from data_backend.circuit_breaker import CircuitBreaker
+from data_backend.database.quota import QuotaStore
+from data_backend.exceptions import RequestLimitReachedException
+from data_backend.handlers import ResponseHandler
+from data_backend.live import LivePoller
+from data_backend.models import APIRequest, ParsedDocument
+from data_backend.quota import quota_day
+from data_backend.requester import HTTPRequester
+from data_backend.storage import MemoryStorage
+from tests.conftest import FakeResponse
+
+
+def split(body):
+    return [
+        ParsedDocument(type="live", data=item, path=f"{item['id']}.json")
+        for item in json.loads(body)
+    ]
+
+
+class SequenceSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.headers = []
+
+    def get(self, *args, headers=None, **kwargs):
+        self.headers.append(headers)
+        return self.responses.pop(0)
+
+
+def make_response(items, etag=None, status_code=200):
+    response = FakeResponse(json.dumps(items), status_code)
+    if etag is not None:
+        response.headers = {"ETag": etag}
+    return response
+
+
+def make_poller(session, interval=lambda documents: 60.0, poller_kwargs=None, **kwargs):
+    handler = ResponseHandler().add_splitter("live", split)
+    requester = HTTPRequester(http_session=session, **kwargs)
+    return LivePoller(
+        requester,
+        handler,
+        MemoryStorage(),
+        interval,
+        max_documents=2,
+        **(poller_kwargs or {}),
+    )
+
+
+REQUEST = APIRequest(url="http://example.com/live", type="live")
+
+
+def test_poll_writes_only_changed_documents():
+    session = SequenceSession(
+        make_response([{"id": 1, "score": 0}, {"id": 2, "score": 0}], etag='"a"'),
+        make_response([], etag='"a"', status_code=304),
+        make_response([{"id": 1, "score": 1}, {"id": 2, "score": 0}], etag='"b"'),
+    )
+    poller = make_poller(session)
+
+    first = poller.poll(REQUEST)
+    second = poller.poll(REQUEST)
+    poller.poll(REQUEST)
+
+    assert second == first
+    assert session.headers == [None, {"If-None-Match": '"a"'}, {"If-None-Match": '"a"'}]
+    assert poller.written == 3
+    [key] = [key for key in poller.files.objects if key.endswith("/1.json")]
+    assert json.loads(poller.files.objects[key])["score"] == 1
+
+
+def test_poll_forgets_least_recently_written_hashes():
+    session = SequenceSession(
+        make_response([{"id": 1}, {"id": 2}, {"id": 3}]),
+        make_response([{"id": 1}]),
+    )
+    poller = make_poller(session)
+
+    poller.poll(REQUEST)
+    poller.poll(REQUEST)
+
+    assert len(poller._hashes) == 2
+    assert poller.written == 4
+
+
+def test_next_interval_spreads_remaining_requests_until_reset():
+    poller = make_poller(SequenceSession(), request_limit=10, request_count=10)
+    assert poller.next_interval([]) > 60.0
+
+    poller = make_poller(SequenceSession(), request_limit=1_000_000)
+    assert poller.next_interval([]) == 60.0
+
+
+def test_run_polls_until_stopped():
+    stop = threading.Event()
+
+    def interval(documents):
+        stop.set()
+        return 0.0
+
+    poller = make_poller(SequenceSession(make_response([{"id": 1}])), interval)
+    poller.run(lambda: REQUEST, stop)
+
+    assert poller.polls == 1
+    assert poller.written == 1
+
+
+def test_budget_is_counted_in_the_quota_store(sqlite_session_factory):
+    quota_store = QuotaStore(sqlite_session_factory)
+    session = SequenceSession(make_response([{"id": 1}]))
+    poller = make_poller(
+        session, poller_kwargs={"budget": 2, "quota_store": quota_store}
+    )
+
+    poller.poll(REQUEST)
+    restarted = make_poller(
+        session, poller_kwargs={"budget": 2, "quota_store": quota_store}
+    )
+
+    assert quota_store.get_used("live", quota_day()) == 1
+    assert restarted.next_interval([]) > 60.0
+    quota_store.try_acquire("live", quota_day())
+    with pytest.raises(RequestLimitReachedException, match="budget of 2"):
+        restarted.poll(REQUEST)
+
+
+def test_next_interval_spreads_the_shared_quota(sqlite_session_factory):
+    quota_store = QuotaStore(sqlite_session_factory)
+    for _ in range(9):
+        quota_store.try_acquire("api", quota_day())
+    poller = make_poller(
+        SequenceSession(), request_limit=10, quota_store=quota_store, quota_key="api"
+    )
+
+    assert poller.requester.remaining_requests() == 1
+    assert poller.next_interval([]) > 60.0
+
+
+def test_run_pauses_while_the_circuit_is_open():
+    stop = threading.Event()
+    waits = []
+    stop.wait = lambda timeout: waits.append(timeout) or stop.set()
+    clock = [0.0]
+
+    def breaker():
+        return CircuitBreaker(
+            failure_threshold=1, reset_timeout=30.0, clock=lambda: clock[0]
+        )
+
+    poller = make_poller(
+        SequenceSession(make_response([], status_code=500)),
+        circuit_breaker=breaker,
+    )
+    poller.poll(REQUEST)
+    clock[0] = 10.0
+
+    poller.run(lambda: REQUEST, stop)
+
+    assert waits == [20.0]
+    assert poller.polls == 1
@@ -0,0 +1,70 @@
+import pstats
+import time
+
+from data_backend.api import APIDownloader
+from data_backend.aws import S3Client
+from data_backend.database.requests import RequestStore
+from data_backend.handlers import ResponseHandler
+from data_backend.models import APIRequest
+from data_backend.profiling import StageProfiler, stage
+from tests.conftest import FakeHTTPSession, FakeResponse
+
+
+def test_stage_accumulates_time():
+    profiler = StageProfiler()
+
+    for _ in range(2):
+        with profiler.stage("outer"):
+            with profiler.stage("inner"):
+                time.sleep(0.001)
+
+    assert profiler.calls == {"outer": 2, "inner": 2}
+    assert profiler.totals["outer"] >= profiler.totals["inner"] > 0
+    assert "inner" in profiler.report()
+
+
+def test_stage_without_profiler_is_noop():
+    with stage(None, "http"):
+        pass
+
+
+def test_dump_writes_profiles(tmp_path):
+    profiler = StageProfiler(cprofile=True, sample_interval=0.001)
+
+    profiler.start()
+    with profiler.stage("busy"):
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+    profiler.stop()
+    files = profiler.dump(tmp_path)
+
+    assert [f.name for f in files] == [
+        "stages.txt",
+        "profile.pstats",
+        "stacks.collapsed",
+    ]
+    assert pstats.Stats(str(tmp_path / "profile.pstats")).total_calls > 0
+    lines = (tmp_path / "stacks.collapsed").read_text().splitlines()
+    assert any(line.startswith("stage:busy;") for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_downloader_reports_stages(fake_s3_bucket, sqlite_session_factory):
+    profiler = StageProfiler()
+    handler = ResponseHandler().add_parser("test", lambda body: ({}, "r.json"))
+    downloader = APIDownloader(
+        name="test_name",
+        logical_date="2026-02-20",
+        http_session=FakeHTTPSession(FakeResponse("{}", 200)),
+        response_handler=handler,
+        request_store=RequestStore(sqlite_session_factory),
+        storage_client=S3Client(bucket_name=fake_s3_bucket),
+        profiler=profiler,
+    )
+
+    downloader.add(APIRequest(url="http://example.com", type="test"))
+    downloader.download()
+
+    assert set(profiler.calls) == {"database", "http", "parse", "storage"}
+    assert profiler.calls["database"] == 2
@@ -0,0 +1,40 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from data_backend.quota import SharedQuota, next_quota_reset, quota_day
+
+_quota = None
+
+
+def _init(quota):
+    global _quota
+    _quota = quota
+
+
+def _acquire(_):
+    return _quota.try_acquire()
+
+
+def test_try_acquire_until_limit():
+    quota = SharedQuota(limit=2, used=1)
+
+    assert quota.try_acquire() is True
+    assert quota.try_acquire() is False
+    assert quota.used == 2
+
+
+def test_quota_shared_between_processes():
+    quota = SharedQuota(limit=5)
+
+    with ProcessPoolExecutor(2, initializer=_init, initargs=(quota,)) as executor:
+        results = list(executor.map(_acquire, range(8)))
+
+    assert results.count(True) == 5
+    assert quota.used == 5
+
+
+def test_quota_day_is_utc_date():
+    evening = datetime(2026, 2, 20, 23, 30, tzinfo=timezone(timedelta(hours=-5)))
+
+    assert quota_day(evening) == "2026-02-21"
+    assert next_quota_reset(evening) == datetime(2026, 2, 22, tzinfo=timezone.utc)
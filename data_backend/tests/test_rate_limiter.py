@@ -1,3 +1,6 @@
+import threading
+import time
+
 import pytest
 
 from data_backend.rate_limiter import RateLimiter
@@ -15,3 +18,35 @@ def test_rate_limit_valid_units(events_per_unit, unit, expected_interval_seconds
 def test_rate_limit_invalid_unit():
     with pytest.raises(ValueError, match="Invalid unit"):
         RateLimiter(10, "days")
+
+
+def test_wait_time_counts_elapsed_time():
+    r = RateLimiter(1, "hour")
+    assert 3590 < r.wait_time() <= 3600
+
+    r._last_event -= 3000
+    assert 590 < r.wait_time() <= 600
+
+    r._last_event -= 1000
+    assert r.wait_time() == 0.0
+
+
+def test_acquire_spaces_events_of_concurrent_threads():
+    r = RateLimiter(20, "second")
+    r._last_event -= 1
+    events = []
+
+    def acquire():
+        for _ in range(2):
+            r.acquire()
+            events.append(time.monotonic())
+
+    threads = [threading.Thread(target=acquire) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    events.sort()
+    assert len(events) == 8
+    assert all(b - a >= 0.045 for a, b in zip(events, events[1:]))
@@ -0,0 +1,71 @@
+import json
+from functools import partial
+
+import pytest
+
+from data_backend.handlers import ResponseHandler
+from data_backend.models import APIRequest
+from data_backend.replay import Replayer
+from data_backend.storage import LocalStorage
+
+
+def parse(body):
+    data = json.loads(body)
+    return data, f"{data['id']}.json"
+
+
+def generate(body):
+    return [APIRequest(url=f"http://example.com/{json.loads(body)['id']}", type="x")]
+
+
+def flatten(data):
+    return {"items": [{"id": data["id"]}]}
+
+
+def classify(key):
+    return "test" if key.endswith(".json") else None
+
+
+class FakeColumnarWriter:
+    def __init__(self):
+        self.rows = []
+        self.flushed = False
+
+    def write(self, table, rows, partition):
+        self.rows.append((table, partition, rows))
+
+    def flush(self):
+        self.flushed = True
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_replay_stored_objects(tmp_path, processes):
+    storage = LocalStorage(tmp_path)
+    for n in range(3):
+        storage.save_json({"id": n}, f"2026-02-20/{n}.json")
+    storage.save_bytes(b"not json", "2026-02-20/broken.json")
+    storage.save_bytes(b"ignored", "2026-02-20/notes.txt")
+    handler = (
+        ResponseHandler()
+        .add_parser("test", parse, raw=True)
+        .add_request_generator("test", generate)
+        .add_flattener("test", flatten)
+    )
+    writer = FakeColumnarWriter()
+
+    stats = Replayer(
+        handler,
+        partial(LocalStorage, tmp_path),
+        classify,
+        columnar_writer=writer,
+        processes=processes,
+    ).replay(storage.list_keys("2026-02-20/"))
+
+    assert (stats.objects, stats.documents, stats.rows) == (3, 3, 3)
+    assert stats.requests == 3
+    assert stats.errors == 1
+    assert stats.bytes == sum(len(json.dumps({"id": n})) for n in range(3))
+    assert sorted(rows[0]["id"] for _, _, rows in writer.rows) == [0, 1, 2]
+    assert {partition for _, partition, _ in writer.rows} == {"2026-02-20"}
+    assert writer.flushed
+    assert "objects/s" in stats.report()
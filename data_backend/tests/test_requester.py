@@ -1,10 +1,19 @@
+from datetime import datetime, time, timedelta, timezone
 from unittest import mock
 
 import pytest
 import requests
 
-from data_backend.exceptions import RequestLimitReachedException
+from data_backend.circuit_breaker import CircuitBreaker
+from data_backend.database.quota import QuotaStore
+from data_backend.exceptions import (
+    CircuitOpenException,
+    DownloadDeferredException,
+    RequestLimitReachedException,
+)
+from data_backend.keys import APIKey, KeyPool
 from data_backend.models import APIRequest, APIResponse
+from data_backend.quota import SharedQuota, quota_day
 from data_backend.rate_limiter import RateLimiter
 from data_backend.requester import HTTPRequester
 from tests.conftest import FakeHTTPSession, FakeResponse
@@ -22,6 +31,39 @@ def test_get_success():
         body="ok",
         request=req,
     )
+    assert result.content is response.content
+    assert requester.request_count == 1
+
+
+def test_get_stream():
+    response = FakeResponse(text='{"response": [1, 2]}', status_code=200)
+    session = mock.Mock(wraps=FakeHTTPSession(response=response))
+
+    requester = HTTPRequester(http_session=session, chunk_size=4, spool_max_size=8)
+    req = APIRequest(url="http://test.com", type="test")
+    result = requester.get(req, stream=True)
+
+    assert result.body == ""
+    assert result.stream.read() == b'{"response": [1, 2]}'
+    assert session.get.call_args.kwargs["stream"] is True
+    assert response.closed
+
+
+def test_get_conditional():
+    response = FakeResponse(text="", status_code=304)
+    response.headers = {"ETag": '"v1"', "Last-Modified": "Fri, 20 Feb 2026"}
+    session = mock.Mock(wraps=FakeHTTPSession(response=response))
+
+    requester = HTTPRequester(http_session=session)
+    req = APIRequest(url="http://test.com", type="test")
+    result = requester.get(req, headers={"If-None-Match": '"v1"'})
+
+    assert session.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+    assert result.not_modified
+    assert result.validators == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Fri, 20 Feb 2026",
+    }
     assert requester.request_count == 1
 
 
@@ -69,3 +111,223 @@ def test_get_request_limit_reached():
     with pytest.raises(RequestLimitReachedException):
         req = APIRequest(url="http://test.com", type="test")
         requester.get(req)
+
+
+def test_get_shared_quota_reached():
+    session = FakeHTTPSession(FakeResponse(text="ok", status_code=200))
+    quota = SharedQuota(limit=1)
+    requester = HTTPRequester(http_session=session, quota=quota)
+    req = APIRequest(url="http://test.com", type="test")
+
+    requester.get(req)
+    with pytest.raises(RequestLimitReachedException, match="Shared quota"):
+        requester.get(req)
+    assert requester.request_count == 1
+
+
+def test_circuit_opens_per_host():
+    session = FakeHTTPSession(FakeResponse("Unavailable", 503))
+    requester = HTTPRequester(
+        http_session=session,
+        circuit_breaker=lambda: CircuitBreaker(failure_threshold=2),
+    )
+    req = APIRequest(url="http://test.com/fixtures", type="test")
+
+    requester.get(req)
+    assert not requester.circuit_open(req)
+    requester.get(req)
+    assert requester.circuit_open(req)
+
+    with pytest.raises(CircuitOpenException):
+        requester.get(req)
+    assert requester.request_count == 2
+
+    other = APIRequest(url="http://other.com/fixtures", type="test")
+    assert not requester.circuit_open(other)
+
+
+def test_client_errors_do_not_open_circuit():
+    session = FakeHTTPSession(FakeResponse("Not Found", 404))
+    requester = HTTPRequester(
+        http_session=session,
+        circuit_breaker=lambda: CircuitBreaker(failure_threshold=1),
+    )
+    req = APIRequest(url="http://test.com", type="test")
+
+    requester.get(req)
+
+    assert not requester.circuit_open(req)
+
+
+def test_get_defers_long_rate_limit_wait():
+    quota = SharedQuota(limit=5)
+    requester = HTTPRequester(
+        http_session=FakeHTTPSession(FakeResponse("ok", 200)),
+        rate_limit=RateLimiter(1, "hour"),
+        quota=quota,
+        max_wait=60,
+    )
+
+    with pytest.raises(DownloadDeferredException) as e:
+        requester.get(APIRequest(url="http://test.com", type="test"))
+
+    wait = (e.value.resume_at - datetime.now(timezone.utc)).total_seconds()
+    assert 3500 < wait <= 3600
+    assert quota.used == 0
+    assert requester.request_count == 0
+
+
+def test_get_defers_reached_limit_to_next_day():
+    requester = HTTPRequester(
+        http_session=FakeHTTPSession(FakeResponse("ok", 200)),
+        request_limit=1,
+        request_count=1,
+        max_wait=60,
+    )
+
+    with pytest.raises(DownloadDeferredException) as e:
+        requester.get(APIRequest(url="http://test.com", type="test"))
+
+    today = datetime.now(timezone.utc).date()
+    assert e.value.resume_at == datetime.combine(
+        today + timedelta(days=1), time.min, timezone.utc
+    )
+
+
+def test_get_counts_daily_limit_in_quota_store(sqlite_session_factory):
+    store = QuotaStore(sqlite_session_factory)
+    requesters = [
+        HTTPRequester(
+            http_session=FakeHTTPSession(FakeResponse("ok", 200)),
+            request_limit=2,
+            quota_store=store,
+            quota_key="daily",
+        )
+        for _ in range(2)
+    ]
+    req = APIRequest(url="http://test.com", type="test")
+
+    requesters[0].get(req)
+    requesters[1].get(req)
+    with pytest.raises(RequestLimitReachedException):
+        requesters[0].get(req)
+
+    assert store.get_used("daily", quota_day()) == 2
+
+
+def test_refused_requests_are_not_counted_in_quota_store(sqlite_session_factory):
+    store = QuotaStore(sqlite_session_factory)
+    requester = HTTPRequester(
+        http_session=FakeHTTPSession(FakeResponse("ok", 200)),
+        request_limit=10,
+        quota=SharedQuota(limit=0),
+        key_pool=KeyPool([APIKey("a", {"x-api-key": "a"}, daily_limit=10)]),
+        quota_store=store,
+        quota_key="daily",
+    )
+    req = APIRequest(url="http://test.com", type="test")
+
+    with pytest.raises(RequestLimitReachedException, match="Shared quota"):
+        requester.get(req)
+
+    assert store.get_used("daily", quota_day()) == 0
+
+
+def test_requests_refused_by_quota_store_spend_no_other_quota(
+    sqlite_session_factory,
+):
+    store = QuotaStore(sqlite_session_factory)
+    store.try_acquire("daily", quota_day(), 1)
+    quota = SharedQuota(limit=10)
+    requester = HTTPRequester(
+        http_session=FakeHTTPSession(FakeResponse("ok", 200)),
+        request_limit=1,
+        quota=quota,
+        key_pool=KeyPool(
+            [APIKey("a", {"x-api-key": "a"}, daily_limit=10)], quota_store=store
+        ),
+        quota_store=store,
+        quota_key="daily",
+    )
+
+    with pytest.raises(RequestLimitReachedException, match="Daily request limit"):
+        requester.get(APIRequest(url="http://test.com", type="test"))
+
+    assert quota.used == 0
+    assert store.get_used("a", quota_day()) == 0
+
+
+def test_key_failover_counts_request_once_in_quota_store(sqlite_session_factory):
+    store = QuotaStore(sqlite_session_factory)
+    responses = [FakeResponse("slow down", 429), FakeResponse("ok", 200)]
+    session = FakeHTTPSession(None)
+    session.get = lambda *args, **kwargs: responses.pop(0)
+    pool = KeyPool(
+        [APIKey(name, {"x-api-key": name}, daily_limit=10) for name in ["a", "b"]],
+        strategy="round_robin",
+    )
+    quota = SharedQuota(limit=10)
+    requester = HTTPRequester(
+        http_session=session,
+        request_limit=10,
+        quota=quota,
+        key_pool=pool,
+        quota_store=store,
+        quota_key="daily",
+    )
+
+    assert requester.get(APIRequest(url="http://test.com", type="test")).body == "ok"
+    assert requester.request_count == 2
+    assert store.get_used("daily", quota_day()) == 1
+    assert quota.used == 1
+
+
+def test_get_falls_back_to_own_count_when_quota_store_fails():
+    class BrokenQuotaStore:
+        def try_acquire(self, key, day, limit):
+            raise ConnectionError("database unavailable")
+
+    requester = HTTPRequester(
+        http_session=FakeHTTPSession(FakeResponse("ok", 200)),
+        request_limit=1,
+        quota_store=BrokenQuotaStore(),
+    )
+    req = APIRequest(url="http://test.com", type="test")
+
+    assert requester.get(req).body == "ok"
+    with pytest.raises(RequestLimitReachedException):
+        requester.get(req)
+
+
+def test_get_fails_over_to_another_key():
+    responses = [FakeResponse("slow down", 429), FakeResponse("ok", 200)]
+    sent_headers = []
+
+    class KeySession:
+        def get(self, *args, headers=None, **kwargs):
+            sent_headers.append(headers)
+            return responses.pop(0)
+
+    pool = KeyPool(
+        [APIKey(name, {"x-api-key": name}, daily_limit=10) for name in ["a", "b"]],
+        strategy="round_robin",
+    )
+    requester = HTTPRequester(http_session=KeySession(), key_pool=pool)
+    result = requester.get(APIRequest(url="http://test.com", type="test"))
+
+    assert result.body == "ok"
+    assert sent_headers == [{"x-api-key": "a"}, {"x-api-key": "b"}]
+    assert requester.request_count == 2
+
+
+def test_get_defers_when_all_keys_are_used_up():
+    pool = KeyPool([APIKey("a", {"x-api-key": "a"}, daily_limit=0)])
+    requester = HTTPRequester(
+        http_session=FakeHTTPSession(FakeResponse("ok", 200)),
+        key_pool=pool,
+        max_wait=60,
+    )
+
+    with pytest.raises(DownloadDeferredException):
+        requester.get(APIRequest(url="http://test.com", type="test"))
+    assert requester.request_count == 0
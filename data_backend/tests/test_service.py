@@ -0,0 +1,242 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+
+import psycopg2
+import pytest
+
+from data_backend.models import APIRequest
+from data_backend.service import DownloadService, make_server
+
+
+class FakeRequester:
+    def __init__(self):
+        self.request_count = 0
+
+
+class FakeDownloader:
+    def __init__(self, fail=False, resume_at=None):
+        self.requester = FakeRequester()
+        self.requests = []
+        self.fail = fail
+        self.resume_at = resume_at
+
+    def download_backlog(self):
+        pass
+
+    def add(self, request):
+        self.requests.append(request)
+
+    def download(self):
+        if self.fail:
+            raise ConnectionError("API unreachable")
+        self.requester.request_count += len(self.requests)
+
+
+def make_request(date):
+    return APIRequest(
+        url="https://example.com/fixtures", type="schedule", params={"date": date}
+    )
+
+
+def test_run_records_outcome():
+    downloaders = []
+
+    def factory(name, logical_date):
+        downloaders.append((name, logical_date, FakeDownloader()))
+        return downloaders[-1][2]
+
+    service = DownloadService(factory)
+    job = service.submit("daily", "2026-02-20", [make_request("2026-02-20")])
+
+    service.run(job)
+
+    assert downloaders[0][:2] == ("daily", "2026-02-20")
+    assert downloaders[0][2].requests == job.requests
+    assert job.status == "succeeded"
+    assert job.requests_made == 1
+    assert job.finished_at is not None
+
+
+@pytest.mark.parametrize(
+    "downloader, status",
+    [
+        (FakeDownloader(fail=True), "failed"),
+        (
+            FakeDownloader(resume_at=datetime(2026, 2, 21, tzinfo=timezone.utc)),
+            "deferred",
+        ),
+    ],
+)
+def test_run_records_failed_and_deferred_jobs(downloader, status):
+    service = DownloadService(lambda name, logical_date: downloader)
+    job = service.submit("daily", "2026-02-20", [])
+
+    service.run(job)
+
+    assert job.status == status
+
+
+def test_run_evicts_oldest_finished_jobs():
+    service = DownloadService(
+        lambda name, logical_date: FakeDownloader(), finished_jobs=2
+    )
+    jobs = [service.submit("daily", "2026-02-20", []) for _ in range(4)]
+
+    for job in jobs[:3]:
+        service.run(job)
+
+    assert service.get(jobs[0].id) is None
+    assert service.list_jobs() == jobs[1:]
+
+
+def test_run_serializes_jobs_of_the_same_name():
+    lock = threading.Lock()
+    running = []
+    overlaps = []
+
+    class SlowDownloader(FakeDownloader):
+        def download(self):
+            with lock:
+                running.append(self)
+                overlaps.append(len(running))
+            threading.Event().wait(0.05)
+            with lock:
+                running.remove(self)
+
+    service = DownloadService(lambda name, logical_date: SlowDownloader(), workers=2)
+    service.start()
+    jobs = [service.submit("daily", "2026-02-20", []) for _ in range(2)]
+    service.stop()
+
+    assert [job.status for job in jobs] == ["succeeded"] * 2
+    assert overlaps == [1, 1]
+
+
+@pytest.fixture
+def server_url():
+    service = DownloadService(lambda name, logical_date: FakeDownloader())
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    service.start()
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    service.stop()
+
+
+def call(url, data=None):
+    body = None if data is None else json.dumps(data).encode("utf-8")
+    with urllib.request.urlopen(urllib.request.Request(url, data=body)) as response:
+        return response.status, json.load(response)
+
+
+def test_server_accepts_and_reports_jobs(server_url):
+    status, job = call(
+        f"{server_url}/jobs",
+        {
+            "name": "daily",
+            "logical_date": "2026-02-20",
+            "requests": [make_request("2026-02-20").dict()],
+        },
+    )
+    assert status == 202
+    assert job["requests"] == 1
+
+    for _ in range(100):
+        status, job = call(f"{server_url}/jobs/{job['id']}")
+        if job["status"] == "succeeded":
+            break
+        threading.Event().wait(0.01)
+
+    assert status == 200
+    assert job["status"] == "succeeded"
+    assert job["requests_made"] == 1
+    assert call(f"{server_url}/jobs")[1] == [job]
+
+
+@pytest.mark.parametrize(
+    "path, data, code",
+    [
+        ("/jobs/unknown", None, 404),
+        ("/jobs", {"name": "daily"}, 400),
+        (
+            "/jobs",
+            {"name": "daily", "logical_date": "2026-02-20", "requests": [{}]},
+            400,
+        ),
+    ],
+)
+def test_server_rejects_invalid_calls(server_url, path, data, code):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        call(f"{server_url}{path}", data)
+
+    assert error.value.code == code
+
+
+class FakeListener:
+    def __init__(self, bursts, stop):
+        self.bursts = list(bursts)
+        self.stop = stop
+        self.closed = False
+        self.listens = 0
+
+    def listen(self):
+        self.listens += 1
+        self.closed = False
+
+    def wait(self, timeout=None):
+        burst = self.bursts.pop(0)
+        if not self.bursts:
+            self.stop.set()
+        if isinstance(burst, Exception):
+            raise burst
+        return burst
+
+    def close(self):
+        self.closed = True
+
+
+def test_follow_queues_backlog_jobs_for_notified_names():
+    stop = threading.Event()
+    service = DownloadService(lambda name, logical_date: FakeDownloader())
+    listener = FakeListener(
+        [{"daily:hash=0/2", "backfill"}, {"daily:hash=0/2"}, set()], stop
+    )
+
+    service.follow(listener, ["daily", "live"], stop=stop)
+
+    names = [job.name for job in service.list_jobs()]
+    assert names == ["daily:hash=0/2", "daily", "live"]
+    assert all(job.requests == [] for job in service.list_jobs())
+    assert listener.closed
+
+
+def test_follow_skips_names_with_a_running_job():
+    stop = threading.Event()
+    service = DownloadService(lambda name, logical_date: FakeDownloader())
+    running = service.submit("daily", "2026-02-20", [])
+    running.status = "running"
+    listener = FakeListener([{"daily", "live"}, set()], stop)
+
+    service.follow(listener, ["daily", "live"], stop=stop)
+
+    assert [job.name for job in service.list_jobs()] == ["daily", "live"]
+
+
+def test_follow_reconnects_after_losing_the_connection():
+    stop = threading.Event()
+    service = DownloadService(lambda name, logical_date: FakeDownloader())
+    listener = FakeListener(
+        [psycopg2.OperationalError("server closed the connection"), {"daily"}],
+        stop,
+    )
+
+    service.follow(listener, ["daily", "live"], stop=stop, reconnect_delay=0)
+
+    assert listener.listens == 2
+    assert [job.name for job in service.list_jobs()] == ["daily", "live"]
+    assert listener.closed
@@ -0,0 +1,94 @@
+import hashlib
+import io
+import json
+import os
+
+import pytest
+
+from data_backend.storage import LocalStorage, MemoryStorage
+
+
+@pytest.fixture(params=["local", "memory"])
+def storage(request, tmp_path):
+    if request.param == "local":
+        return LocalStorage(tmp_path / "storage", fsync_batch=2)
+    return MemoryStorage()
+
+
+def test_save_and_read(storage):
+    stored = storage.save_json({"foo": "bar"}, "2026-02-20/a.json")
+    storage.save_json(b'{"raw": true}', "2026-02-20/b.json")
+    storage.save_stream(io.BytesIO(b"0123456789"), "other/c.bin")
+    storage.flush()
+
+    body = json.dumps({"foo": "bar"}).encode("utf-8")
+    assert stored.size == len(body)
+    assert stored.checksum == hashlib.sha256(body).hexdigest()
+    assert storage.read_bytes("2026-02-20/b.json") == b'{"raw": true}'
+    assert storage.read_bytes("other/c.bin", byte_range=(2, 3)) == b"234"
+    assert storage.list_keys("2026-02-20/") == [
+        "2026-02-20/a.json",
+        "2026-02-20/b.json",
+    ]
+
+    storage.delete(["2026-02-20/a.json", "missing.json"])
+
+    assert storage.list_keys() == ["2026-02-20/b.json", "other/c.bin"]
+
+
+def test_read_buffer(storage):
+    storage.save_json({"foo": "bar"}, "a.json")
+
+    buffer = storage.read_buffer("a.json")
+
+    assert json.loads(bytes(buffer)) == {"foo": "bar"}
+    assert buffer[:1] == b"{"
+
+
+def test_local_storage_overwrites_atomically(tmp_path):
+    storage = LocalStorage(tmp_path, fsync_batch=1)
+    storage.save_bytes(b"old", "a.json")
+
+    with pytest.raises(RuntimeError):
+        with storage._atomic_write("a.json") as f:
+            f.write(b"partial")
+            raise RuntimeError("interrupted")
+    assert storage.read_bytes("a.json") == b"old"
+
+    with storage.read_buffer("a.json") as mapped:
+        storage.save_bytes(b"new", "a.json")
+        assert mapped[:] == b"old"
+    assert storage.read_bytes("a.json") == b"new"
+    assert [p.name for p in tmp_path.iterdir()] == ["a.json"]
+
+
+def test_local_storage_batches_fsync(tmp_path):
+    storage = LocalStorage(tmp_path, fsync_batch=3)
+
+    storage.save_bytes(b"1", "a")
+    storage.save_bytes(b"2", "b")
+    assert len(storage._unsynced) == 2
+
+    storage.save_bytes(b"3", "c")
+    assert storage._unsynced == []
+
+
+def test_local_storage_syncs_data_before_rename(tmp_path, monkeypatch):
+    storage = LocalStorage(tmp_path, fsync_batch=100)
+    calls = []
+    fsync, replace = os.fsync, os.replace
+    monkeypatch.setattr(os, "fsync", lambda fd: (calls.append("fsync"), fsync(fd)))
+    monkeypatch.setattr(
+        os, "replace", lambda src, dst: (calls.append("replace"), replace(src, dst))
+    )
+
+    storage.save_bytes(b"1", "a")
+
+    assert calls == ["fsync", "replace"]
+
+
+def test_local_storage_rejects_keys_outside_root(tmp_path):
+    storage = LocalStorage(tmp_path / "storage")
+
+    with pytest.raises(ValueError):
+        storage.save_bytes(b"x", "../escape")
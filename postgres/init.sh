@@ -68,6 +68,48 @@ CREATE TABLE IF NOT EXISTS requests (
   created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
   updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
+ALTER TABLE requests ADD COLUMN IF NOT EXISTS tags JSONB;
+ALTER TABLE requests ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE requests ADD COLUMN IF NOT EXISTS last_error TEXT;
+ALTER TABLE requests ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMPTZ;
+CREATE INDEX IF NOT EXISTS ix_requests_retry ON requests (name, next_attempt_at)
+  WHERE status = 'Failed';
+CREATE OR REPLACE VIEW dead_letter_requests AS
+  SELECT * FROM requests WHERE status = 'Failed' AND next_attempt_at IS NULL;
+EOSQL
+
+echo "Ensuring manifest table exists in '$FOOTGRAPH_DB'..."
+PGPASSWORD=$FOOTGRAPH_DB_PASSWORD psql -h postgres -U "$FOOTGRAPH_DB_USER" -d "$FOOTGRAPH_DB" <<EOSQL
+CREATE TABLE IF NOT EXISTS manifest (
+  id SERIAL PRIMARY KEY,
+  key TEXT NOT NULL UNIQUE,
+  name TEXT NOT NULL,
+  logical_date TEXT NOT NULL,
+  type TEXT NOT NULL,
+  size BIGINT NOT NULL,
+  checksum TEXT NOT NULL,
+  etag TEXT,
+  fixture_id BIGINT,
+  league_id BIGINT,
+  date TEXT,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+ALTER TABLE manifest ADD COLUMN IF NOT EXISTS bundle TEXT;
+ALTER TABLE manifest ADD COLUMN IF NOT EXISTS bundle_offset BIGINT;
+ALTER TABLE manifest ADD COLUMN IF NOT EXISTS bundle_length BIGINT;
+CREATE INDEX IF NOT EXISTS ix_manifest_fixture_id ON manifest (fixture_id);
+CREATE INDEX IF NOT EXISTS ix_manifest_league_id ON manifest (league_id);
+CREATE INDEX IF NOT EXISTS ix_manifest_date ON manifest (date);
+EOSQL
+
+echo "Ensuring quota_usage table exists in '$FOOTGRAPH_DB'..."
+PGPASSWORD=$FOOTGRAPH_DB_PASSWORD psql -h postgres -U "$FOOTGRAPH_DB_USER" -d "$FOOTGRAPH_DB" <<EOSQL
+CREATE TABLE IF NOT EXISTS quota_usage (
+  key TEXT NOT NULL,
+  day TEXT NOT NULL,
+  used INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (key, day)
+);
 EOSQL
 echo 'DB initialization complete.'
 
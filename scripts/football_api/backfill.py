@@ -0,0 +1,203 @@
+import argparse
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from data_backend.config import get_config
+from data_backend.models import APIRequest
+from data_backend.quota import SharedQuota
+
+from scripts.football_api.football_api import (
+    BASE_URL,
+    REQUEST_DAILY_LIMIT,
+    APIDownloader,
+    build_date_range,
+    get_football_api_downloader,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+REQUESTS_PER_MINUTE = 10
+
+
+@dataclass(frozen=True)
+class Shard:
+    name: str
+    logical_date: str
+    requests: tuple[APIRequest, ...]
+
+
+@dataclass
+class ShardResult:
+    name: str
+    requests: int
+    seconds: float
+
+
+def build_date_shards(
+    name: str, start_date: str, end_date: str, shard_days: int
+) -> list[Shard]:
+    """Split a date range into shards of consecutive days."""
+    dates = build_date_range(start_date, end_date)
+    shards = []
+    for start in range(0, len(dates), shard_days):
+        shard_dates = dates[start : start + shard_days]
+        requests = tuple(
+            APIRequest(
+                url=f"{BASE_URL}/fixtures",
+                params={"date": date},
+                type="schedule",
+                tags={"date": date},
+            )
+            for date in shard_dates
+        )
+        shards.append(Shard(f"{name}:{shard_dates[0]}", shard_dates[0], requests))
+    return shards
+
+
+def build_season_shards(name: str, season: int, league_ids: list[str]) -> list[Shard]:
+    """Create one shard per league downloading its whole season schedule."""
+    return [
+        Shard(
+            f"{name}:{season}:{league_id}",
+            str(season),
+            (
+                APIRequest(
+                    url=f"{BASE_URL}/fixtures",
+                    params={"league": league_id, "season": str(season)},
+                    type="schedule",
+                    tags={"league_id": int(league_id)},
+                ),
+            ),
+        )
+        for league_id in league_ids
+    ]
+
+
+_worker_factory: Callable[..., APIDownloader] | None = None
+_worker_quota: SharedQuota | None = None
+
+
+def _init_worker(
+    downloader_factory: Callable[..., APIDownloader], quota: SharedQuota
+) -> None:
+    global _worker_factory, _worker_quota
+    _worker_factory = downloader_factory
+    _worker_quota = quota
+
+
+def run_shard(shard: Shard) -> ShardResult:
+    """Download a shard, resuming from its stored requests if it was started."""
+    if _worker_factory is None:
+        raise RuntimeError("Backfill worker was not initialized")
+    started = time.monotonic()
+    downloader = _worker_factory(shard.name, shard.logical_date, quota=_worker_quota)
+    initial_count = downloader.requester.request_count
+    if downloader.requests.count(shard.name):
+        logger.info(f"Resuming shard {shard.name}")
+        downloader.download_backlog()
+    else:
+        for request in shard.requests:
+            downloader.add(request)
+        downloader.download()
+    return ShardResult(
+        name=shard.name,
+        requests=downloader.requester.request_count - initial_count,
+        seconds=time.monotonic() - started,
+    )
+
+
+def run_backfill(
+    shards: list[Shard],
+    downloader_factory: Callable[..., APIDownloader],
+    quota: SharedQuota,
+    workers: int,
+) -> list[ShardResult]:
+    """Run shards in a pool of worker processes sharing one request quota."""
+    if workers <= 1:
+        _init_worker(downloader_factory, quota)
+        return [run_shard(shard) for shard in shards]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(downloader_factory, quota),
+    ) as executor:
+        return list(executor.map(run_shard, shards))
+
+
+def main(
+    argv: list[str] | None = None,
+    downloader_factory: Callable[..., APIDownloader] = get_football_api_downloader,
+) -> list[ShardResult]:
+    parser = argparse.ArgumentParser(
+        description="Backfill football API data over a date range or a season"
+    )
+    parser.add_argument(
+        "name",
+        help="Name of the backfill. Shards are stored as '<name>:<shard>'.",
+    )
+    parser.add_argument("--start", help="First date (YYYY-MM-DD) of the range.")
+    parser.add_argument("--end", help="Last date (YYYY-MM-DD) of the range.")
+    parser.add_argument(
+        "--season", type=int, help="Download whole seasons, one shard per league."
+    )
+    parser.add_argument(
+        "--leagues", help="Comma-separated league ids. Defaults to config.yaml."
+    )
+    parser.add_argument("--shard-days", type=int, default=7)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=REQUEST_DAILY_LIMIT,
+        help="Daily request limit, counted together with the other downloads "
+        "of the day, e.g. the daily job.",
+    )
+    args = parser.parse_args(argv)
+
+    config = get_config(Path(__file__).parent / "config.yaml")
+    if args.leagues:
+        config = {**config, "leagues": args.leagues.split(",")}
+    league_ids = [str(x) for x in config["leagues"]]
+
+    if args.season is not None:
+        shards = build_season_shards(args.name, args.season, league_ids)
+    elif args.start and args.end:
+        shards = build_date_shards(args.name, args.start, args.end, args.shard_days)
+    else:
+        parser.error("either --season or both --start and --end are required")
+
+    workers = max(1, min(args.workers, len(shards)))
+    factory_kwargs: dict[str, Any] = {
+        "config": config,
+        "request_limit": args.limit,
+        "requests_per_minute": REQUESTS_PER_MINUTE / workers,
+    }
+    logger.info(f"Backfilling {len(shards)} shards with {workers} workers")
+    started = time.monotonic()
+    results = run_backfill(
+        shards,
+        partial(downloader_factory, **factory_kwargs),
+        SharedQuota(args.limit),
+        workers,
+    )
+    elapsed = time.monotonic() - started
+
+    total = sum(r.requests for r in results)
+    for r in results:
+        logger.info(f"Shard {r.name}: {r.requests} requests in {r.seconds:.1f}s")
+    logger.info(
+        f"Backfill finished: {total} requests in {elapsed:.1f}s "
+        f"({total / elapsed if elapsed else 0:.2f} requests/s)"
+    )
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import logging
+from collections.abc import Callable
+
+from data_backend.aws import S3Client
+from data_backend.compaction import BUNDLE_SUFFIX, compact
+from data_backend.database.manifest import ManifestStore
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BUNDLE_PREFIX = "bundles"
+
+
+def daily_keys(storage_client: S3Client, date: str) -> list[str]:
+    """List the small JSON objects saved under a logical date."""
+    return [
+        key for key in storage_client.list_keys(f"{date}/") if key.endswith(".json")
+    ]
+
+
+def league_month_keys(
+    manifest_store: ManifestStore, league: int, month: str
+) -> list[str]:
+    """List the objects of one league and match month recorded in the manifest."""
+    return [e.key for e in manifest_store.find(league_id=league, month=month)]
+
+
+def get_raw_storage() -> S3Client:
+    return S3Client(bucket_name="raw-data", endpoint="http://minio:9000")
+
+
+def main(
+    argv: list[str] | None = None,
+    storage_factory: Callable[[], S3Client] = get_raw_storage,
+    manifest_factory: Callable[[], ManifestStore] = ManifestStore,
+) -> None:
+    parser = argparse.ArgumentParser(
+        description="Pack small raw JSON objects into compressed bundles"
+    )
+    parser.add_argument(
+        "date",
+        help="Logical date (YYYY-MM-DD) to compact, or month (YYYY-MM) with --league",
+    )
+    parser.add_argument(
+        "--league",
+        type=int,
+        help="Compact one league-month, selecting objects from the manifest.",
+    )
+    parser.add_argument(
+        "--delete-sources",
+        action="store_true",
+        help="Delete the source objects after the bundle is written.",
+    )
+    args = parser.parse_args(argv)
+
+    storage_client = storage_factory()
+    manifest_store = manifest_factory() if args.delete_sources else None
+    if args.league is None:
+        keys = daily_keys(storage_client, args.date)
+        bundle_key = f"{BUNDLE_PREFIX}/daily/{args.date}"
+    else:
+        keys = league_month_keys(
+            manifest_store or manifest_factory(), args.league, args.date
+        )
+        bundle_key = f"{BUNDLE_PREFIX}/league={args.league}/month={args.date}"
+
+    if not keys:
+        logger.info(f"Nothing to compact for {args.date}")
+        return
+    logger.info(f"Compacting {len(keys)} objects into {bundle_key}{BUNDLE_SUFFIX}")
+    compact(
+        storage_client,
+        keys,
+        bundle_key,
+        delete_sources=args.delete_sources,
+        manifest_store=manifest_store,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,22 @@
 import argparse
 import logging
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+
+from data_backend.aws import S3Client
+from data_backend.columnar import ColumnarWriter
+from data_backend.config import get_config
+from data_backend.database.journal import JournaledRequestStore
+from data_backend.profiling import StageProfiler
+from data_backend.storage import LocalStorage
 
 from scripts.football_api.football_api import (
+    COLUMNAR_SCHEMAS,
     APIDownloader,
+    ShardSpec,
     build_date_range,
     get_football_api_downloader,
     start_download,
@@ -13,12 +25,15 @@ from scripts.football_api.football_api import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+MINIO_ENDPOINT = "http://minio:9000"
+PROFILE_SAMPLE_INTERVAL = 0.005
+RESUME_MARKER = "resume_at="
+CONFIG_PATH = Path(__file__).parent / "config.yaml"
+
 
 def main(
     argv: list[str] | None = None,
-    downloader_factory: Callable[
-        [str, str], APIDownloader
-    ] = get_football_api_downloader,
+    downloader_factory: Callable[..., APIDownloader] = get_football_api_downloader,
 ) -> None:
     parser = argparse.ArgumentParser(
         description="Download football API data for a date"
@@ -33,15 +48,153 @@ def main(
             Each download process downloads its own requests.
         """,
     )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Also write flattened stats as Parquet files to the iceberg-data bucket.",
+    )
+    storage = parser.add_mutually_exclusive_group()
+    storage.add_argument(
+        "--content-addressed",
+        action="store_true",
+        help="Store raw payloads once by content hash, with pointers per key.",
+    )
+    storage.add_argument(
+        "--storage-dir",
+        metavar="DIR",
+        help="Store raw payloads as files under DIR instead of the raw-data "
+        "bucket, e.g. for local runs and benchmarks.",
+    )
+    parser.add_argument(
+        "--journal",
+        help="Path of a local request journal, replicated to the database "
+        "in the background and replayed on restart.",
+    )
+    parser.add_argument(
+        "--parse-processes",
+        type=int,
+        metavar="N",
+        help="Parse responses and generate requests in a pool of N processes.",
+    )
+    parser.add_argument(
+        "--shard",
+        help="Download a subset only: 'leagues=2,3', 'dates=2026-02-20,...' or "
+        "'hash=I/N' (fixtures whose id hashes to bucket I of N), combined with "
+        "';'. Requests are stored under '<name>:<shard>'.",
+    )
+    schedules = parser.add_mutually_exclusive_group()
+    schedules.add_argument(
+        "--schedules-only",
+        action="store_true",
+        help="Download and store the schedules of the dates only, without the "
+        "fixture requests they generate.",
+    )
+    schedules.add_argument(
+        "--stored-schedules",
+        action="store_true",
+        help="Read the schedules stored by a --schedules-only run of the same "
+        "date instead of downloading them, e.g. in every shard.",
+    )
+    parser.add_argument(
+        "--request-limit",
+        type=int,
+        help="Maximum requests per UTC day counted against the API quota shared "
+        "by all downloads. Defaults to the subscription's daily limit.",
+    )
+    parser.add_argument(
+        "--max-wait",
+        type=float,
+        metavar="SECONDS",
+        help="Exit instead of waiting longer than SECONDS for the rate limit, or "
+        "when the request limit is reached. The last line printed is then "
+        f"'{RESUME_MARKER}<ISO time>', when the pending requests can resume.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Only download the pending requests, without adding the schedules "
+        "again, e.g. when a deferred run resumes.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        help="Profile the run and write a per-stage breakdown, cProfile stats "
+        "and collapsed stacks for flamegraphs to DIR.",
+    )
     args = parser.parse_args(argv)
     logger.info(f"Starting download for {args.name}, date: {args.date}")
-    downloader = downloader_factory(args.name, args.date)
+    if args.columnar:
+        columnar_writer = ColumnarWriter(
+            S3Client(bucket_name="iceberg-data", endpoint=MINIO_ENDPOINT),
+            COLUMNAR_SCHEMAS,
+        )
+        downloader_factory = partial(
+            downloader_factory, columnar_writer=columnar_writer
+        )
+    if args.content_addressed:
+        storage_client = S3Client(
+            bucket_name="raw-data", endpoint=MINIO_ENDPOINT, content_addressed=True
+        )
+        downloader_factory = partial(downloader_factory, storage_client=storage_client)
+    if args.storage_dir:
+        downloader_factory = partial(
+            downloader_factory, storage_client=LocalStorage(args.storage_dir)
+        )
+    request_store = None
+    if args.journal:
+        request_store = JournaledRequestStore(args.journal)
+        downloader_factory = partial(downloader_factory, request_store=request_store)
+    parse_executor = None
+    if args.parse_processes:
+        parse_executor = ProcessPoolExecutor(max_workers=args.parse_processes)
+        downloader_factory = partial(downloader_factory, parse_executor=parse_executor)
+    profiler = None
+    if args.profile:
+        profiler = StageProfiler(cprofile=True, sample_interval=PROFILE_SAMPLE_INTERVAL)
+        downloader_factory = partial(downloader_factory, profiler=profiler)
+    if args.max_wait is not None:
+        downloader_factory = partial(downloader_factory, max_wait=args.max_wait)
+    if args.request_limit is not None:
+        downloader_factory = partial(
+            downloader_factory, request_limit=args.request_limit
+        )
+    name = args.name
+    shard = None
+    config = None
+    if args.shard:
+        shard = ShardSpec.parse(args.shard)
+        name = f"{args.name}:{shard}"
+        config = shard.apply(get_config(CONFIG_PATH))
+    if args.schedules_only:
+        config = dict(config or get_config(CONFIG_PATH), fixture_requests=False)
+    if config is not None:
+        downloader_factory = partial(downloader_factory, config=config)
+    downloader = downloader_factory(name, args.date)
     base_date = datetime.strptime(args.date, "%Y-%m-%d").date()
     dates = build_date_range(
         (base_date - timedelta(days=1)).isoformat(),
         (base_date + timedelta(days=3)).isoformat(),
     )
-    start_download(downloader, dates)
+    if shard is not None and shard.dates is not None:
+        dates = list(shard.dates)
+    if profiler is not None:
+        profiler.start()
+    try:
+        if args.resume:
+            downloader.download_backlog()
+        else:
+            start_download(downloader, dates, stored_schedules=args.stored_schedules)
+    finally:
+        if request_store is not None:
+            request_store.close()
+        if parse_executor is not None:
+            parse_executor.shutdown()
+        if profiler is not None:
+            profiler.stop()
+            logger.info(f"Stage breakdown:\n{profiler.report()}")
+            profiler.dump(args.profile)
+    if downloader.resume_at is not None:
+        print(f"{RESUME_MARKER}{downloader.resume_at.isoformat()}", flush=True)
 
 
 if __name__ == "__main__":
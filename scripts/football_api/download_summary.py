@@ -0,0 +1,42 @@
+import argparse
+import logging
+from collections.abc import Callable
+
+from data_backend.database.requests import RequestStore
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main(
+    argv: list[str] | None = None,
+    request_store_factory: Callable[[], RequestStore] = RequestStore,
+) -> dict[str, dict[str, int]]:
+    parser = argparse.ArgumentParser(
+        description="Summarize the requests of a download and its shards"
+    )
+    parser.add_argument("date", help="Logical date (YYYY-MM-DD) of the download.")
+    parser.add_argument("name", help="Name of the download process.")
+    args = parser.parse_args(argv)
+
+    counts = request_store_factory().count_by_status(args.name, args.date)
+    totals: dict[str, int] = {}
+    for name, statuses in counts.items():
+        logger.info(
+            f"{name}: "
+            + ", ".join(f"{count} {status}" for status, count in statuses.items())
+        )
+        for status, count in statuses.items():
+            totals[status] = totals.get(status, 0) + count
+    logger.info(
+        f"{args.name} on {args.date}, {len(counts)} shards: "
+        + (
+            ", ".join(f"{count} {status}" for status, count in totals.items())
+            or "no requests"
+        )
+    )
+    return counts
+
+
+if __name__ == "__main__":
+    main()
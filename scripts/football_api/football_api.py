@@ -1,6 +1,10 @@
 import json
 import logging
 import os
+import zlib
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from functools import partial
 from pathlib import Path
@@ -8,15 +12,26 @@ from typing import Any
 
 import requests
 from data_backend.api import APIDownloader
+from data_backend.circuit_breaker import CircuitBreaker
 from data_backend.config import get_config
+from data_backend.database.manifest import ManifestStore
+from data_backend.database.quota import QuotaStore
 from data_backend.handlers import ResponseHandler
-from data_backend.models import APIRequest
+from data_backend.keys import APIKey, KeyPool
+from data_backend.live import LivePoller
+from data_backend.models import APIRequest, ParsedDocument
 from data_backend.rate_limiter import RateLimiter
+from data_backend.requester import HTTPRequester
+from data_backend.storage import StorageBackend
 
 BASE_URL = "https://api-football-v1.p.rapidapi.com/v3"
 API_KEY = os.environ.get("API_FOOTBALL_KEY")
+# Several subscriptions can be pooled by listing their keys separated by commas.
+API_KEYS = [key for key in (API_KEY or "").split(",") if key]
 API_HOST = "api-football-v1.p.rapidapi.com"
 REQUEST_DAILY_LIMIT = 100
+# Daily counter of all downloads spending the quota of the API subscription.
+QUOTA_KEY = "api-football"
 
 logger = logging.getLogger(__name__)
 
@@ -32,39 +47,137 @@ def build_date_range(start_date: str, end_date: str) -> list[str]:
     ]
 
 
-def parse_schedule_response(body: str) -> tuple[dict[str, Any], str]:
-    """Parse schedule response, return data and date."""
+@dataclass(frozen=True)
+class ShardSpec:
+    """A subset of a download: some leagues, some dates, a bucket of fixtures."""
+
+    leagues: tuple[str, ...] | None = None
+    dates: tuple[str, ...] | None = None
+    bucket: tuple[int, int] | None = None
+
+    @classmethod
+    def parse(cls, spec: str) -> "ShardSpec":
+        """
+        Parse a spec like ``"leagues=2,3"``, ``"dates=2026-02-20"`` or
+        ``"hash=0/4"``; parts can be combined with ``";"``.
+        """
+        fields: dict[str, Any] = {}
+        for part in filter(None, spec.split(";")):
+            key, _, value = part.partition("=")
+            if key == "leagues":
+                fields["leagues"] = tuple(value.split(","))
+            elif key == "dates":
+                fields["dates"] = tuple(value.split(","))
+            elif key == "hash":
+                index, _, count = value.partition("/")
+                if not 0 <= int(index) < int(count):
+                    raise ValueError(f"Invalid hash shard '{value}'")
+                fields["bucket"] = (int(index), int(count))
+            else:
+                raise ValueError(f"Invalid shard spec part '{part}'")
+        return cls(**fields)
+
+    def __str__(self) -> str:
+        parts = []
+        if self.leagues is not None:
+            parts.append(f"leagues={','.join(self.leagues)}")
+        if self.dates is not None:
+            parts.append(f"dates={','.join(self.dates)}")
+        if self.bucket is not None:
+            parts.append(f"hash={self.bucket[0]}/{self.bucket[1]}")
+        return ";".join(parts)
+
+    def apply(self, config: dict[str, Any]) -> dict[str, Any]:
+        """Return the config restricted to the leagues and bucket of the shard."""
+        config = dict(config)
+        if self.leagues is not None:
+            config["leagues"] = list(self.leagues)
+        if self.bucket is not None:
+            config["fixture_shard"] = self.bucket
+        return config
+
+
+def parse_schedule_response(body: str | bytes) -> tuple[dict[str, Any], str]:
+    """Parse schedule response, return data and date (or league and season)."""
     data = json.loads(body)
-    date = data.get("parameters", {}).get("date", "")
+    parameters = data.get("parameters", {})
+    date = parameters.get("date", "")
+    if not date and parameters.get("league") and parameters.get("season"):
+        return data, f"{parameters['league']}_{parameters['season']}_schedule.json"
     if not date:
         logger.warning("Schedule response missing 'date' parameter")
     return data, f"{date}_schedule.json"
 
 
-def generate_fixture_requests(body: str, league_ids: list[str]) -> list[APIRequest]:
-    """Generate fixture statistics and player requests from schedule response."""
-    data = json.loads(body)
-    requests = []
-    for fixture in data.get("response", []):
+FINISHED_STATUSES = ["FT", "AET", "PEN"]
+FIXTURE_BATCH_SIZE = 20
+
+
+def fixture_bucket(fixture_id: Any, count: int) -> int:
+    """Return the shard bucket of a fixture, a stable hash of its id modulo count."""
+    return zlib.crc32(str(fixture_id).encode()) % count
+
+
+def _finished_fixtures(
+    fixtures: Iterable[dict[str, Any]],
+    league_ids: list[str],
+    shard: tuple[int, int] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield finished fixtures of tracked leagues, in the bucket of the shard."""
+    for fixture in fixtures:
         league_id = fixture.get("league", {}).get("id")
         fixture_id = fixture.get("fixture", {}).get("id")
         fixture_status = fixture.get("fixture", {}).get("status", {}).get("short", "")
-        if fixture_status not in ["FT", "AET", "PEN"]:
+        if fixture_status not in FINISHED_STATUSES:
             continue
         if not fixture_id or str(league_id) not in league_ids:
             continue
+        if shard is not None and fixture_bucket(fixture_id, shard[1]) != shard[0]:
+            continue
+        yield fixture
+
 
+def _fixture_tags(fixture: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "fixture_id": fixture.get("fixture", {}).get("id"),
+        "league_id": fixture.get("league", {}).get("id"),
+        "date": fixture.get("fixture", {}).get("date", "")[:10] or None,
+    }
+
+
+def generate_fixture_requests(
+    body: str | bytes,
+    league_ids: list[str],
+    shard: tuple[int, int] | None = None,
+) -> list[APIRequest]:
+    """Generate fixture statistics and player requests from schedule response."""
+    return generate_fixture_requests_from_items(
+        json.loads(body).get("response", []), league_ids, shard
+    )
+
+
+def generate_fixture_requests_from_items(
+    fixtures: Iterable[dict[str, Any]],
+    league_ids: list[str],
+    shard: tuple[int, int] | None = None,
+) -> list[APIRequest]:
+    """Generate fixture statistics and player requests from schedule items."""
+    requests = []
+    for fixture in _finished_fixtures(fixtures, league_ids, shard):
+        tags = _fixture_tags(fixture)
         requests.extend(
             [
                 APIRequest(
                     url=f"{BASE_URL}/fixtures/statistics",
-                    params={"fixture": fixture_id},
+                    params={"fixture": tags["fixture_id"]},
                     type="match_stats",
+                    tags=tags,
                 ),
                 APIRequest(
                     url=f"{BASE_URL}/fixtures/players",
-                    params={"fixture": fixture_id},
+                    params={"fixture": tags["fixture_id"]},
                     type="player_stats",
+                    tags=tags,
                 ),
             ]
         )
@@ -72,8 +185,127 @@ def generate_fixture_requests(body: str, league_ids: list[str]) -> list[APIReque
     return requests
 
 
+def generate_fixture_batch_requests(
+    body: str | bytes,
+    league_ids: list[str],
+    batch_size: int = FIXTURE_BATCH_SIZE,
+    shard: tuple[int, int] | None = None,
+) -> list[APIRequest]:
+    """Generate multi-id fixture requests embedding statistics and players."""
+    return generate_fixture_batch_requests_from_items(
+        json.loads(body).get("response", []), league_ids, batch_size, shard
+    )
+
+
+def generate_fixture_batch_requests_from_items(
+    fixtures: Iterable[dict[str, Any]],
+    league_ids: list[str],
+    batch_size: int = FIXTURE_BATCH_SIZE,
+    shard: tuple[int, int] | None = None,
+) -> list[APIRequest]:
+    """Generate multi-id fixture requests from schedule items."""
+    fixture_ids = [
+        str(fixture["fixture"]["id"])
+        for fixture in _finished_fixtures(fixtures, league_ids, shard)
+    ]
+    requests = [
+        APIRequest(
+            url=f"{BASE_URL}/fixtures",
+            params={"ids": "-".join(fixture_ids[start : start + batch_size])},
+            type="fixture_batch",
+        )
+        for start in range(0, len(fixture_ids), batch_size)
+    ]
+    logger.info(
+        f"Generated {len(requests)} batch requests for {len(fixture_ids)} fixtures "
+        "from schedule response"
+    )
+    return requests
+
+
+def split_fixture_batch_response(body: str) -> list[ParsedDocument]:
+    """Split a multi-id fixtures response into per-fixture stats documents."""
+    data = json.loads(body)
+    documents = []
+    for fixture in data.get("response", []):
+        fixture_id = fixture.get("fixture", {}).get("id")
+        if not fixture_id:
+            logger.warning("Batch response contains a fixture without 'id'")
+            continue
+        tags = _fixture_tags(fixture)
+        for request_type, endpoint in [
+            ("match_stats", "statistics"),
+            ("player_stats", "players"),
+        ]:
+            response = fixture.get(endpoint, [])
+            document = {
+                "get": f"fixtures/{endpoint}",
+                "parameters": {"fixture": str(fixture_id)},
+                "errors": [],
+                "results": len(response),
+                "response": response,
+            }
+            documents.append(
+                ParsedDocument(
+                    type=request_type,
+                    data=document,
+                    path=f"{fixture_id}_{endpoint}.json",
+                    tags=tags,
+                )
+            )
+    return documents
+
+
+LIVE_STATUSES = ["1H", "2H", "ET", "P", "LIVE"]
+BREAK_STATUSES = ["HT", "BT", "INT", "SUSP"]
+
+
+def live_request(league_ids: list[str] | None = None) -> APIRequest:
+    """Return the request of the in-play fixtures of some leagues, or of all."""
+    leagues = "-".join(league_ids) if league_ids else "all"
+    return APIRequest(url=f"{BASE_URL}/fixtures", params={"live": leagues}, type="live")
+
+
+def split_live_response(body: str) -> list[ParsedDocument]:
+    """Split a live fixtures response into one document per fixture."""
+    data = json.loads(body)
+    documents = []
+    for fixture in data.get("response", []):
+        fixture_id = fixture.get("fixture", {}).get("id")
+        if not fixture_id:
+            logger.warning("Live response contains a fixture without 'id'")
+            continue
+        documents.append(
+            ParsedDocument(
+                type="live",
+                data=fixture,
+                path=f"{fixture_id}_live.json",
+                tags=_fixture_tags(fixture),
+            )
+        )
+    return documents
+
+
+def live_interval(
+    documents: list[ParsedDocument],
+    in_play_interval: float = 60.0,
+    break_interval: float = 300.0,
+    idle_interval: float = 900.0,
+) -> float:
+    """Return the seconds until the next live poll, by the state of the matches."""
+    statuses = {
+        document.data.get("fixture", {}).get("status", {}).get("short")
+        for document in documents
+    }
+    if statuses.intersection(LIVE_STATUSES):
+        return in_play_interval
+    if statuses.intersection(BREAK_STATUSES):
+        return break_interval
+    return idle_interval
+
+
 def parse_stats_response(
-    body: str,
+    body: str | bytes,
 ) -> tuple[dict[str, Any], str]:
     data = json.loads(body)
     fixture_id = data.get("parameters", {}).get("fixture")
@@ -84,6 +316,371 @@ def parse_stats_response(
     return data, f"{fixture_id}_{filename}.json"
 
 
+def schedule_path(request: APIRequest) -> str:
+    """Return the storage path of a streamed schedule response."""
+    params = request.params or {}
+    if not params.get("date") and params.get("league") and params.get("season"):
+        return f"{params['league']}_{params['season']}_schedule.json"
+    return f"{params.get('date', '')}_schedule.json"
+
+
+def stats_path(request: APIRequest) -> str:
+    """Return the storage path of a streamed stats response."""
+    fixture_id = (request.params or {}).get("fixture")
+    return f"{fixture_id}_{request.url.split('/')[-1]}.json"
+
+
+def fixture_batch_path(request: APIRequest) -> str:
+    """Return the storage path of a streamed multi-id fixtures response."""
+    return f"{(request.params or {}).get('ids', '')}_fixtures.json"
+
+
+FIXTURES_SCHEMA = {
+    "fixture_id": "int64",
+    "kickoff": "string",
+    "status": "string",
+    "league_id": "int64",
+    "league_name": "string",
+    "season": "int64",
+    "round": "string",
+    "home_team_id": "int64",
+    "home_team_name": "string",
+    "away_team_id": "int64",
+    "away_team_name": "string",
+    "home_goals": "int64",
+    "away_goals": "int64",
+}
+
+TEAM_STATS_SCHEMA = {
+    "fixture_id": "int64",
+    "team_id": "int64",
+    "team_name": "string",
+    "stat": "string",
+    "value": "string",
+}
+
+PLAYER_STATS_SCHEMA = {
+    "fixture_id": "int64",
+    "team_id": "int64",
+    "team_name": "string",
+    "player_id": "int64",
+    "player_name": "string",
+    "minutes": "int64",
+    "position": "string",
+    "rating": "float64",
+    "captain": "bool",
+    "substitute": "bool",
+    "shots_total": "int64",
+    "shots_on": "int64",
+    "goals_total": "int64",
+    "goals_assists": "int64",
+    "passes_total": "int64",
+    "passes_key": "int64",
+    "tackles_total": "int64",
+    "duels_total": "int64",
+    "duels_won": "int64",
+    "fouls_committed": "int64",
+    "cards_yellow": "int64",
+    "cards_red": "int64",
+}
+
+COLUMNAR_SCHEMAS = {
+    "fixtures": FIXTURES_SCHEMA,
+    "team_stats": TEAM_STATS_SCHEMA,
+    "player_stats": PLAYER_STATS_SCHEMA,
+}
+
+
+def _to_float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def flatten_schedule_response(data: dict[str, Any]) -> dict[str, list[dict[str, Any]]]:
+    """Flatten schedule response into one row per fixture."""
+    rows = []
+    for fixture in data.get("response", []):
+        info = fixture.get("fixture", {})
+        league = fixture.get("league", {})
+        teams = fixture.get("teams", {})
+        goals = fixture.get("goals", {})
+        rows.append(
+            {
+                "fixture_id": info.get("id"),
+                "kickoff": info.get("date"),
+                "status": info.get("status", {}).get("short"),
+                "league_id": league.get("id"),
+                "league_name": league.get("name"),
+                "season": league.get("season"),
+                "round": league.get("round"),
+                "home_team_id": teams.get("home", {}).get("id"),
+                "home_team_name": teams.get("home", {}).get("name"),
+                "away_team_id": teams.get("away", {}).get("id"),
+                "away_team_name": teams.get("away", {}).get("name"),
+                "home_goals": goals.get("home"),
+                "away_goals": goals.get("away"),
+            }
+        )
+    return {"fixtures": rows}
+
+
+def flatten_match_stats_response(
+    data: dict[str, Any],
+) -> dict[str, list[dict[str, Any]]]:
+    """Flatten fixture statistics into one row per team and statistic."""
+    fixture_id = data.get("parameters", {}).get("fixture")
+    rows = []
+    for team_stats in data.get("response", []):
+        team = team_stats.get("team", {})
+        for stat in team_stats.get("statistics", []):
+            value = stat.get("value")
+            rows.append(
+                {
+                    "fixture_id": int(fixture_id) if fixture_id else None,
+                    "team_id": team.get("id"),
+                    "team_name": team.get("name"),
+                    "stat": stat.get("type"),
+                    "value": None if value is None else str(value),
+                }
+            )
+    return {"team_stats": rows}
+
+
+def flatten_player_stats_response(
+    data: dict[str, Any],
+) -> dict[str, list[dict[str, Any]]]:
+    """Flatten fixture player statistics into one row per player."""
+    fixture_id = data.get("parameters", {}).get("fixture")
+    rows = []
+    for team_players in data.get("response", []):
+        team = team_players.get("team", {})
+        for player in team_players.get("players", []):
+            stats = (player.get("statistics") or [{}])[0]
+            games = stats.get("games", {})
+            rows.append(
+                {
+                    "fixture_id": int(fixture_id) if fixture_id else None,
+                    "team_id": team.get("id"),
+                    "team_name": team.get("name"),
+                    "player_id": player.get("player", {}).get("id"),
+                    "player_name": player.get("player", {}).get("name"),
+                    "minutes": games.get("minutes"),
+                    "position": games.get("position"),
+                    "rating": _to_float(games.get("rating")),
+                    "captain": games.get("captain"),
+                    "substitute": games.get("substitute"),
+                    "shots_total": stats.get("shots", {}).get("total"),
+                    "shots_on": stats.get("shots", {}).get("on"),
+                    "goals_total": stats.get("goals", {}).get("total"),
+                    "goals_assists": stats.get("goals", {}).get("assists"),
+                    "passes_total": stats.get("passes", {}).get("total"),
+                    "passes_key": stats.get("passes", {}).get("key"),
+                    "tackles_total": stats.get("tackles", {}).get("total"),
+                    "duels_total": stats.get("duels", {}).get("total"),
+                    "duels_won": stats.get("duels", {}).get("won"),
+                    "fouls_committed": stats.get("fouls", {}).get("committed"),
+                    "cards_yellow": stats.get("cards", {}).get("yellow"),
+                    "cards_red": stats.get("cards", {}).get("red"),
+                }
+            )
+    return {"player_stats": rows}
+
+
+def get_football_api_handler(
+    config: dict[str, Any],
+    stream: bool | None = None,
+    executor: Executor | None = None,
+) -> ResponseHandler:
+    """Build the response handler of the football API from its config."""
+    league_ids = [str(x) for x in config["leagues"]]
+    shard = config.get("fixture_shard")
+
+    handler = (
+        ResponseHandler(executor=executor)
+        .add_parser("schedule", parse_schedule_response, raw=True)
+        .add_parser("match_stats", parse_stats_response, raw=True)
+        .add_parser("player_stats", parse_stats_response, raw=True)
+        .add_flattener("schedule", flatten_schedule_response)
+        .add_flattener("match_stats", flatten_match_stats_response)
+        .add_flattener("player_stats", flatten_player_stats_response)
+    )
+    batch_size = config.get("fixture_batch_size")
+    if stream is None:
+        stream = config.get("stream_responses", False)
+    if batch_size:
+        handler.add_splitter("fixture_batch", split_fixture_batch_response)
+        generate = partial(
+            generate_fixture_batch_requests_from_items
+            if stream
+            else generate_fixture_batch_requests,
+            league_ids=league_ids,
+            batch_size=batch_size,
+            shard=shard,
+        )
+    else:
+        generate = partial(
+            generate_fixture_requests_from_items
+            if stream
+            else generate_fixture_requests,
+            league_ids=league_ids,
+            shard=shard,
+        )
+    if stream:
+        if batch_size:
+            handler.add_stream_parser("fixture_batch", fixture_batch_path)
+        (
+            handler.add_stream_parser("schedule", schedule_path)
+            .add_stream_parser("match_stats", stats_path)
+            .add_stream_parser("player_stats", stats_path)
+        )
+    if not config.get("fixture_requests", True):
+        return handler
+    if stream:
+        handler.add_item_generator("schedule", generate)
+    else:
+        handler.add_request_generator("schedule", generate)
+    return handler
+
+
+def replay_tags(storage: StorageBackend, keys: list[str]) -> dict[str, dict[str, Any]]:
+    """
+    Rebuild the request tags of stored objects, as set when they were downloaded.
+
+    Schedules are tagged by their date or league, and stats by the tags of
+    their fixture in the stored schedules, so replayed rows are partitioned
+    by match date like downloaded ones.
+    """
+    tags: dict[str, dict[str, Any]] = {}
+    fixtures: dict[str, dict[str, Any]] = {}
+    for key in keys:
+        if classify_key(key) != "schedule":
+            continue
+        name = key.rsplit("/", 1)[-1].removesuffix("_schedule.json")
+        league, _, season = name.partition("_")
+        tags[key] = {"league_id": int(league)} if season else {"date": name}
+        try:
+            schedule = json.loads(storage.read_bytes(key))
+        except Exception:
+            logger.warning(f"Could not read schedule {key} for replay tags")
+            continue
+        for fixture in schedule.get("response", []):
+            fixture_tags = _fixture_tags(fixture)
+            fixtures[str(fixture_tags["fixture_id"])] = fixture_tags
+    for key in keys:
+        if classify_key(key) in ("match_stats", "player_stats"):
+            fixture_id = key.rsplit("/", 1)[-1].split("_", 1)[0]
+            if fixture_id in fixtures:
+                tags[key] = fixtures[fixture_id]
+    return tags
+
+
+def classify_key(key: str) -> str | None:
+    """Return the request type of a stored raw object, by its file name."""
+    name = key.rsplit("/", 1)[-1]
+    if name.endswith("_schedule.json"):
+        return "schedule"
+    if name.endswith("_statistics.json"):
+        return "match_stats"
+    if name.endswith("_players.json"):
+        return "player_stats"
+    if name.endswith("_fixtures.json"):
+        return "fixture_batch"
+    return None
+
+
+def get_football_api_session(
+    http_session: requests.Session | None = None, api_keys: list[str] | None = None
+) -> requests.Session:
+    """
+    Set the API headers on a session, keeping those it already has.
+
+    A session shared by several downloaders is only written to once.
+    """
+    http_session = http_session or requests.Session()
+    http_session.headers.setdefault("x-rapidapi-host", API_HOST)
+    api_keys = API_KEYS if api_keys is None else api_keys
+    if len(api_keys) <= 1:
+        http_session.headers.setdefault(
+            "x-rapidapi-key", api_keys[0] if api_keys else API_KEY
+        )
+    return http_session
+
+
+def get_key_pool(
+    api_keys: list[str],
+    requests_per_minute: float,
+    quota_store: Any | None = None,
+) -> KeyPool | None:
+    """Pool several API keys, each with the daily quota and rate of one key."""
+    if len(api_keys) <= 1:
+        return None
+    keys = [
+        APIKey.from_secret(
+            key,
+            "x-rapidapi-key",
+            daily_limit=REQUEST_DAILY_LIMIT,
+            rate_limit=RateLimiter(events_per_unit=requests_per_minute, unit="minute"),
+        )
+        for key in api_keys
+    ]
+    return KeyPool(keys, quota_store=quota_store or QuotaStore())
+
+
+def get_football_api_live_poller(
+    storage_client: Any,
+    http_session: requests.Session | None = None,
+    config: dict[str, Any] | None = None,
+    request_limit: int | None = None,
+    requests_per_minute: float = 10,
+    quota_store: Any | None = None,
+    quota_key: str = QUOTA_KEY,
+) -> LivePoller:
+    """
+    Build the live poller of the football API.
+
+    Polls count against the daily quota ``quota_key`` shared with the other
+    downloads, and against the poller's own budget, ``request_limit`` or
+    ``live.request_limit`` of the config, counted under ``"{quota_key}:live"``.
+    """
+    config = config or get_config(Path(__file__).parent / "config.yaml")
+    live_config = config.get("live", {})
+    quota_store = quota_store or QuotaStore()
+    key_pool = get_key_pool(API_KEYS, requests_per_minute, quota_store)
+    requester = HTTPRequester(
+        http_session=get_football_api_session(http_session),
+        rate_limit=(
+            RateLimiter(events_per_unit=requests_per_minute, unit="minute")
+            if key_pool is None
+            else None
+        ),
+        request_limit=REQUEST_DAILY_LIMIT * (len(key_pool) if key_pool else 1),
+        circuit_breaker=CircuitBreaker,
+        key_pool=key_pool,
+        quota_store=quota_store,
+        quota_key=quota_key,
+    )
+    interval = partial(
+        live_interval,
+        **{
+            key: live_config[key]
+            for key in ["in_play_interval", "break_interval", "idle_interval"]
+            if key in live_config
+        },
+    )
+    handler = ResponseHandler().add_splitter("live", split_live_response)
+    return LivePoller(
+        requester,
+        handler,
+        storage_client,
+        interval,
+        budget=request_limit or live_config.get("request_limit"),
+        quota_store=quota_store,
+        budget_key=f"{quota_key}:live",
+    )
+
+
 def get_football_api_downloader(
     name: str,
     date: str,
@@ -91,54 +688,92 @@ def get_football_api_downloader(
     config: dict[str, Any] | None = None,
     request_store: Any | None = None,
     storage_client: Any | None = None,
+    manifest_store: Any | None = None,
+    columnar_writer: Any | None = None,
+    request_limit: int | None = REQUEST_DAILY_LIMIT,
+    quota: Any | None = None,
+    requests_per_minute: float = 10,
+    rate_limiter: RateLimiter | None = None,
+    profiler: Any | None = None,
+    parse_executor: Executor | None = None,
+    max_wait: float | None = None,
+    api_keys: list[str] | None = None,
+    quota_store: Any | None = None,
+    quota_key: str = QUOTA_KEY,
 ) -> APIDownloader:
-    http_session = http_session or requests.Session()
-    http_session.headers.update(
-        {"x-rapidapi-key": API_KEY, "x-rapidapi-host": API_HOST}
-    )
+    api_keys = API_KEYS if api_keys is None else api_keys
+    http_session = get_football_api_session(http_session, api_keys)
 
     config = config or get_config(Path(__file__).parent / "config.yaml")
-    league_ids = [str(x) for x in config["leagues"]]
-
-    generate_fixture_requests_filtered = partial(
-        generate_fixture_requests, league_ids=league_ids
-    )
-
-    handler = (
-        ResponseHandler()
-        .add_parser("schedule", parse_schedule_response)
-        .add_parser("match_stats", parse_stats_response)
-        .add_parser("player_stats", parse_stats_response)
-        .add_request_generator("schedule", generate_fixture_requests_filtered)
-    )
+    handler = get_football_api_handler(config, executor=parse_executor)
 
-    rate_limiter = RateLimiter(events_per_unit=10, unit="minute")
+    # With several keys, the request limit and rate apply to every key.
+    key_pool = get_key_pool(api_keys, requests_per_minute, quota_store)
+    if key_pool is not None:
+        request_limit = request_limit and request_limit * len(key_pool)
+    elif rate_limiter is None:
+        rate_limiter = RateLimiter(events_per_unit=requests_per_minute, unit="minute")
 
     downloader_kwargs: dict[str, Any] = {
         "name": name,
         "logical_date": date,
         "http_session": http_session,
-        "request_limit": REQUEST_DAILY_LIMIT,
+        "request_limit": request_limit,
         "rate_limit": rate_limiter,
         "response_handler": handler,
+        "circuit_breaker": CircuitBreaker,
+        "queue_high_watermark": config.get("queue_high_watermark"),
+        "queue_low_watermark": config.get("queue_low_watermark"),
+        "max_wait": max_wait,
+        "key_pool": key_pool,
+        "quota_store": quota_store,
+        "quota_key": quota_key,
     }
     if request_store is not None:
         downloader_kwargs["request_store"] = request_store
     if storage_client is not None:
         downloader_kwargs["storage_client"] = storage_client
+    downloader_kwargs["manifest_store"] = manifest_store or ManifestStore()
+    if columnar_writer is not None:
+        downloader_kwargs["columnar_writer"] = columnar_writer
+    if quota is not None:
+        downloader_kwargs["quota"] = quota
+    if profiler is not None:
+        downloader_kwargs["profiler"] = profiler
 
     downloader = APIDownloader(**downloader_kwargs)
 
     return downloader
 
 
-def start_download(downloader: APIDownloader, dates: list[str]) -> None:
-    downloader.download_backlog()
-    for date in dates:
-        request = APIRequest(
+def schedule_requests(dates: list[str]) -> list[APIRequest]:
+    return [
+        APIRequest(
             url=f"{BASE_URL}/fixtures",
             params={"date": date},
             type="schedule",
+            tags={"date": date},
         )
-        downloader.add(request)
+        for date in dates
+    ]
+
+
+def start_download(
+    downloader: APIDownloader, dates: list[str], stored_schedules: bool = False
+) -> None:
+    """
+    Download the pending requests, then the schedules of the dates.
+
+    With ``stored_schedules``, the schedules are not downloaded again but read
+    back from storage, where a schedules-only run of the same logical date
+    saved them, and only the requests they generate are downloaded. A
+    schedule that was not stored is downloaded instead.
+    """
+    downloader.download_backlog()
+    for request in schedule_requests(dates):
+        if stored_schedules:
+            key = f"{downloader.logical_date}/{schedule_path(request)}"
+            downloader.add_stored(request, key)
+        else:
+            downloader.add(request)
     downloader.download()
@@ -0,0 +1,69 @@
+import argparse
+import logging
+import signal
+import threading
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+
+from data_backend.config import get_config
+from data_backend.live import LivePoller
+from data_backend.storage import LocalStorage
+
+from scripts.football_api.compact import get_raw_storage
+from scripts.football_api.football_api import (
+    get_football_api_live_poller,
+    live_request,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main(
+    argv: list[str] | None = None,
+    poller_factory: Callable[..., LivePoller] = get_football_api_live_poller,
+    stop: threading.Event | None = None,
+) -> LivePoller:
+    parser = argparse.ArgumentParser(
+        description="Poll in-play fixtures and store the ones that changed"
+    )
+    parser.add_argument(
+        "--all-leagues",
+        action="store_true",
+        help="Poll all live fixtures instead of the configured leagues.",
+    )
+    parser.add_argument(
+        "--storage-dir",
+        metavar="DIR",
+        help="Store live fixtures as files under DIR instead of the raw-data bucket.",
+    )
+    parser.add_argument(
+        "--request-limit",
+        type=int,
+        help="Maximum polls per UTC day, counted in the database so restarts "
+        "keep it. Defaults to live.request_limit of the config.",
+    )
+    args = parser.parse_args(argv)
+
+    config = get_config(Path(__file__).parent / "config.yaml")
+    storage = LocalStorage(args.storage_dir) if args.storage_dir else get_raw_storage()
+    poller = poller_factory(
+        storage_client=storage, config=config, request_limit=args.request_limit
+    )
+    league_ids = None if args.all_leagues else [str(x) for x in config["leagues"]]
+    if stop is None:
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    logger.info(f"Polling live fixtures of {', '.join(league_ids or ['all leagues'])}")
+    try:
+        poller.run(partial(live_request, league_ids), stop)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        storage.flush()
+    return poller
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import logging
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+
+from data_backend.aws import S3Client
+from data_backend.columnar import ColumnarWriter
+from data_backend.config import get_config
+from data_backend.models import ReplayStats
+from data_backend.replay import Replayer
+from data_backend.storage import LocalStorage, StorageBackend
+
+from scripts.football_api.compact import get_raw_storage
+from scripts.football_api.football_api import (
+    COLUMNAR_SCHEMAS,
+    build_date_range,
+    classify_key,
+    get_football_api_handler,
+    replay_tags,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MINIO_ENDPOINT = "http://minio:9000"
+
+
+def main(
+    argv: list[str] | None = None,
+    storage_factory: Callable[[], StorageBackend] = get_raw_storage,
+    columnar_factory: Callable[[], ColumnarWriter] | None = None,
+) -> ReplayStats:
+    parser = argparse.ArgumentParser(
+        description="Re-run the football API handlers over stored raw responses, "
+        "without API calls"
+    )
+    parser.add_argument("start", help="First logical date (YYYY-MM-DD) to replay.")
+    parser.add_argument(
+        "end", nargs="?", help="Last logical date (YYYY-MM-DD). Defaults to start."
+    )
+    parser.add_argument(
+        "--storage-dir",
+        metavar="DIR",
+        help="Read raw responses from a local mirror instead of the raw-data bucket.",
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Write the flattened stats as Parquet files to the iceberg-data bucket.",
+    )
+    parser.add_argument(
+        "--processes", type=int, help="Parsing processes. Defaults to the CPU count."
+    )
+    args = parser.parse_args(argv)
+
+    if args.storage_dir:
+        storage_factory = partial(LocalStorage, args.storage_dir)
+    columnar_writer = None
+    if args.columnar:
+        columnar_writer = (
+            columnar_factory()
+            if columnar_factory is not None
+            else ColumnarWriter(
+                S3Client(bucket_name="iceberg-data", endpoint=MINIO_ENDPOINT),
+                COLUMNAR_SCHEMAS,
+            )
+        )
+    config = get_config(Path(__file__).parent / "config.yaml")
+    storage = storage_factory()
+    keys = [
+        key
+        for date in build_date_range(args.start, args.end or args.start)
+        for key in storage.list_keys(f"{date}/")
+    ]
+    logger.info(f"Replaying {len(keys)} objects from {args.start}")
+    replayer = Replayer(
+        get_football_api_handler(config, stream=False),
+        storage_factory,
+        classify_key,
+        columnar_writer=columnar_writer,
+        processes=args.processes,
+    )
+    return replayer.replay(keys, replay_tags(storage, keys))
+
+
+if __name__ == "__main__":
+    main()
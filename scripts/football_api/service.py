@@ -0,0 +1,169 @@
+import argparse
+import json
+import logging
+import threading
+import time
+import urllib.request
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any
+
+from data_backend.database.listener import RequestListener
+from data_backend.rate_limiter import RateLimiter
+from data_backend.service import DownloadService, make_server
+
+from scripts.football_api.download_ongoing import RESUME_MARKER
+from scripts.football_api.football_api import (
+    APIDownloader,
+    build_date_range,
+    get_football_api_downloader,
+    get_football_api_session,
+    schedule_requests,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SERVICE_URL = "http://download-service:8080"
+POLL_INTERVAL = 5.0
+FINISHED_STATUSES = ("succeeded", "deferred", "failed")
+
+
+def _request_json(url: str, data: dict[str, Any] | None = None) -> Any:
+    body = None if data is None else json.dumps(data).encode("utf-8")
+    request = urllib.request.Request(
+        url, data=body, headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+def serve(
+    args: argparse.Namespace,
+    downloader_factory: Callable[..., APIDownloader] = get_football_api_downloader,
+) -> None:
+    factory = partial(
+        downloader_factory,
+        http_session=get_football_api_session(),
+        rate_limiter=RateLimiter(
+            events_per_unit=args.requests_per_minute, unit="minute"
+        ),
+    )
+    service = DownloadService(
+        factory, workers=args.workers, finished_jobs=args.finished_jobs
+    )
+    server = make_server(service, host=args.host, port=args.port)
+    service.start()
+    if args.listen:
+        threading.Thread(
+            target=service.follow,
+            args=(RequestListener(), args.listen, args.idle_timeout),
+            name="request-listener",
+            daemon=True,
+        ).start()
+        logger.info(f"Following new requests of {', '.join(args.listen)}")
+    logger.info(f"Serving download jobs on {args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        service.stop()
+
+
+def submit(
+    args: argparse.Namespace,
+    request_json: Callable[..., Any] = _request_json,
+    sleep: Callable[[float], None] = time.sleep,
+) -> dict[str, Any]:
+    base_date = datetime.strptime(args.date, "%Y-%m-%d").date()
+    dates = build_date_range(
+        (base_date - timedelta(days=1)).isoformat(),
+        (base_date + timedelta(days=3)).isoformat(),
+    )
+    job = request_json(
+        f"{args.url}/jobs",
+        {
+            "name": args.name,
+            "logical_date": args.date,
+            "requests": [request.dict() for request in schedule_requests(dates)],
+        },
+    )
+    logger.info(f"Submitted job {job['id']}")
+    while job["status"] not in FINISHED_STATUSES:
+        sleep(args.poll_interval)
+        job = request_json(f"{args.url}/jobs/{job['id']}")
+    logger.info(
+        f"Job {job['id']} {job['status']} after {job['requests_made']} requests"
+    )
+    if job["status"] == "failed":
+        raise RuntimeError(f"Download job {job['id']} failed: {job['error']}")
+    if job["resume_at"] is not None:
+        print(f"{RESUME_MARKER}{job['resume_at']}", flush=True)
+    return job
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Run football API downloads in a long-lived service"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser(
+        "serve", help="Run the service, keeping HTTP and database pools warm."
+    )
+    serve_parser.add_argument("--host", default="0.0.0.0")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument(
+        "--workers", type=int, default=1, help="Jobs run at the same time."
+    )
+    serve_parser.add_argument(
+        "--requests-per-minute",
+        type=float,
+        default=10,
+        help="API rate shared by all jobs of the service.",
+    )
+    serve_parser.add_argument(
+        "--finished-jobs",
+        type=int,
+        default=1000,
+        help="Finished jobs kept for status lookups; older ones are forgotten.",
+    )
+    serve_parser.add_argument(
+        "--listen",
+        action="append",
+        metavar="NAME",
+        help="Download new pending requests of NAME, and of its shards, as soon "
+        "as they are added. Can be repeated.",
+    )
+    serve_parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=900.0,
+        help="Seconds without new requests after which the backlogs of the "
+        "followed names are checked anyway, for retries that became due.",
+    )
+    serve_parser.set_defaults(func=serve)
+
+    submit_parser = commands.add_parser(
+        "submit", help="Submit the daily download of a date and wait for it."
+    )
+    submit_parser.add_argument(
+        "date", help="Date in YYYY-MM-DD format to download schedule for"
+    )
+    submit_parser.add_argument("name", help="Name of the download process.")
+    submit_parser.add_argument("--url", default=SERVICE_URL)
+    submit_parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=POLL_INTERVAL,
+        help="Seconds between job status checks.",
+    )
+    submit_parser.set_defaults(func=submit)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
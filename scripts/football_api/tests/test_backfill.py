@@ -0,0 +1,118 @@
+from scripts.football_api import backfill
+
+
+class FakeRequester:
+    def __init__(self, quota):
+        self.quota = quota
+        self.request_count = 0
+
+
+class FakeRequestStore:
+    def __init__(self, stored):
+        self.stored = stored
+
+    def count(self, name):
+        return self.stored
+
+
+class FakeDownloader:
+    def __init__(self, quota, stored=0):
+        self.requester = FakeRequester(quota)
+        self.requests = FakeRequestStore(stored)
+        self.added = []
+        self.backlog_called = False
+
+    def add(self, request):
+        self.added.append(request)
+
+    def download(self):
+        for _ in self.added:
+            if self.requester.quota.try_acquire():
+                self.requester.request_count += 1
+
+    def download_backlog(self):
+        self.backlog_called = True
+
+
+def fake_factory(name, date, quota=None, **kwargs):
+    return FakeDownloader(quota)
+
+
+def test_build_date_shards():
+    shards = backfill.build_date_shards("hist", "2025-08-01", "2025-08-10", 4)
+
+    assert [s.name for s in shards] == [
+        "hist:2025-08-01",
+        "hist:2025-08-05",
+        "hist:2025-08-09",
+    ]
+    assert [s.logical_date for s in shards] == [
+        "2025-08-01",
+        "2025-08-05",
+        "2025-08-09",
+    ]
+    assert [r.params["date"] for r in shards[2].requests] == [
+        "2025-08-09",
+        "2025-08-10",
+    ]
+    assert all(r.type == "schedule" for s in shards for r in s.requests)
+
+
+def test_build_season_shards():
+    shards = backfill.build_season_shards("hist", 2024, ["39", "140"])
+
+    assert [s.name for s in shards] == ["hist:2024:39", "hist:2024:140"]
+    assert shards[0].logical_date == "2024"
+    assert shards[0].requests[0].params == {"league": "39", "season": "2024"}
+    assert shards[0].requests[0].tags == {"league_id": 39}
+
+
+def test_run_shard_resumes_started_shard():
+    downloader = FakeDownloader(quota=None, stored=3)
+    backfill._init_worker(lambda name, date, quota: downloader, None)
+
+    shard = backfill.build_date_shards("hist", "2025-08-01", "2025-08-01", 1)[0]
+    backfill.run_shard(shard)
+
+    assert downloader.backlog_called is True
+    assert downloader.added == []
+
+
+def test_main_runs_shards_with_shared_quota():
+    calls = []
+
+    def factory(name, date, **kwargs):
+        calls.append((name, kwargs))
+        return fake_factory(name, date, **kwargs)
+
+    results = backfill.main(
+        argv=[
+            "hist",
+            "--start=2025-08-01",
+            "--end=2025-08-06",
+            "--shard-days=2",
+            "--workers=1",
+            "--limit=5",
+            "--leagues=39,140",
+        ],
+        downloader_factory=factory,
+    )
+
+    assert [r.name for r in results] == [
+        "hist:2025-08-01",
+        "hist:2025-08-03",
+        "hist:2025-08-05",
+    ]
+    assert [r.requests for r in results] == [2, 2, 1]
+    assert calls[0][1]["config"]["leagues"] == ["39", "140"]
+    assert calls[0][1]["request_limit"] == 5
+
+
+def test_main_runs_shards_in_worker_processes():
+    results = backfill.main(
+        argv=["hist", "--season=2024", "--workers=2", "--limit=1", "--leagues=39,140"],
+        downloader_factory=fake_factory,
+    )
+
+    assert sorted(r.name for r in results) == ["hist:2024:140", "hist:2024:39"]
+    assert sum(r.requests for r in results) == 1
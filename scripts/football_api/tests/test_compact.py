@@ -0,0 +1,100 @@
+from data_backend.models import ManifestEntry, StoredObject
+
+from scripts.football_api import compact
+
+
+class FakeStorage:
+    def __init__(self, keys):
+        self.keys = keys
+        self.saved = {}
+
+    def list_keys(self, prefix=""):
+        return [k for k in self.keys if k.startswith(prefix)]
+
+    def read_bytes(self, key, byte_range=None):
+        return b'{"key": "%s"}' % key.encode()
+
+    def save_bytes(self, body, key, content_type=None):
+        self.saved[key] = body
+        return StoredObject(key=key, size=len(body), checksum="")
+
+    def save_json(self, data, key):
+        self.saved[key] = data
+
+    def delete(self, keys):
+        self.deleted = keys
+
+
+class FakeManifestStore:
+    moved = None
+
+    def move_to_bundle(self, bundle, documents):
+        self.moved = (bundle, list(documents))
+        return len(documents)
+
+    def find(self, league_id=None, month=None):
+        self.query = (league_id, month)
+        return [
+            ManifestEntry(
+                key="2026-02-20/1_players.json",
+                name="daily",
+                logical_date="2026-02-20",
+                type="player_stats",
+                size=1,
+                checksum="",
+            )
+        ]
+
+
+def test_main_compacts_logical_date():
+    storage = FakeStorage(
+        ["2026-02-20/1_players.json", "2026-02-20/2021_schedule.json", "2026-02-21/x"]
+    )
+
+    compact.main(argv=["2026-02-20"], storage_factory=lambda: storage)
+
+    index = storage.saved["bundles/daily/2026-02-20.index.json"]
+    assert list(index["documents"]) == [
+        "2026-02-20/1_players.json",
+        "2026-02-20/2021_schedule.json",
+    ]
+    assert "bundles/daily/2026-02-20.jsonl.gz" in storage.saved
+
+
+def test_main_compacts_league_month_from_manifest():
+    storage = FakeStorage([])
+    manifest = FakeManifestStore()
+
+    compact.main(
+        argv=["2026-02", "--league", "39"],
+        storage_factory=lambda: storage,
+        manifest_factory=lambda: manifest,
+    )
+
+    assert manifest.query == (39, "2026-02")
+    assert "bundles/league=39/month=2026-02.jsonl.gz" in storage.saved
+
+
+def test_main_nothing_to_compact():
+    storage = FakeStorage([])
+
+    compact.main(argv=["2026-02-20"], storage_factory=lambda: storage)
+
+    assert storage.saved == {}
+
+
+def test_main_delete_sources_moves_manifest_entries():
+    storage = FakeStorage(["2026-02-20/1_players.json"])
+    manifest = FakeManifestStore()
+
+    compact.main(
+        argv=["2026-02-20", "--delete-sources"],
+        storage_factory=lambda: storage,
+        manifest_factory=lambda: manifest,
+    )
+
+    assert manifest.moved == (
+        "bundles/daily/2026-02-20.jsonl.gz",
+        ["2026-02-20/1_players.json"],
+    )
+    assert storage.deleted == ["2026-02-20/1_players.json"]
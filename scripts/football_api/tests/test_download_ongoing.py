@@ -1,3 +1,7 @@
+from datetime import datetime, timezone
+
+import pytest
+
 from scripts.football_api import download_ongoing
 
 
@@ -5,11 +9,17 @@ class FakeDownloader:
     def __init__(self):
         self.backlog_called = False
         self.requests = []
+        self.stored_keys = []
         self.download_called = False
+        self.resume_at = None
 
     def download_backlog(self):
         self.backlog_called = True
 
+    def add_stored(self, request, key):
+        self.requests.append(request)
+        self.stored_keys.append(key)
+
     def add(self, request):
         self.requests.append(request)
 
@@ -44,3 +54,206 @@ def test_main_parses_args_and_starts_download():
         "2026-02-22",
         "2026-02-23",
     ]
+
+
+def test_main_columnar_passes_writer_to_factory():
+    calls = {}
+
+    def fake_get_downloader(name, date, columnar_writer=None):
+        calls["columnar_writer"] = columnar_writer
+        return FakeDownloader()
+
+    download_ongoing.main(
+        argv=["2026-02-20", "ongoing-job", "--columnar"],
+        downloader_factory=fake_get_downloader,
+    )
+
+    assert calls["columnar_writer"] is not None
+    assert calls["columnar_writer"].storage.bucket_name == "iceberg-data"
+
+
+def test_main_content_addressed_passes_storage_client():
+    calls = {}
+
+    def fake_get_downloader(name, date, storage_client=None):
+        calls["storage_client"] = storage_client
+        return FakeDownloader()
+
+    download_ongoing.main(
+        argv=["2026-02-20", "ongoing-job", "--content-addressed"],
+        downloader_factory=fake_get_downloader,
+    )
+
+    assert calls["storage_client"].content_addressed is True
+    assert calls["storage_client"].bucket_name == "raw-data"
+
+
+def test_main_storage_dir_passes_local_storage(tmp_path):
+    calls = {}
+
+    def fake_get_downloader(name, date, storage_client=None):
+        calls["storage_client"] = storage_client
+        return FakeDownloader()
+
+    download_ongoing.main(
+        argv=["2026-02-20", "ongoing-job", "--storage-dir", str(tmp_path)],
+        downloader_factory=fake_get_downloader,
+    )
+
+    assert calls["storage_client"].root == tmp_path
+
+
+def test_main_rejects_storage_dir_with_content_addressed(tmp_path):
+    with pytest.raises(SystemExit):
+        download_ongoing.main(
+            argv=[
+                "2026-02-20",
+                "ongoing-job",
+                "--content-addressed",
+                "--storage-dir",
+                str(tmp_path),
+            ],
+            downloader_factory=lambda name, date, **kwargs: FakeDownloader(),
+        )
+
+
+def test_main_parse_processes_passes_executor():
+    calls = {}
+
+    def fake_get_downloader(name, date, parse_executor=None):
+        calls["parse_executor"] = parse_executor
+        return FakeDownloader()
+
+    download_ongoing.main(
+        argv=["2026-02-20", "ongoing-job", "--parse-processes", "2"],
+        downloader_factory=fake_get_downloader,
+    )
+
+    assert calls["parse_executor"]._max_workers == 2
+
+
+def test_main_shard_restricts_config_dates_and_name():
+    calls = {}
+
+    def fake_get_downloader(name, date, config=None, request_limit=None):
+        calls.update(name=name, config=config, request_limit=request_limit)
+        calls["downloader"] = FakeDownloader()
+        return calls["downloader"]
+
+    download_ongoing.main(
+        argv=[
+            "2026-02-20",
+            "ongoing-job",
+            "--shard",
+            "leagues=2,39;dates=2026-02-19;hash=1/4",
+            "--request-limit",
+            "25",
+        ],
+        downloader_factory=fake_get_downloader,
+    )
+
+    assert calls["name"] == "ongoing-job:leagues=2,39;dates=2026-02-19;hash=1/4"
+    assert calls["config"]["leagues"] == ["2", "39"]
+    assert calls["config"]["fixture_shard"] == (1, 4)
+    assert calls["request_limit"] == 25
+    assert [r.params["date"] for r in calls["downloader"].requests] == ["2026-02-19"]
+
+
+def test_main_schedules_only_disables_fixture_requests():
+    calls = {}
+
+    def fake_get_downloader(name, date, config=None):
+        calls.update(name=name, config=config)
+        return FakeDownloader()
+
+    download_ongoing.main(
+        argv=["2026-02-20", "ongoing-job", "--schedules-only"],
+        downloader_factory=fake_get_downloader,
+    )
+
+    assert calls["name"] == "ongoing-job"
+    assert calls["config"]["fixture_requests"] is False
+    assert calls["config"]["leagues"]
+
+
+def test_main_stored_schedules_reads_schedules_from_storage():
+    fake_downloader = FakeDownloader()
+    fake_downloader.logical_date = "2026-02-20"
+
+    download_ongoing.main(
+        argv=[
+            "2026-02-20",
+            "ongoing-job",
+            "--shard",
+            "hash=0/4",
+            "--stored-schedules",
+        ],
+        downloader_factory=lambda name, date, config=None: fake_downloader,
+    )
+
+    assert len(fake_downloader.requests) == 5
+    assert fake_downloader.stored_keys[0] == "2026-02-20/2026-02-19_schedule.json"
+
+
+def test_main_resume_only_downloads_backlog():
+    fake_downloader = FakeDownloader()
+
+    download_ongoing.main(
+        argv=["2026-02-20", "ongoing-job", "--resume"],
+        downloader_factory=lambda name, date: fake_downloader,
+    )
+
+    assert fake_downloader.backlog_called is True
+    assert fake_downloader.requests == []
+
+
+def test_main_max_wait_prints_resume_marker(capsys):
+    calls = {}
+    fake_downloader = FakeDownloader()
+    fake_downloader.resume_at = datetime(2026, 2, 21, tzinfo=timezone.utc)
+
+    def fake_get_downloader(name, date, max_wait=None):
+        calls["max_wait"] = max_wait
+        return fake_downloader
+
+    download_ongoing.main(
+        argv=["2026-02-20", "ongoing-job", "--max-wait", "60"],
+        downloader_factory=fake_get_downloader,
+    )
+
+    assert calls["max_wait"] == 60
+    last_line = capsys.readouterr().out.splitlines()[-1]
+    assert last_line == "resume_at=2026-02-21T00:00:00+00:00"
+
+
+def test_main_journal_passes_request_store(tmp_path):
+    calls = {}
+
+    def fake_get_downloader(name, date, request_store=None):
+        calls["request_store"] = request_store
+        return FakeDownloader()
+
+    download_ongoing.main(
+        argv=["2026-02-20", "ongoing-job", "--journal", str(tmp_path / "j.db")],
+        downloader_factory=fake_get_downloader,
+    )
+
+    assert calls["request_store"].path == tmp_path / "j.db"
+    assert (tmp_path / "j.db").exists()
+
+
+def test_main_profile_writes_breakdown(tmp_path):
+    calls = {}
+
+    def fake_get_downloader(name, date, profiler=None):
+        calls["profiler"] = profiler
+        return FakeDownloader()
+
+    download_ongoing.main(
+        argv=["2026-02-20", "ongoing-job", "--profile", str(tmp_path)],
+        downloader_factory=fake_get_downloader,
+    )
+
+    assert calls["profiler"].elapsed > 0
+    assert (tmp_path / "stages.txt").exists()
+    assert (tmp_path / "profile.pstats").exists()
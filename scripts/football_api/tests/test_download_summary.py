@@ -0,0 +1,23 @@
+from scripts.football_api import download_summary
+
+
+class FakeRequestStore:
+    def count_by_status(self, name, logical_date=None):
+        self.query = (name, logical_date)
+        return {
+            "daily:hash=0/2": {"Succeeded": 3},
+            "daily:hash=1/2": {"Succeeded": 2, "Failed": 1},
+        }
+
+
+def test_main_logs_shard_counts(caplog):
+    store = FakeRequestStore()
+
+    with caplog.at_level("INFO"):
+        counts = download_summary.main(
+            argv=["2026-02-20", "daily"], request_store_factory=lambda: store
+        )
+
+    assert store.query == ("daily", "2026-02-20")
+    assert len(counts) == 2
+    assert "daily on 2026-02-20, 2 shards: 5 Succeeded, 1 Failed" in caplog.text
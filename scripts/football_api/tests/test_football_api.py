@@ -2,6 +2,9 @@ import json
 
 import pytest
 from data_backend.api import APIDownloader
+from data_backend.circuit_breaker import CircuitBreaker
+from data_backend.models import APIRequest
+from data_backend.storage import MemoryStorage
 
 from scripts.football_api import football_api
 
@@ -145,6 +148,13 @@ def test_parse_schedule_response_success(mock_schedule_data):
     assert filename == "2021-01-29_schedule.json"
 
 
+def test_parse_schedule_response_league_season():
+    _, filename = football_api.parse_schedule_response(
+        json.dumps({"parameters": {"league": "39", "season": "2024"}, "response": []})
+    )
+    assert filename == "39_2024_schedule.json"
+
+
 def test_parse_schedule_response_missing_date_logs_warning(caplog):
     with caplog.at_level("WARNING"):
         data, filename = football_api.parse_schedule_response(
@@ -166,6 +176,11 @@ def test_generate_fixture_requests_filters_by_league(mock_schedule_data):
     assert requests[1].type == "player_stats"
     assert requests[1].url.endswith("/fixtures/players")
     assert requests[1].params == {"fixture": "1435553"}
+    assert requests[0].tags == {
+        "fixture_id": 1435553,
+        "league_id": 2,
+        "date": "2025-08-27",
+    }
 
 
 def test_parse_stats_response_for_match_stats(mock_fixture_stats_data):
@@ -191,21 +206,152 @@ def test_parse_stats_response_missing_fields_logs_warning(caplog):
     assert "missing 'fixture' parameter or 'get' field" in caplog.text
 
 
+def test_flatten_schedule_response(mock_schedule_data):
+    rows = football_api.flatten_schedule_response(mock_schedule_data)["fixtures"]
+    assert len(rows) == 2
+    assert rows[0]["fixture_id"] == 1435553
+    assert rows[0]["league_id"] == 2
+    assert rows[0]["home_team_name"] == "Qarabag"
+    assert rows[0]["away_team_id"] == 651
+    assert rows[0]["status"] == "FT"
+    assert rows[1]["home_goals"] == 0
+    assert set(rows[0]) == set(football_api.FIXTURES_SCHEMA)
+
+
+def test_flatten_match_stats_response(mock_fixture_stats_data):
+    rows = football_api.flatten_match_stats_response(mock_fixture_stats_data)
+    rows = rows["team_stats"]
+    assert len(rows) == 4
+    assert rows[0] == {
+        "fixture_id": 215662,
+        "team_id": 463,
+        "team_name": "Aldosivi",
+        "stat": "Shots on Goal",
+        "value": "3",
+    }
+    assert rows[2]["value"] is None
+
+
+def test_flatten_player_stats_response(mock_player_stats_data):
+    rows = football_api.flatten_player_stats_response(mock_player_stats_data)
+    rows = rows["player_stats"]
+    assert len(rows) == 2
+    assert rows[0]["fixture_id"] == 169080
+    assert rows[0]["player_id"] == 35931
+    assert rows[0]["team_name"] == "Monarcas"
+    assert rows[0]["rating"] == 6.3
+    assert rows[0]["shots_total"] == 0
+    assert rows[1]["goals_total"] is None
+    assert set(rows[0]) == set(football_api.PLAYER_STATS_SCHEMA)
+
+
+def test_generate_fixture_batch_requests_groups_ids(mock_schedule_data):
+    fixtures = mock_schedule_data["response"]
+    mock_schedule_data["response"] = [
+        {**fixtures[0], "fixture": {**fixtures[0]["fixture"], "id": fixture_id}}
+        for fixture_id in range(1, 6)
+    ] + fixtures[1:]
+
+    requests = football_api.generate_fixture_batch_requests(
+        json.dumps(mock_schedule_data), league_ids=["2"], batch_size=2
+    )
+
+    assert [r.params for r in requests] == [
+        {"ids": "1-2"},
+        {"ids": "3-4"},
+        {"ids": "5"},
+    ]
+    assert all(r.type == "fixture_batch" for r in requests)
+    assert all(r.url.endswith("/fixtures") for r in requests)
+
+
+def test_split_fixture_batch_response(
+    mock_schedule_data, mock_fixture_stats_data, mock_player_stats_data
+):
+    fixture = {
+        **mock_schedule_data["response"][0],
+        "statistics": mock_fixture_stats_data["response"],
+        "players": mock_player_stats_data["response"],
+    }
+    body = json.dumps(
+        {"get": "fixtures", "parameters": {"ids": "1435553"}, "response": [fixture]}
+    )
+
+    documents = football_api.split_fixture_batch_response(body)
+
+    assert [(d.type, d.path) for d in documents] == [
+        ("match_stats", "1435553_statistics.json"),
+        ("player_stats", "1435553_players.json"),
+    ]
+    assert documents[0].tags == {
+        "fixture_id": 1435553,
+        "league_id": 2,
+        "date": "2025-08-27",
+    }
+    assert documents[0].data["parameters"] == {"fixture": "1435553"}
+    assert documents[0].data["response"] == mock_fixture_stats_data["response"]
+    assert documents[1].data["results"] == 2
+    rows = football_api.flatten_player_stats_response(documents[1].data)
+    assert rows["player_stats"][0]["fixture_id"] == 1435553
+
+
+def test_generate_fixture_requests_from_items(mock_schedule_data):
+    requests = football_api.generate_fixture_requests_from_items(
+        iter(mock_schedule_data["response"]), league_ids=["2"]
+    )
+
+    assert [r.type for r in requests] == ["match_stats", "player_stats"]
+    assert requests == football_api.generate_fixture_requests(
+        json.dumps(mock_schedule_data), league_ids=["2"]
+    )
+
+
+def test_stream_paths_match_parsed_paths(mock_schedule_data, mock_fixture_stats_data):
+    schedule = APIRequest(
+        url=f"{football_api.BASE_URL}/fixtures",
+        params={"date": "2021-01-29"},
+        type="schedule",
+    )
+    season = APIRequest(
+        url=f"{football_api.BASE_URL}/fixtures",
+        params={"league": "39", "season": "2024"},
+        type="schedule",
+    )
+    stats = APIRequest(
+        url=f"{football_api.BASE_URL}/fixtures/statistics",
+        params={"fixture": "215662"},
+        type="match_stats",
+    )
+
+    _, schedule_path = football_api.parse_schedule_response(
+        json.dumps(mock_schedule_data)
+    )
+    _, stats_path = football_api.parse_stats_response(
+        json.dumps(mock_fixture_stats_data)
+    )
+    assert football_api.schedule_path(schedule) == schedule_path
+    assert football_api.schedule_path(season) == "39_2024_schedule.json"
+    assert football_api.stats_path(stats) == stats_path
+
+
 def test_get_football_api_downloader_builds_components():
     class FakeSession:
         def __init__(self):
             self.headers = {}
 
     class FakeRequestStore:
-        def get_today_count(self, name):
-            return 0
+        session_factory = None
 
     class FakeStorageClient:
         pass
 
+    class FakeManifestStore:
+        pass
+
     fake_session = FakeSession()
     fake_request_store = FakeRequestStore()
     fake_storage_client = FakeStorageClient()
+    fake_manifest_store = FakeManifestStore()
 
     downloader = football_api.get_football_api_downloader(
         name="daily-job",
@@ -214,21 +360,169 @@ def test_get_football_api_downloader_builds_components():
         config={"leagues": [2, 3]},
         request_store=fake_request_store,
         storage_client=fake_storage_client,
+        manifest_store=fake_manifest_store,
     )
 
     assert isinstance(downloader, APIDownloader)
     assert downloader.name == "daily-job"
     assert downloader.requests is fake_request_store
     assert downloader.files is fake_storage_client
+    assert downloader.manifest is fake_manifest_store
     assert downloader.requester.http_session is fake_session
     assert downloader.requester.request_limit == football_api.REQUEST_DAILY_LIMIT
+    assert downloader.requester.quota_key == football_api.QUOTA_KEY
+    assert downloader.requester.circuit_breaker is CircuitBreaker
     assert fake_session.headers["x-rapidapi-host"] == football_api.API_HOST
     assert "x-rapidapi-key" in fake_session.headers
 
     handler = downloader.handler
     assert set(handler.parsers) == {"schedule", "match_stats", "player_stats"}
+    assert handler.raw_types == {"schedule", "match_stats", "player_stats"}
     assert "schedule" in handler.generators
     assert len(handler.generators["schedule"]) == 1
+    assert set(handler.flatteners) == {"schedule", "match_stats", "player_stats"}
+    assert handler.splitters == {}
+
+
+def test_get_football_api_session_keeps_configured_headers():
+    session = football_api.get_football_api_session(api_keys=["first"])
+    headers = session.headers
+
+    football_api.get_football_api_session(session, api_keys=["second"])
+
+    assert session.headers is headers
+    assert session.headers["x-rapidapi-host"] == football_api.API_HOST
+    assert session.headers["x-rapidapi-key"] == "first"
+
+
+def test_get_football_api_downloader_with_fixture_batches():
+    class FakeSession:
+        def __init__(self):
+            self.headers = {}
+
+    class FakeRequestStore:
+        session_factory = None
+
+    downloader = football_api.get_football_api_downloader(
+        name="daily-job",
+        date="2026-02-20",
+        http_session=FakeSession(),
+        config={"leagues": [2, 3], "fixture_batch_size": 20},
+        request_store=FakeRequestStore(),
+        storage_client=object(),
+        manifest_store=object(),
+    )
+
+    handler = downloader.handler
+    assert set(handler.splitters) == {"fixture_batch"}
+    [generator] = handler.generators["schedule"]
+    assert generator.func is football_api.generate_fixture_batch_requests
+    assert generator.keywords["batch_size"] == 20
+
+
+def test_get_football_api_downloader_with_streaming():
+    class FakeSession:
+        def __init__(self):
+            self.headers = {}
+
+    class FakeRequestStore:
+        session_factory = None
+
+    downloader = football_api.get_football_api_downloader(
+        name="daily-job",
+        date="2026-02-20",
+        http_session=FakeSession(),
+        config={"leagues": [2, 3], "stream_responses": True},
+        request_store=FakeRequestStore(),
+        storage_client=object(),
+        manifest_store=object(),
+    )
+
+    handler = downloader.handler
+    assert set(handler.stream_parsers) == {"schedule", "match_stats", "player_stats"}
+    assert "schedule" not in handler.generators
+    [generator] = handler.item_generators["schedule"]
+    assert generator.func is football_api.generate_fixture_requests_from_items
+
+
+def test_fixture_batch_responses_are_streamed():
+    batch = {"response": [{"fixture": {"id": 1}}, {"fixture": {"id": 2}}]}
+
+    class FakeResponse:
+        status_code = 200
+        headers: dict[str, str] = {}
+
+        def __init__(self):
+            self.streamed = False
+
+        def raise_for_status(self):
+            pass
+
+        def iter_content(self, chunk_size):
+            self.streamed = True
+            yield json.dumps(batch).encode("utf-8")
+
+        def close(self):
+            pass
+
+    class FakeSession:
+        def __init__(self):
+            self.headers = {}
+            self.response = FakeResponse()
+
+        def get(self, url, stream=False, **kwargs):
+            assert stream
+            return self.response
+
+    class FakeRequestStore:
+        session_factory = None
+
+        def add(self, request):
+            pass
+
+        def complete(self, request, status, error=None):
+            self.status = status
+
+    class FakeQuotaStore:
+        def try_acquire(self, key, day, limit):
+            return True
+
+    class FakeManifestStore:
+        def add(self, entry):
+            pass
+
+    session = FakeSession()
+    storage = MemoryStorage()
+    downloader = football_api.get_football_api_downloader(
+        name="daily-job",
+        date="2026-02-20",
+        http_session=session,
+        config={"leagues": [2], "stream_responses": True, "fixture_batch_size": 20},
+        request_store=FakeRequestStore(),
+        storage_client=storage,
+        manifest_store=FakeManifestStore(),
+        quota_store=FakeQuotaStore(),
+        requests_per_minute=60_000,
+    )
+    stored_streams = []
+    store_stream = downloader._store_stream
+    downloader._store_stream = lambda r, response: (
+        stored_streams.append(r.request.type),
+        store_stream(r, response),
+    )
+
+    downloader.add(
+        APIRequest(
+            url=f"{football_api.BASE_URL}/fixtures",
+            params={"ids": "1-2"},
+            type="fixture_batch",
+        )
+    )
+    downloader.download()
+
+    assert session.response.streamed
+    assert stored_streams == ["fixture_batch"]
+    assert json.loads(storage.read_bytes("2026-02-20/1-2_fixtures.json")) == batch
 
 
 def test_start_download_downloads_backlog_then_schedule_request():
@@ -258,6 +552,7 @@ def test_start_download_downloads_backlog_then_schedule_request():
     for _, schedule_request in downloaded:
         assert schedule_request.type == "schedule"
         assert schedule_request.url.endswith("/fixtures")
+    assert all(req.tags == {"date": req.params["date"]} for _, req in downloaded)
     assert [req.params["date"] for _, req in downloaded] == [
         "2026-02-19",
         "2026-02-20",
@@ -267,6 +562,49 @@ def test_start_download_downloads_backlog_then_schedule_request():
     ]
 
 
+def test_start_download_reads_stored_schedules():
+    class FakeDownloader:
+        logical_date = "2026-02-20"
+
+        def __init__(self):
+            self.calls = []
+
+        def download_backlog(self):
+            self.calls.append("backlog")
+
+        def add(self, request):
+            self.calls.append(("add", request))
+
+        def add_stored(self, request, key):
+            self.calls.append(("add_stored", request.params["date"], key))
+
+        def download(self):
+            self.calls.append("download")
+
+    downloader = FakeDownloader()
+    football_api.start_download(
+        downloader, ["2026-02-19", "2026-02-20"], stored_schedules=True
+    )
+
+    assert downloader.calls == [
+        "backlog",
+        ("add_stored", "2026-02-19", "2026-02-20/2026-02-19_schedule.json"),
+        ("add_stored", "2026-02-20", "2026-02-20/2026-02-20_schedule.json"),
+        "download",
+    ]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_handler_without_fixture_requests_only_parses_schedules(stream):
+    handler = football_api.get_football_api_handler(
+        {"leagues": [2], "fixture_requests": False}, stream=stream
+    )
+
+    assert "schedule" not in handler.generators
+    assert "schedule" not in handler.item_generators
+    assert "schedule" in handler.parsers
+
+
 def test_build_date_range_inclusive():
     dates = football_api.build_date_range("2026-02-19", "2026-02-23")
     assert dates == [
@@ -291,3 +629,109 @@ def test_generate_fixture_requests_skips_non_final_status(mock_schedule_data):
         json.dumps(mock_schedule_data), league_ids=["2", "3"]
     )
     assert requests == []
+
+
+def test_shard_spec_parse_and_format():
+    spec = football_api.ShardSpec.parse("hash=2/4;leagues=2,39")
+
+    assert spec.leagues == ("2", "39")
+    assert spec.bucket == (2, 4)
+    assert str(spec) == "leagues=2,39;hash=2/4"
+    with pytest.raises(ValueError):
+        football_api.ShardSpec.parse("hash=4/4")
+    with pytest.raises(ValueError):
+        football_api.ShardSpec.parse("teams=1")
+
+
+def test_hash_shards_partition_fixtures(mock_schedule_data):
+    body = json.dumps(mock_schedule_data)
+    league_ids = ["2", "10"]
+
+    all_requests = football_api.generate_fixture_requests(body, league_ids)
+    sharded = [
+        r
+        for index in range(3)
+        for r in football_api.generate_fixture_requests(
+            body, league_ids, shard=(index, 3)
+        )
+    ]
+
+    assert sorted(r.url + str(r.params) for r in sharded) == sorted(
+        r.url + str(r.params) for r in all_requests
+    )
+
+
+def test_live_request_polls_leagues_or_all():
+    assert football_api.live_request(["2", "39"]).params == {"live": "2-39"}
+    assert football_api.live_request().params == {"live": "all"}
+
+
+def test_split_live_response_and_interval():
+    body = json.dumps(
+        {
+            "response": [
+                {"fixture": {"id": 1, "status": {"short": "HT"}}, "league": {"id": 2}},
+                {"fixture": {"id": 2, "status": {"short": "2H"}}, "league": {"id": 2}},
+                {"fixture": {}},
+            ]
+        }
+    )
+
+    documents = football_api.split_live_response(body)
+
+    assert [d.path for d in documents] == ["1_live.json", "2_live.json"]
+    assert documents[0].tags["league_id"] == 2
+    assert football_api.live_interval(documents, in_play_interval=30) == 30
+    assert football_api.live_interval(documents[:1], break_interval=200) == 200
+    assert football_api.live_interval([], idle_interval=600) == 600
+
+
+def test_get_football_api_live_poller_uses_live_config():
+    config = {
+        "leagues": [2],
+        "live": {"in_play_interval": 30, "idle_interval": 600, "request_limit": 40},
+    }
+
+    quota_store = object()
+
+    poller = football_api.get_football_api_live_poller(
+        storage_client=object(), config=config, quota_store=quota_store
+    )
+
+    assert poller.budget == 40
+    assert poller.quota_store is quota_store
+    assert poller.budget_key == f"{football_api.QUOTA_KEY}:live"
+    assert poller.requester.request_limit == football_api.REQUEST_DAILY_LIMIT
+    assert poller.requester.quota_store is quota_store
+    assert poller.requester.quota_key == football_api.QUOTA_KEY
+    assert set(poller.handler.splitters) == {"live"}
+    assert poller.interval([]) == 600
+
+
+def test_get_football_api_downloader_pools_several_keys():
+    class FakeSession:
+        def __init__(self):
+            self.headers = {}
+
+    class FakeRequestStore:
+        session_factory = None
+
+    fake_session = FakeSession()
+
+    downloader = football_api.get_football_api_downloader(
+        name="daily-job",
+        date="2026-02-20",
+        http_session=fake_session,
+        config={"leagues": [2]},
+        request_store=FakeRequestStore(),
+        storage_client=object(),
+        manifest_store=object(),
+        api_keys=["first", "second"],
+        quota_store=object(),
+    )
+
+    requester = downloader.requester
+    assert len(requester.key_pool) == 2
+    assert requester.rate_limit is None
+    assert requester.request_limit == 2 * football_api.REQUEST_DAILY_LIMIT
+    assert "x-rapidapi-key" not in fake_session.headers
@@ -0,0 +1,41 @@
+import threading
+
+from scripts.football_api import live
+
+
+class FakePoller:
+    def run(self, request_factory, stop):
+        self.request = request_factory()
+        self.stop = stop
+
+
+def test_main_polls_configured_leagues(tmp_path):
+    calls = {}
+    poller = FakePoller()
+
+    def fake_poller_factory(**kwargs):
+        calls.update(kwargs)
+        return poller
+
+    stop = threading.Event()
+    live.main(
+        argv=["--storage-dir", str(tmp_path), "--request-limit", "20"],
+        poller_factory=fake_poller_factory,
+        stop=stop,
+    )
+
+    assert calls["request_limit"] == 20
+    assert poller.request.type == "live"
+    assert poller.request.params["live"].startswith("2-3-")
+    assert poller.stop is stop
+
+
+def test_main_polls_all_leagues(tmp_path):
+    poller = FakePoller()
+    live.main(
+        argv=["--all-leagues", "--storage-dir", str(tmp_path)],
+        poller_factory=lambda **kwargs: poller,
+        stop=threading.Event(),
+    )
+
+    assert poller.request.params == {"live": "all"}
@@ -0,0 +1,97 @@
+from data_backend.storage import LocalStorage, MemoryStorage
+
+from scripts.football_api import football_api, replay
+
+SCHEDULE = {
+    "get": "fixtures",
+    "parameters": {"date": "2026-02-20"},
+    "response": [
+        {
+            "fixture": {
+                "id": 1,
+                "date": "2026-02-20T20:00:00+00:00",
+                "status": {"short": "FT"},
+            },
+            "league": {"id": 2, "name": "UEFA Champions League"},
+            "teams": {"home": {"id": 10, "name": "A"}, "away": {"id": 11, "name": "B"}},
+            "goals": {"home": 1, "away": 0},
+        }
+    ],
+}
+STATS = {
+    "get": "fixtures/statistics",
+    "parameters": {"fixture": "1"},
+    "response": [
+        {
+            "team": {"id": 10, "name": "A"},
+            "statistics": [{"type": "Shots on Goal", "value": 3}],
+        }
+    ],
+}
+
+
+class FakeColumnarWriter:
+    def __init__(self):
+        self.tables = []
+
+    def write(self, table, rows, partition):
+        self.tables.append((table, partition, len(rows)))
+
+    def flush(self):
+        pass
+
+
+def test_classify_key():
+    assert football_api.classify_key("d/2026-02-20_schedule.json") == "schedule"
+    assert football_api.classify_key("d/1_statistics.json") == "match_stats"
+    assert football_api.classify_key("d/1_players.json") == "player_stats"
+    assert football_api.classify_key("d/1-2_fixtures.json") == "fixture_batch"
+    assert football_api.classify_key("d/index.json") is None
+
+
+def test_main_replays_local_mirror(tmp_path):
+    storage = LocalStorage(tmp_path)
+    storage.save_json(SCHEDULE, "2026-02-20/2026-02-20_schedule.json")
+    storage.save_json(STATS, "2026-02-21/1_statistics.json")
+    storage.save_json({}, "2026-02-22/ignored.json")
+    writer = FakeColumnarWriter()
+
+    stats = replay.main(
+        argv=[
+            "2026-02-20",
+            "2026-02-22",
+            "--storage-dir",
+            str(tmp_path),
+            "--processes",
+            "1",
+            "--columnar",
+        ],
+        columnar_factory=lambda: writer,
+    )
+
+    assert stats.objects == 2
+    assert stats.errors == 0
+    assert stats.requests == 1
+    assert ("fixtures", "2026-02-20", 1) in writer.tables
+    # Stats are partitioned by their fixture's date, as when downloaded.
+    assert ("team_stats", "2026-02-20", 1) in writer.tables
+
+
+def test_replay_tags():
+    storage = MemoryStorage()
+    keys = [
+        "2026-02-20/2026-02-20_schedule.json",
+        "2026-02-20/39_2024_schedule.json",
+        "2026-02-21/1_players.json",
+        "2026-02-21/2_players.json",
+    ]
+    storage.save_json(SCHEDULE, keys[0])
+    storage.save_json({"response": []}, keys[1])
+
+    tags = football_api.replay_tags(storage, keys)
+
+    assert tags == {
+        keys[0]: {"date": "2026-02-20"},
+        keys[1]: {"league_id": 39},
+        keys[2]: {"fixture_id": 1, "league_id": 2, "date": "2026-02-20"},
+    }
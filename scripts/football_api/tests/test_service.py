@@ -0,0 +1,61 @@
+import argparse
+
+import pytest
+
+from scripts.football_api import service
+
+
+def make_args(**kwargs):
+    defaults = {
+        "date": "2026-02-20",
+        "name": "daily",
+        "url": "http://service",
+        "poll_interval": 1.0,
+    }
+    return argparse.Namespace(**{**defaults, **kwargs})
+
+
+def test_submit_posts_schedule_requests_and_polls_until_done(capsys):
+    calls = []
+    statuses = iter(["running", "deferred"])
+
+    def fake_request_json(url, data=None):
+        calls.append((url, data))
+        return {
+            "id": "abc",
+            "status": "queued" if data else next(statuses),
+            "requests_made": 3,
+            "resume_at": "2026-02-21T00:00:00+00:00",
+            "error": None,
+        }
+
+    job = service.submit(
+        make_args(), request_json=fake_request_json, sleep=lambda s: None
+    )
+
+    url, data = calls[0]
+    assert url == "http://service/jobs"
+    assert data["name"] == "daily"
+    assert [r["params"]["date"] for r in data["requests"]] == [
+        "2026-02-19",
+        "2026-02-20",
+        "2026-02-21",
+        "2026-02-22",
+        "2026-02-23",
+    ]
+    assert [url for url, _ in calls[1:]] == ["http://service/jobs/abc"] * 2
+    assert job["status"] == "deferred"
+    assert (
+        capsys.readouterr().out.splitlines()[-1]
+        == "resume_at=2026-02-21T00:00:00+00:00"
+    )
+
+
+def test_submit_raises_on_failed_job():
+    def fake_request_json(url, data=None):
+        return {"id": "abc", "status": "failed", "requests_made": 0, "error": "boom"}
+
+    with pytest.raises(RuntimeError, match="boom"):
+        service.submit(
+            make_args(), request_json=fake_request_json, sleep=lambda s: None
+        )
@@ -64,6 +64,11 @@ resource "minio_iam_user_policy_attachment" "raw_write_attachment" {
   policy_name = minio_iam_policy.raw_write_policy.name
 }
 
+resource "minio_iam_user_policy_attachment" "python_raw_read_attachment" {
+  user_name   = minio_iam_user.python_user.name
+  policy_name = minio_iam_policy.raw_read_policy.name
+}
+
 resource "minio_iam_user_policy_attachment" "raw_read_attachment" {
   user_name   = minio_iam_user.spark_user.name
   policy_name = minio_iam_policy.raw_read_policy.name
@@ -79,6 +84,11 @@ resource "minio_iam_user_policy_attachment" "iceberg_write_attachment" {
   policy_name = minio_iam_policy.iceberg_write_policy.name
 }
 
+resource "minio_iam_user_policy_attachment" "python_iceberg_write_attachment" {
+  user_name   = minio_iam_user.python_user.name
+  policy_name = minio_iam_policy.iceberg_write_policy.name
+}
+
 
 # Write secrets to local files
 resource "local_file" "python_user_credentials" {